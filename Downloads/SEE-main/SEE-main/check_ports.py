@@ -1,12 +1,12 @@
-import socket
-def check(port):
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(1)
-            return s.connect_ex(('localhost', port)) == 0
-    except:
-        return False
-print(f"5173:{check(5173)}")
-print(f"3000:{check(3000)}") # Older frontend?
-print(f"3001:{check(3001)}") # user history mentioned 3001
-print(f"5000:{check(5000)}") # Backend?
+"""
+Superseded by tests/readiness.py, which probes the frontend, API and Postgres
+concurrently and reports latency. Kept so `python check_ports.py` still works.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests"))
+from readiness import main
+
+# The ports this script used to check, besides the frontend/API/Postgres
+sys.exit(main(sys.argv[1:] or ["--port", "3000", "--port", "5000"]))
@@ -8,7 +8,8 @@ export default defineConfig({
   server: {
     proxy: {
       '/api': {
-        target: 'http://localhost:3001',
+        // Isolated test workers point this at their own backend
+        target: process.env.PSI_API_TARGET || 'http://localhost:3001',
         changeOrigin: true,
         secure: false,
       }
@@ -0,0 +1,131 @@
+"""
+API session bootstrap for the Selenium suites
+Logs in over HTTP (/api/login) and injects the session into localStorage so
+the app opens already authenticated. Only TestLogin exercises the login form.
+"""
+
+import http.client
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+from selenium.webdriver.common.by import By
+from waits import Waiter
+
+API_URL = "http://localhost:3001"
+FRONTEND_URL = "http://localhost:5173"
+
+# Keys App.jsx reads on startup to restore a logged-in user
+SESSION_KEYS = ("psi_user_id", "psi_username")
+
+# Same-origin static file from frontend/public: lets us write localStorage
+# for the app's origin without booting React first.
+ORIGIN_PAGE = "/vite.svg"
+
+
+def api_url():
+    """Backend URL; an isolated worker points PSI_API_URL at its own backend"""
+    return os.environ.get("PSI_API_URL", API_URL)
+
+
+def frontend_url():
+    """Frontend URL; an isolated worker points PSI_FRONTEND_URL at its own Vite server"""
+    return os.environ.get("PSI_FRONTEND_URL", FRONTEND_URL)
+
+
+class ApiError(Exception):
+    def __init__(self, status, data):
+        self.status = status
+        self.data = data
+        message = data.get("error") if isinstance(data, dict) else data
+        super().__init__(f"HTTP {status}: {message}")
+
+
+class ApiClient:
+    """JSON client for the Express backend with one keep-alive connection per thread"""
+
+    def __init__(self, base_url=None, timeout=10):
+        parts = urlsplit(base_url or api_url())
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.https = parts.scheme == "https"
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conn = self._local.conn = cls(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def request(self, method, path, body=None):
+        """Send a request and return (status, decoded JSON body)"""
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Express drops idle keep-alive sockets after 5s; retry once on a new one
+                self.close()
+                if attempt:
+                    raise
+        data = json.loads(raw) if raw else None
+        return resp.status, data
+
+    def get(self, path):
+        status, data = self.request("GET", path)
+        if status >= 400:
+            raise ApiError(status, data)
+        return data
+
+    def post(self, path, body):
+        status, data = self.request("POST", path, body)
+        if status >= 400:
+            raise ApiError(status, data)
+        return data
+
+    def register(self, email, password):
+        """Create the account; an existing account (409) is not an error"""
+        status, data = self.request("POST", "/api/register", {"username": email, "password": password})
+        if status >= 400 and status != 409:
+            raise ApiError(status, data)
+        return status != 409
+
+    def login(self, email, password):
+        """Return {"userId", "username"} for valid credentials"""
+        data = self.post("/api/login", {"username": email, "password": password})
+        return {"userId": data["userId"], "username": data["username"]}
+
+
+def inject_session(driver, base_url, auth):
+    """Write `auth` into the app's localStorage and open the app with it"""
+    driver.get(base_url + ORIGIN_PAGE)
+    driver.execute_script(
+        "localStorage.clear();"
+        "localStorage.setItem(arguments[0], arguments[2]);"
+        "localStorage.setItem(arguments[1], arguments[3]);",
+        *SESSION_KEYS, str(auth["userId"]), auth["username"]
+    )
+    driver.get(base_url)
+
+
+def bootstrap_session(driver, base_url, email, password, client=None, waits=None):
+    """Log in via the API and open `base_url` already authenticated"""
+    client = client or ApiClient()
+    waits = waits or Waiter(driver)
+    auth = client.login(email, password)
+    inject_session(driver, base_url, auth)
+    waits.present((By.CLASS_NAME, "sidebar"))
+    return auth
@@ -0,0 +1,84 @@
+"""
+Launch backend/server.js (or the Vite dev server) as a child process with overridden settings
+Used when a tool needs its own backend, e.g. one whose DB_PORT points at
+the query-counting proxy or whose DB_NAME is a per-worker clone.
+"""
+
+import os
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from db_tools import BACKEND_DIR
+
+FRONTEND_DIR = os.path.join(os.path.dirname(BACKEND_DIR), "frontend")
+
+
+class _ChildProcess:
+    command = None
+    cwd = None
+    # Path that answers once the server is ready
+    ready_path = "/"
+
+    def __init__(self, port, log_path=None, **env):
+        self.port = port
+        self.log_path = log_path
+        self.env = dict(os.environ, **{k: str(v) for k, v in env.items()})
+        self.proc = None
+        self._log = None
+
+    @property
+    def url(self):
+        return f"http://localhost:{self.port}"
+
+    def start(self, timeout=20):
+        self._log = open(self.log_path, "w") if self.log_path else subprocess.DEVNULL
+        self.proc = subprocess.Popen(self.command, cwd=self.cwd, env=self.env,
+                                     stdout=self._log, stderr=subprocess.STDOUT)
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"{self.command[0]} exited with code {self.proc.returncode}")
+            try:
+                urllib.request.urlopen(self.url + self.ready_path, timeout=1).close()
+                return self.url
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.1)
+        self.stop()
+        raise RuntimeError(f"{self.command[0]} did not answer on port {self.port} within {timeout}s")
+
+    def stop(self):
+        if self.proc and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        if self._log not in (None, subprocess.DEVNULL):
+            self._log.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class BackendProcess(_ChildProcess):
+    command = ["node", "server.js"]
+    cwd = BACKEND_DIR
+    # Cheapest route: no query string -> `null` without touching the DB
+    ready_path = "/api/users/search"
+
+    def __init__(self, port, log_path=None, **env):
+        # dotenv never overrides variables that are already set, so these win over backend/.env
+        super().__init__(port, log_path, PORT=port, **env)
+
+
+class FrontendProcess(_ChildProcess):
+    """Vite dev server proxying /api to `api_url`"""
+    cwd = FRONTEND_DIR
+
+    def __init__(self, port, api_url, log_path=None, **env):
+        super().__init__(port, log_path, PSI_API_TARGET=api_url, **env)
+        self.command = ["npx", "vite", "--port", str(port), "--strictPort"]
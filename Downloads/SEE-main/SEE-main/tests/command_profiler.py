@@ -0,0 +1,192 @@
+"""
+WebDriver command profiler
+Wraps each browser's command_executor.execute, so every command a test sends
+to chromedriver is recorded: its name (findElement, getElementText,
+w3cExecuteScript, ...), the locator it is about, latency, and request/response
+size. Commands are attributed to the PerfRecorder step that is running and to
+the line of the test file that issued them. Element commands are labelled
+with the locator that found the element, e.g. `css select >> css option[3]`.
+
+Each step's perf record gets a compact "commands" summary: round-trips,
+time, bytes, the busiest call sites and the slowest commands. These summaries
+are also in reports/perf_<stamp>.json.
+
+    python run_all_tests.py --profile-commands
+    python command_profiler.py reports/perf_<stamp>.json --top 10
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+# Set by the runner so worker processes profile their browsers too
+PROFILE_ENV = "PSI_PROFILE_COMMANDS"
+
+# W3C key of an element reference in a response
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+SCRIPT_COMMANDS = {"w3cExecuteScript", "w3cExecuteScriptAsync", "executeScript", "executeAsyncScript"}
+
+
+def _caller():
+    """file:line function of the innermost test module frame that issued the command"""
+    frame = sys._getframe(2)
+    while frame:
+        name = os.path.basename(frame.f_code.co_filename)
+        if name.startswith("test_"):
+            return f"{name}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "-"
+
+
+def _elements(value):
+    if isinstance(value, dict) and ELEMENT_KEY in value:
+        return [value[ELEMENT_KEY]]
+    if isinstance(value, list):
+        return [v[ELEMENT_KEY] for v in value if isinstance(v, dict) and ELEMENT_KEY in v]
+    return []
+
+
+class CommandProfiler:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.current = None   # label of the running step; None outside steps
+        self.commands = []
+        self._locators = {}   # element id -> locator that found it
+
+    def instrument(self, driver):
+        """Record every command `driver` sends; safe to call repeatedly"""
+        executor = driver.command_executor
+        if not self.enabled or getattr(executor, "_psi_profiled", False):
+            return
+        original = executor.execute
+
+        def execute(command, params):
+            # execute() removes the URL parts (session and element ids) from params
+            locator = self._locator(command, params)
+            start = time.perf_counter()
+            response = original(command, params)
+            elapsed = time.perf_counter() - start
+            self._record(command, locator, params, response, elapsed)
+            return response
+
+        executor.execute = execute
+        executor._psi_profiled = True
+
+    def _locator(self, command, params):
+        if command in FIND_COMMANDS:
+            locator = f"{params.get('using', '').replace(' selector', '')} {params.get('value', '')}"
+            parent = self._locators.get(params.get("id"))
+            return f"{parent} >> {locator}" if parent else locator
+        if command in SCRIPT_COMMANDS:
+            script = " ".join(params.get("script", "").split())
+            atom = re.match(r"/\* (\w+) \*/", script)
+            # is_displayed() / get_attribute() ship a whole JS atom on every call
+            label = f"atom {atom.group(1)}" if atom else script[:60] + ("..." if len(script) > 60 else "")
+            targets = [self._locators.get(e, "?") for e in _elements(params.get("args", []))]
+            return f"{label} on {', '.join(targets)}" if targets else label
+        if command == "get":
+            return params.get("url")
+        return self._locators.get(params.get("id") or params.get("elementId"), "")
+
+    def _record(self, command, locator, params, response, elapsed):
+        value = response.get("value") if isinstance(response, dict) else None
+        if command in FIND_COMMANDS:
+            found = _elements(value)
+            for i, element_id in enumerate(found):
+                self._locators[element_id] = locator if command.endswith("Element") else f"{locator}[{i}]"
+        self.commands.append({
+            "step": self.current, "command": command, "locator": locator, "caller": _caller(),
+            "ms": elapsed * 1000,
+            "request_bytes": len(json.dumps(params, default=str)),
+            "response_bytes": len(json.dumps(response, default=str)),
+        })
+
+    def mark(self, label):
+        """Start attributing commands to `label`; returns where this step's commands begin"""
+        self.current = label
+        return len(self.commands)
+
+    def summary(self, since, top=5):
+        """Compact summary of the commands recorded since `since` (stored on the step)"""
+        self.current = None
+        commands = self.commands[since:]
+        by_command, sites = {}, {}
+        for c in commands:
+            stats = by_command.setdefault(c["command"], [0, 0.0])
+            stats[0] += 1
+            stats[1] += c["ms"]
+            # One site per line of the test, whichever of the matched elements it touched
+            site = sites.setdefault((c["caller"], c["command"], re.sub(r"\[\d+\]", "[*]", c["locator"])), [0, 0.0])
+            site[0] += 1
+            site[1] += c["ms"]
+        busiest = sorted(sites.items(), key=lambda item: (-item[1][0], -item[1][1]))[:top]
+        slowest = sorted(commands, key=lambda c: -c["ms"])[:top]
+        return {
+            "count": len(commands),
+            "ms": round(sum(c["ms"] for c in commands), 1),
+            "request_kb": round(sum(c["request_bytes"] for c in commands) / 1024, 1),
+            "response_kb": round(sum(c["response_bytes"] for c in commands) / 1024, 1),
+            "by_command": {name: [n, round(ms, 1)] for name, (n, ms) in
+                           sorted(by_command.items(), key=lambda item: -item[1][0])},
+            "sites": [{"caller": caller, "command": command, "locator": locator, "count": n, "ms": round(ms, 1)}
+                      for (caller, command, locator), (n, ms) in busiest],
+            "slowest": [{"caller": c["caller"], "command": c["command"], "locator": c["locator"],
+                         "ms": round(c["ms"], 1), "response_bytes": c["response_bytes"]} for c in slowest],
+        }
+
+
+def print_report(steps, top=5):
+    """Per-step round-trips, time and bytes, with the busiest call sites and slowest commands"""
+    profiled = [s for s in steps if s.get("commands")]
+    if not profiled:
+        return
+    print("\n" + "=" * 100)
+    print(" " * 36 + "WEBDRIVER COMMAND PROFILE")
+    print("=" * 100)
+    print(f"{'STEP':40} {'CALLS':>6} {'TIME':>9} {'STEP %':>7} {'SENT':>8} {'RECEIVED':>9}")
+    print("-" * 100)
+    for step in profiled:
+        c = step["commands"]
+        label = f"{step['category'].replace(' Tests', '')}: {step['name']}"[:40]
+        share = c["ms"] / 1000 / step["total_s"] if step.get("total_s") else 0
+        print(f"{label:40} {c['count']:6d} {c['ms']:7.0f}ms {share:7.0%} {c['request_kb']:6.1f}KB "
+              f"{c['response_kb']:7.1f}KB")
+        print("    " + ", ".join(f"{name} {n}" for name, (n, _) in list(c["by_command"].items())[:6]))
+        for site in c["sites"][:top]:
+            print(f"    {site['count']:5d}x {site['ms']:8.1f}ms  {site['command']:18} {site['locator'][:40]:40} "
+                  f"{site['caller']}")
+        slow = c["slowest"][0] if c["slowest"] else None
+        if slow:
+            print(f"    slowest: {slow['command']} {slow['locator'][:40]} {slow['ms']:.1f}ms at {slow['caller']}")
+    print("-" * 100)
+    total = sum(s["commands"]["count"] for s in profiled)
+    total_ms = sum(s["commands"]["ms"] for s in profiled)
+    print(f"{'TOTAL':40} {total:6d} {total_ms:7.0f}ms")
+    print("=" * 100)
+
+
+# One profiler per process, like perf_report.RECORDER
+PROFILER = CommandProfiler(enabled=os.environ.get(PROFILE_ENV) == "1")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the WebDriver command profile of a saved run")
+    parser.add_argument("report", help="reports/perf_<stamp>.json from a --profile-commands run")
+    parser.add_argument("--top", type=int, default=5, help="call sites to show per step")
+    args = parser.parse_args(argv)
+    with open(args.report, encoding="utf-8") as f:
+        steps = json.load(f)["steps"]
+    if not any(s.get("commands") for s in steps):
+        print("⚠ No command profile in this report; run with --profile-commands")
+        return 1
+    print_report(steps, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
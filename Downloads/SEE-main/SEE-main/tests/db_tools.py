@@ -0,0 +1,62 @@
+"""
+Postgres helpers for the benchmark and data tools
+Connection settings come from backend/.env (the same DB_* variables db.js
+uses), overridable by the environment or an explicit DSN.
+psycopg2 is only needed by the tools that talk to Postgres directly:
+    pip install psycopg2-binary
+"""
+
+import os
+
+try:
+    import psycopg2
+    from psycopg2 import sql
+    from psycopg2.extras import execute_values
+except ImportError:  # optional: only the Postgres-backed modes need it
+    psycopg2 = None
+    sql = None
+    execute_values = None
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(os.path.dirname(TESTS_DIR), "backend")
+
+
+def backend_env():
+    """DB_* settings from backend/.env, with real environment variables taking precedence"""
+    env = {}
+    path = os.path.join(BACKEND_DIR, ".env")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#") and "=" in line:
+                    key, _, value = line.partition("=")
+                    env[key.strip()] = value.strip().strip('"').strip("'")
+    for key in ("DB_HOST", "DB_USER", "DB_PASSWORD", "DB_NAME", "DB_PORT"):
+        if os.environ.get(key):
+            env[key] = os.environ[key]
+    return env
+
+
+def connect_params(dbname=None, port=None):
+    env = backend_env()
+    return {
+        "host": env.get("DB_HOST", "localhost"),
+        "user": env.get("DB_USER", "postgres"),
+        "password": env.get("DB_PASSWORD", ""),
+        "dbname": dbname or env.get("DB_NAME", "peer_skill_insights"),
+        "port": int(port or env.get("DB_PORT", 5432)),
+    }
+
+
+def require_psycopg2():
+    if psycopg2 is None:
+        raise SystemExit("❌ psycopg2 is required for this mode: pip install psycopg2-binary")
+
+
+def connect(dsn=None, **overrides):
+    """Open a psycopg2 connection from `dsn`, or from backend/.env settings"""
+    require_psycopg2()
+    if dsn:
+        return psycopg2.connect(dsn)
+    return psycopg2.connect(**connect_params(**overrides))
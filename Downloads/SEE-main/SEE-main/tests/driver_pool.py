@@ -0,0 +1,109 @@
+"""
+Pool of warm, reusable Chrome WebDrivers
+Browsers are launched once up front and handed out with lease(). Between
+leases a browser is reset (storage, cookies, extra windows, about:blank)
+instead of restarted; one that fails its health check is replaced.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
+
+
+def new_driver(headless=True):
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    # maximize_window() is a no-op headless, so pin a desktop-sized viewport
+    options.add_argument("--window-size=1920,1080")
+    return webdriver.Chrome(options=options)
+
+
+def is_healthy(driver):
+    try:
+        return driver.execute_script("return 1") == 1 and bool(driver.window_handles)
+    except WebDriverException:
+        return False
+
+
+def reset_driver(driver):
+    """Return a browser to a blank, logged-out state without restarting it"""
+    try:
+        driver.switch_to.alert.dismiss()
+    except NoAlertPresentException:
+        pass
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    # Storage is per-origin, so clear it before leaving the app's page
+    driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+    driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
+class DriverPool:
+    def __init__(self, size=1, headless=True, factory=None):
+        self.size = size
+        self.factory = factory or (lambda: new_driver(headless))
+        self._idle = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+        self.recycled = 0
+        # Chrome startup dominates, so launch the whole pool concurrently
+        with ThreadPoolExecutor(max_workers=size) as launcher:
+            for driver in launcher.map(lambda _: self._launch(), range(size)):
+                self._idle.put(driver)
+
+    def _launch(self):
+        driver = self.factory()
+        with self._lock:
+            self._all.append(driver)
+        return driver
+
+    def _recycle(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+            self.recycled += 1
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        return self._launch()
+
+    def acquire(self, timeout=None):
+        """Take an idle browser, replacing it first if it has crashed"""
+        driver = self._idle.get(timeout=timeout)
+        if not is_healthy(driver):
+            print("⚠ Pooled browser failed health check, relaunching")
+            driver = self._recycle(driver)
+        return driver
+
+    def release(self, driver):
+        try:
+            reset_driver(driver)
+        except WebDriverException:
+            driver = self._recycle(driver)
+        self._idle.put(driver)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        with self._lock:
+            drivers, self._all = self._all, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
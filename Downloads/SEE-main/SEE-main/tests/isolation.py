@@ -0,0 +1,169 @@
+"""
+Per-worker test isolation with Postgres template-database clones
+Each worker gets its own copy of a template database (CREATE DATABASE ...
+TEMPLATE), its own backend/server.js on that copy and its own Vite server
+proxying to it. Workers can then add and remove skills, peers and
+resources concurrently, and the copy is dropped afterwards: no cleanup
+scripts are needed.
+
+    python isolation.py --make-template     # snapshot DB_NAME (stop the backend first)
+    python isolation.py --bench 5           # time clone + drop
+"""
+
+import argparse
+import os
+import time
+from backend_process import BackendProcess, FrontendProcess
+from db_tools import backend_env, connect, sql
+
+TEMPLATE_SUFFIX = "_template"
+API_PORT_BASE = 3200
+FRONTEND_PORT_BASE = 5200
+
+
+def template_name():
+    return backend_env().get("DB_NAME", "peer_skill_insights") + TEMPLATE_SUFFIX
+
+
+def _admin(dsn=None):
+    """Autocommit connection to the maintenance DB (CREATE/DROP DATABASE can't run in a transaction)"""
+    conn = connect(dsn) if dsn else connect(dbname="postgres")
+    conn.autocommit = True
+    return conn
+
+
+def make_template(source=None, template=None, dsn=None):
+    """(Re)create the template as a copy of `source`; nobody may be connected to `source`"""
+    source = source or backend_env().get("DB_NAME", "peer_skill_insights")
+    template = template or template_name()
+    conn = _admin(dsn)
+    try:
+        drop_database(conn, template)
+        with conn.cursor() as cur:
+            cur.execute(sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                sql.Identifier(template), sql.Identifier(source)))
+    finally:
+        conn.close()
+    return template
+
+
+def drop_database(conn, name):
+    with conn.cursor() as cur:
+        force = " WITH (FORCE)" if conn.server_version >= 130000 else ""
+        cur.execute(sql.SQL("DROP DATABASE IF EXISTS {}" + force).format(sql.Identifier(name)))
+
+
+class TemplateClone:
+    """A throwaway copy of the template database"""
+
+    def __init__(self, name, template=None, dsn=None):
+        self.name = name
+        self.template = template or template_name()
+        self.dsn = dsn
+        self.seconds = None
+
+    def create(self):
+        conn = _admin(self.dsn)
+        try:
+            drop_database(conn, self.name)
+            # FILE_COPY copies the files directly; much faster than the PG15+ WAL_LOG default for small DBs
+            strategy = " STRATEGY FILE_COPY" if conn.server_version >= 150000 else ""
+            start = time.perf_counter()
+            with conn.cursor() as cur:
+                cur.execute(sql.SQL("CREATE DATABASE {} TEMPLATE {}" + strategy).format(
+                    sql.Identifier(self.name), sql.Identifier(self.template)))
+            self.seconds = time.perf_counter() - start
+        finally:
+            conn.close()
+        return self.name
+
+    def drop(self):
+        conn = _admin(self.dsn)
+        try:
+            drop_database(conn, self.name)
+        finally:
+            conn.close()
+
+    def __enter__(self):
+        return self.create()
+
+    def __exit__(self, *exc):
+        self.drop()
+
+
+class IsolatedStack:
+    """Clone + backend + frontend for worker `index`; sets PSI_API_URL/PSI_FRONTEND_URL while active"""
+
+    def __init__(self, index, template=None, log_dir=None):
+        self.index = index
+        db_name = backend_env().get("DB_NAME", "peer_skill_insights")
+        self.clone = TemplateClone(f"{db_name}_w{index}_{os.getpid()}", template)
+        self.api_port = API_PORT_BASE + index
+        self.frontend_port = FRONTEND_PORT_BASE + index
+        self.log_dir = log_dir
+        self.backend = None
+        self.frontend = None
+        self._saved_env = {}
+
+    def _log(self, name):
+        return os.path.join(self.log_dir, f"{name}_w{self.index}.log") if self.log_dir else None
+
+    def start(self):
+        start = time.perf_counter()
+        self.clone.create()
+        try:
+            self.backend = BackendProcess(self.api_port, self._log("backend"), DB_NAME=self.clone.name)
+            self.backend.start()
+            self.frontend = FrontendProcess(self.frontend_port, self.backend.url, self._log("frontend"))
+            self.frontend.start(timeout=60)
+        except Exception:
+            self.stop()
+            raise
+        for key, value in (("PSI_API_URL", self.backend.url), ("PSI_FRONTEND_URL", self.frontend.url)):
+            self._saved_env[key] = os.environ.get(key)
+            os.environ[key] = value
+        print(f"✓ Worker {self.index}: {self.clone.name} cloned in {self.clone.seconds * 1000:.0f} ms, "
+              f"stack up in {time.perf_counter() - start:.1f}s ({self.frontend.url} -> {self.backend.url})")
+        return self
+
+    def stop(self):
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self._saved_env = {}
+        for proc in (self.frontend, self.backend):
+            if proc:
+                proc.stop()
+        # The backend's pool must be gone before the drop; WITH (FORCE) covers stragglers
+        self.clone.drop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the template database used for isolated test workers")
+    parser.add_argument("--make-template", action="store_true",
+                        help="snapshot DB_NAME into the template (no other connections to DB_NAME allowed)")
+    parser.add_argument("--bench", type=int, metavar="N", help="create and drop N clones, reporting timings")
+    args = parser.parse_args(argv)
+
+    if args.make_template:
+        start = time.perf_counter()
+        print(f"✓ Template {make_template()} created in {time.perf_counter() - start:.2f}s")
+    if args.bench:
+        for i in range(args.bench):
+            clone = TemplateClone(f"{template_name()}_bench{i}")
+            clone.create()
+            start = time.perf_counter()
+            clone.drop()
+            print(f"   clone {clone.seconds * 1000:7.1f} ms   drop {(time.perf_counter() - start) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+HTTP load generator for the Express backend
+Virtual users replay a realistic session (register/login, load state, save
+skills, skill match, send + accept peer requests, remove peers) over a pool
+of keep-alive connections, then we report throughput and p50/p95/p99
+latency per endpoint.
+
+    python load_test.py --stub                       # in-process stand-in backend
+    python load_test.py --base-url http://localhost:3001 --users 50
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+from api_session import API_URL
+
+PASSWORD = "Load@#$123"
+SKILL_POOL = ["Python", "Java", "React", "SQL", "Git", "Docker", "AWS", "Linux",
+              "Node.js", "Machine Learning", "Communication", "Leadership", "Selenium"]
+
+# /api/state/42 -> /api/state/:userId, so stats group by route, not by user
+ROUTE_PATTERNS = [
+    (re.compile(r"^/api/state/save$"), "/api/state/save"),
+    (re.compile(r"^/api/state/[^/]+$"), "/api/state/:userId"),
+    (re.compile(r"^/api/skill-match/[^/]+$"), "/api/skill-match/:userId"),
+    (re.compile(r"^/api/peers/requests/[^/]+$"), "/api/peers/requests/:userId"),
+]
+
+
+def route_of(method, path):
+    path = path.split("?", 1)[0]
+    for pattern, name in ROUTE_PATTERNS:
+        if pattern.match(path):
+            return f"{method} {name}"
+    return f"{method} {path}"
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class Response:
+    def __init__(self, status, headers, body, elapsed=0.0):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.elapsed = elapsed  # seconds on the wire, excluding time queued for a connection
+
+    def json(self):
+        return json.loads(self.body) if self.body else None
+
+
+class ConnectionPool:
+    """Minimal asyncio HTTP/1.1 client with up to `size` keep-alive connections"""
+
+    def __init__(self, base_url, size=10, timeout=30):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.size = size
+        self.timeout = timeout
+        self._idle = asyncio.Queue()
+        self._opened = 0
+        self._slots = asyncio.Semaphore(size)
+
+    async def _acquire(self):
+        await self._slots.acquire()
+        if not self._idle.empty():
+            return self._idle.get_nowait()
+        try:
+            conn = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        except BaseException:
+            # A failed connect must give its slot back or the pool drains to nothing
+            self._slots.release()
+            raise
+        self._opened += 1
+        return conn
+
+    def _release(self, conn, reusable):
+        if reusable:
+            self._idle.put_nowait(conn)
+        else:
+            conn[1].close()
+        self._slots.release()
+
+    async def request(self, method, path, body=None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+                f"Connection: keep-alive\r\n\r\n").encode()
+        for attempt in range(2):
+            conn = await self._acquire()
+            reader, writer = conn
+            start = time.perf_counter()
+            try:
+                writer.write(head + payload)
+                await writer.drain()
+                resp = await asyncio.wait_for(self._read_response(reader), self.timeout)
+                resp.elapsed = time.perf_counter() - start
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Server closed an idle keep-alive socket; retry once on a fresh one
+                self._release(conn, False)
+                if attempt:
+                    raise
+                continue
+            except BaseException:
+                self._release(conn, False)
+                raise
+            self._release(conn, resp.headers.get("connection", "").lower() != "close")
+            return resp
+
+    async def _read_response(self, reader):
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = b""
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                body += chunk[:-2]
+        else:
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+        return Response(status, headers, body)
+
+    async def close(self):
+        while not self._idle.empty():
+            _, writer = self._idle.get_nowait()
+            writer.close()
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)  # route -> [seconds]
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, route, seconds, status):
+        self.latencies[route].append(seconds)
+        self.statuses[route][status] += 1
+        if status >= 500:
+            self.errors[route] += 1
+
+    def error(self, route):
+        self.errors[route] += 1
+
+    def report(self, elapsed):
+        total = sum(len(v) for v in self.latencies.values())
+        print("\n" + "=" * 96)
+        print(f"{'ENDPOINT':38} {'COUNT':>7} {'ERR':>5} {'REQ/S':>8} {'P50 ms':>9} {'P95 ms':>9} {'P99 ms':>9}")
+        print("-" * 96)
+        for route in sorted(self.latencies):
+            values = sorted(self.latencies[route])
+            print(f"{route:38} {len(values):7d} {self.errors[route]:5d} {len(values) / elapsed:8.1f} "
+                  f"{percentile(values, 50) * 1000:9.2f} {percentile(values, 95) * 1000:9.2f} "
+                  f"{percentile(values, 99) * 1000:9.2f}")
+        print("-" * 96)
+        print(f"TOTAL: {total} requests in {elapsed:.2f}s ({total / elapsed:.1f} req/s), "
+              f"{sum(self.errors.values())} errors")
+        print("=" * 96)
+
+    def as_dict(self, elapsed):
+        out = {}
+        for route, values in self.latencies.items():
+            values = sorted(values)
+            out[route] = {
+                "count": len(values), "errors": self.errors[route],
+                "rps": len(values) / elapsed,
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "statuses": dict(self.statuses[route]),
+            }
+        return out
+
+
+class VirtualUser:
+    def __init__(self, index, email, pool, stats, rng):
+        self.index = index
+        self.email = email
+        self.pool = pool
+        self.stats = stats
+        self.rng = rng
+        self.user_id = None
+        self.state = None
+
+    async def call(self, method, path, body=None):
+        route = route_of(method, path)
+        try:
+            resp = await self.pool.request(method, path, body)
+        except Exception:
+            self.stats.error(route)
+            return None
+        self.stats.record(route, resp.elapsed, resp.status)
+        return resp
+
+    async def login(self):
+        await self.call("POST", "/api/register", {"username": self.email, "password": PASSWORD})
+        resp = await self.call("POST", "/api/login", {"username": self.email, "password": PASSWORD})
+        if resp and resp.status == 200:
+            self.user_id = resp.json()["userId"]
+        return self.user_id is not None
+
+    async def load_state(self):
+        resp = await self.call("GET", f"/api/state/{self.user_id}")
+        if resp and resp.status == 200:
+            self.state = resp.json()
+
+    async def edit_skills(self):
+        skills = [{"skill": s, "company": "LoadCorp"} for s in self.rng.sample(SKILL_POOL, self.rng.randint(2, 6))]
+        profile = (self.state or {}).get("profile") or {"name": "", "meta": "", "companies": [], "avatar": ""}
+        await self.call("POST", "/api/state/save", {"userId": self.user_id, "mySkills": skills, "profile": profile})
+        await self.call("GET", f"/api/skill-match/{self.user_id}")
+
+    async def send_request(self, other_email):
+        await self.call("POST", "/api/peers/request", {"senderId": self.user_id, "receiverEmail": other_email})
+
+    async def accept_requests(self):
+        resp = await self.call("GET", f"/api/peers/requests/{self.user_id}")
+        for req in (resp.json() if resp and resp.status == 200 else []):
+            await self.call("POST", "/api/peers/respond", {"requestId": req["id"], "action": "accept"})
+
+    async def remove_peers(self):
+        await self.load_state()
+        for peer in (self.state or {}).get("peers", []):
+            await self.call("POST", "/api/peers/remove", {"userId": self.user_id, "peerId": peer["id"]})
+
+
+async def run_load(base_url, users=20, iterations=5, connections=10, seed=1):
+    run_tag = int(time.time()) % 100000
+    pool = ConnectionPool(base_url, connections)
+    stats = Stats()
+    rng = random.Random(seed)
+    vus = [VirtualUser(i, f"01fe24load{run_tag:05d}{i:04d}@kletech.ac.in", pool, stats,
+                       random.Random(rng.random())) for i in range(users)]
+
+    async def phase(coros):
+        await asyncio.gather(*coros)
+
+    start = time.perf_counter()
+    await phase(vu.login() for vu in vus)
+    vus = [vu for vu in vus if vu.user_id is not None]
+    for _ in range(iterations):
+        await phase(vu.load_state() for vu in vus)
+        await phase(vu.edit_skills() for vu in vus)
+    if len(vus) > 1:
+        # Ring of requests: every user asks the next one, then everyone accepts
+        await phase(vu.send_request(vus[(i + 1) % len(vus)].email) for i, vu in enumerate(vus))
+        await phase(vu.accept_requests() for vu in vus)
+        await phase(vu.load_state() for vu in vus)
+        # Leave the accounts unlinked so the next run starts clean
+        await phase(vu.remove_peers() for vu in vus)
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    return stats, elapsed, len(vus)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Peer Skill Insights API")
+    parser.add_argument("--base-url", default=API_URL)
+    parser.add_argument("--stub", action="store_true", help="start the in-memory stand-in backend and target it")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=5, help="load/save rounds per user")
+    parser.add_argument("--connections", type=int, default=10, help="keep-alive connection pool size")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the per-endpoint numbers to this file")
+    args = parser.parse_args(argv)
+
+    backend = None
+    base_url = args.base_url
+    if args.stub:
+        from stub_backend import StubBackend
+        backend = StubBackend()
+        base_url = backend.start()
+    print(f"→ {args.users} virtual users, {args.iterations} iterations, "
+          f"{args.connections} connections against {base_url}")
+    try:
+        stats, elapsed, active = asyncio.run(
+            run_load(base_url, args.users, args.iterations, args.connections, args.seed))
+    finally:
+        if backend:
+            backend.stop()
+    print(f"✓ {active}/{args.users} virtual users logged in")
+    stats.report(elapsed)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"base_url": base_url, "elapsed": elapsed, "endpoints": stats.as_dict(elapsed)}, f, indent=2)
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+N+1 query detector for GET /api/state/:userId
+Seeds one user with 10, 100 and 1000 linked (mutual) peers, then measures
+response time and database round-trips per request at each size. Fails
+(exit code 1) when queries per request grow with the peer count.
+
+    python n_plus_one.py --stub                     # in-memory stand-in, counts from X-Query-Count
+    python n_plus_one.py --spawn-backend            # real server.js + Postgres via the counting proxy
+    python n_plus_one.py --base-url http://localhost:3101 --proxy-port 6543
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import time
+from urllib.parse import urlsplit
+from db_tools import connect, connect_params, execute_values
+from pg_proxy import QueryCountingProxy
+
+PEER_COUNTS = (10, 100, 1000)
+SKILLS_PER_PEER = 3
+SKILLS = ["Python", "Java", "React", "SQL", "Git", "Docker", "AWS", "Linux"]
+USER_PREFIX = "01fe24npq"
+
+
+def seed_stub(store, peer_count):
+    """Fresh stand-in store with one user linked both ways to `peer_count` peers"""
+    store.reset()
+    me = store.insert("users", username=f"{USER_PREFIX}main@kletech.ac.in", password="x",
+                      name="Main", company=None, meta=None, avatar=None)
+    for i in range(peer_count):
+        peer = store.insert("users", username=f"{USER_PREFIX}{i:05d}@kletech.ac.in", password="x",
+                            name=f"Peer {i}", company=None, meta=None, avatar=None)
+        for j in range(SKILLS_PER_PEER):
+            store.insert("skills", user_id=peer["id"], skill=SKILLS[(i + j) % len(SKILLS)], company="")
+        store.insert("peers", user_id=me["id"], linked_user_id=peer["id"], name=peer["name"], company=None)
+        store.insert("peers", user_id=peer["id"], linked_user_id=me["id"], name=me["name"], company=None)
+        store.insert("resources", user_id=peer["id"], skill="Python", title=f"Guide {i}", url="https://example.com",
+                     note="", author=peer["name"], peer_index=0)
+    return me["id"]
+
+
+def cleanup_postgres(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM users WHERE username LIKE %s", (USER_PREFIX + "%",))
+        ids = [r[0] for r in cur.fetchall()]
+        if ids:
+            # peers.linked_user_id has no FK, so clear the reverse links by hand
+            cur.execute("DELETE FROM peers WHERE linked_user_id = ANY(%s)", (ids,))
+            cur.execute("DELETE FROM users WHERE id = ANY(%s)", (ids,))
+    conn.commit()
+
+
+def seed_postgres(conn, peer_count):
+    """Same shape as seed_stub, written with multi-row inserts"""
+    cleanup_postgres(conn)
+    with conn.cursor() as cur:
+        cur.execute("INSERT INTO users (username, password, name) VALUES (%s, 'x', 'Main') RETURNING id",
+                    (f"{USER_PREFIX}main@kletech.ac.in",))
+        me = cur.fetchone()[0]
+        peer_ids = [r[0] for r in execute_values(
+            cur, "INSERT INTO users (username, password, name) VALUES %s RETURNING id",
+            [(f"{USER_PREFIX}{i:05d}@kletech.ac.in", "x", f"Peer {i}") for i in range(peer_count)],
+            fetch=True)]
+        execute_values(cur, "INSERT INTO skills (user_id, skill, company) VALUES %s",
+                       [(pid, SKILLS[(i + j) % len(SKILLS)], "") for i, pid in enumerate(peer_ids)
+                        for j in range(SKILLS_PER_PEER)])
+        execute_values(cur, "INSERT INTO peers (user_id, linked_user_id, name) VALUES %s",
+                       [(me, pid, f"Peer {i}") for i, pid in enumerate(peer_ids)]
+                       + [(pid, me, "Main") for pid in peer_ids])
+        execute_values(cur, "INSERT INTO resources (user_id, skill, title, url, note, author, peer_index) VALUES %s",
+                       [(pid, "Python", f"Guide {i}", "https://example.com", "", f"Peer {i}", 0)
+                        for i, pid in enumerate(peer_ids)])
+    conn.commit()
+    return me
+
+
+def measure(base_url, user_id, requests, counter=None, warmup=2):
+    """Time `requests` state loads; queries come from `counter()` deltas or X-Query-Count"""
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+    latencies, queries = [], []
+    try:
+        for i in range(warmup + requests):
+            before = counter() if counter else 0
+            start = time.perf_counter()
+            conn.request("GET", f"/api/state/{user_id}")
+            resp = conn.getresponse()
+            body = resp.read()
+            elapsed = time.perf_counter() - start
+            if resp.status != 200:
+                raise RuntimeError(f"GET /api/state/{user_id} -> {resp.status}: {body[:200]!r}")
+            if counter and i == 0 and counter() == before:
+                raise RuntimeError("no queries reached the counting proxy; point the backend's DB_PORT at it")
+            if i < warmup:
+                continue
+            latencies.append(elapsed)
+            if counter:
+                queries.append(counter() - before)
+            else:
+                queries.append(int(resp.getheader("X-Query-Count", 0)))
+            peers = len(json.loads(body)["peers"])
+    finally:
+        conn.close()
+    return {
+        "peers_returned": peers,
+        "median_ms": statistics.median(latencies) * 1000,
+        "p95_ms": sorted(latencies)[max(0, int(len(latencies) * 0.95) - 1)] * 1000,
+        "queries": statistics.median(queries),
+    }
+
+
+def linear_fit(xs, ys):
+    """Least-squares y = a + b*x"""
+    mx, my = statistics.fmean(xs), statistics.fmean(ys)
+    var = sum((x - mx) ** 2 for x in xs)
+    b = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var if var else 0.0
+    return my - b * mx, b
+
+
+def report(rows, max_growth):
+    print("\n" + "=" * 72)
+    print(" " * 16 + "GET /api/state/:userId SCALING")
+    print("=" * 72)
+    print(f"{'PEERS':>8} {'QUERIES/REQ':>13} {'MEDIAN ms':>11} {'P95 ms':>9} {'ms/PEER':>9}")
+    print("-" * 72)
+    for row in rows:
+        print(f"{row['peers']:8d} {row['queries']:13.1f} {row['median_ms']:11.2f} {row['p95_ms']:9.2f} "
+              f"{row['median_ms'] / row['peers']:9.4f}")
+    xs = [r["peers"] for r in rows]
+    q_a, q_b = linear_fit(xs, [r["queries"] for r in rows])
+    t_a, t_b = linear_fit(xs, [r["median_ms"] for r in rows])
+    print("-" * 72)
+    print(f"queries/request ≈ {q_a:.1f} + {q_b:.3f}·peers")
+    print(f"latency ms      ≈ {t_a:.2f} + {t_b:.4f}·peers")
+    print("=" * 72)
+    if q_b > max_growth:
+        print(f"❌ N+1 DETECTED: {q_b:.3f} extra queries per peer (allowed {max_growth})")
+        return False
+    print("✅ Query count does not grow with peer count")
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detect N+1 queries on the state load path")
+    parser.add_argument("--stub", action="store_true", help="use the in-memory stand-in backend")
+    parser.add_argument("--spawn-backend", action="store_true",
+                        help="start backend/server.js with DB_PORT pointed at a counting proxy")
+    parser.add_argument("--base-url", help="already running backend whose DB_PORT points at --proxy-port")
+    parser.add_argument("--proxy-port", type=int, default=0, help="port for the counting proxy")
+    parser.add_argument("--backend-port", type=int, default=3101)
+    parser.add_argument("--dsn", help="Postgres DSN for seeding (default: backend/.env)")
+    parser.add_argument("--peers", type=int, nargs="+", default=list(PEER_COUNTS))
+    parser.add_argument("--requests", type=int, default=20, help="timed requests per size")
+    parser.add_argument("--max-growth", type=float, default=0.0,
+                        help="allowed extra queries per additional peer before failing")
+    parser.add_argument("--json", help="write the scaling curve to this file")
+    args = parser.parse_args(argv)
+
+    rows = []
+    if args.stub:
+        from stub_backend import StubBackend
+        backend = StubBackend()
+        base_url = backend.start()
+        try:
+            for n in args.peers:
+                user_id = seed_stub(backend.store, n)
+                rows.append(dict(peers=n, **measure(base_url, user_id, args.requests)))
+                print(f"✓ {n} peers measured")
+        finally:
+            backend.stop()
+    else:
+        if not args.spawn_backend and not args.base_url:
+            parser.error("choose --stub, --spawn-backend or --base-url")
+        if args.base_url and not args.spawn_backend and not args.proxy_port:
+            # A random proxy port is one the running backend cannot be pointed at
+            parser.error("--base-url needs --proxy-port: the backend's DB_PORT must point at the counting proxy")
+        params = connect_params()
+        proxy = QueryCountingProxy(params["host"], params["port"], listen_port=args.proxy_port)
+        proxy_port = proxy.start()
+        print(f"→ Counting proxy on :{proxy_port} -> {params['host']}:{params['port']}")
+        backend = None
+        conn = connect(args.dsn)
+        try:
+            base_url = args.base_url
+            if args.spawn_backend:
+                from backend_process import BackendProcess
+                backend = BackendProcess(args.backend_port, DB_PORT=proxy_port, DB_HOST="127.0.0.1")
+                base_url = backend.start()
+            for n in args.peers:
+                user_id = seed_postgres(conn, n)
+                rows.append(dict(peers=n, **measure(base_url, user_id, args.requests, lambda: proxy.queries)))
+                print(f"✓ {n} peers measured")
+        finally:
+            cleanup_postgres(conn)
+            conn.close()
+            if backend:
+                backend.stop()
+            proxy.stop()
+
+    ok = report(rows, args.max_growth)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"rows": rows, "passed": ok}, f, indent=2)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
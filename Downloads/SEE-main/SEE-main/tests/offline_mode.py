@@ -0,0 +1,159 @@
+"""
+Offline mode: serve /api/* from recorded fixtures inside the browser
+A fetch override is registered through CDP (Page.addScriptToEvaluateOnNewDocument),
+so it is in place before the app's own scripts run. It answers
+/api/state/:userId, /api/skill-match/:userId and /api/peers/requests/:userId
+from a fixture file, applies /api/state/save to that state (so edits survive
+a reload), acknowledges other writes with {"success": true} and blocks real
+/api/ traffic. Only the Vite frontend needs to be running.
+
+    python offline_mode.py --record default --stub          # fixture from seeded stand-in data
+    python offline_mode.py --record mine --email 01fe...@kletech.ac.in --password ...
+"""
+
+import argparse
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from selenium.webdriver.common.by import By
+from api_session import ApiClient, inject_session
+from waits import Waiter
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "api")
+
+# Routes served from the fixture; numeric path segments are matched as :id
+RECORDED_ROUTES = {
+    "GET /api/state/:id": "/api/state/{user_id}",
+    "GET /api/skill-match/:id": "/api/skill-match/{user_id}",
+    "GET /api/peers/requests/:id": "/api/peers/requests/{user_id}",
+}
+
+# Saves to /api/state/save are applied to the fixture state and kept in
+# sessionStorage (tagged with this session's nonce) so they survive reloads.
+INTERCEPT_FETCH = """
+(() => {
+    if (window.__psiOffline) return;
+    const fixture = %s, nonce = %s, STATE_KEY = '__psiOfflineState', STATE_ROUTE = 'GET /api/state/:id';
+    const offline = window.__psiOffline = { calls: [] };
+    try {
+        const saved = JSON.parse(sessionStorage.getItem(STATE_KEY) || 'null');
+        if (saved && saved.nonce === nonce) fixture.routes[STATE_ROUTE] = saved.state;
+    } catch (e) {}
+    const save = body => {
+        const state = fixture.routes[STATE_ROUTE];
+        if (!state) return;
+        if (body.profile) {
+            const companies = Array.isArray(body.profile.companies) ? body.profile.companies : state.profile.companies;
+            Object.assign(state.profile, body.profile, { companies, company: JSON.stringify(companies) });
+        }
+        if (Array.isArray(body.mySkills)) {
+            state.mySkills = body.mySkills.map(s => typeof s === 'string' ? { skill: s, company: '' } : s);
+        }
+        if (Array.isArray(body.resources)) state.resources = body.resources;
+        try { sessionStorage.setItem(STATE_KEY, JSON.stringify({ nonce, state })); } catch (e) {}
+    };
+    const origFetch = window.fetch;
+    const reply = (status, body) => Promise.resolve(new Response(JSON.stringify(body), {
+        status, headers: { 'Content-Type': 'application/json' }
+    }));
+    window.fetch = function (input, init) {
+        const url = typeof input === 'string' ? input : (input && input.url) || '';
+        if (!url.includes('/api/')) return origFetch.apply(this, arguments);
+        const method = ((init && init.method) || (input && input.method) || 'GET').toUpperCase();
+        const path = new URL(url, location.origin).pathname.replace(/\\/\\d+(?=\\/|$)/g, '/:id');
+        const key = method + ' ' + path;
+        offline.calls.push(key);
+        if (key === 'POST /api/state/save') {
+            try { save(JSON.parse(init.body)); } catch (e) {}
+        }
+        if (key in fixture.routes) return reply(200, fixture.routes[key]);
+        if (method !== 'GET') return reply(200, { success: true });
+        return reply(404, { error: 'No offline fixture for ' + key });
+    };
+})();
+"""
+
+
+def fixture_path(name):
+    return os.path.join(FIXTURE_DIR, f"{name}.json")
+
+
+def load_fixture(name="default"):
+    with open(fixture_path(name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def enable_offline(driver, fixture):
+    """Serve /api/ from `fixture` in every document this driver opens; returns the script id"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    # Belt and braces: anything that slips past the override never reaches a backend
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": ["*/api/*"]})
+    return driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                                  {"source": INTERCEPT_FETCH % (json.dumps(fixture), json.dumps(uuid.uuid4().hex))})["identifier"]
+
+
+def disable_offline(driver, identifier):
+    """Undo enable_offline (pooled browsers keep CDP scripts across resets)"""
+    driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+
+
+@contextmanager
+def offline_session(driver, base_url, fixture, waits=None):
+    """Open the app logged in as the fixture's user, with no backend involved"""
+    waits = waits or Waiter(driver)
+    identifier = enable_offline(driver, fixture)
+    try:
+        inject_session(driver, base_url, fixture["session"])
+        waits.present((By.CLASS_NAME, "sidebar"))
+        yield fixture["session"]
+    finally:
+        disable_offline(driver, identifier)
+
+
+def record_fixture(client, email, password):
+    """Log in through `client` and capture the responses the read-only pages need"""
+    auth = client.login(email, password)
+    routes = {key: client.get(path.format(user_id=auth["userId"])) for key, path in RECORDED_ROUTES.items()}
+    return {"session": auth, "routes": routes}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record API fixtures for offline UI runs")
+    parser.add_argument("--record", metavar="NAME", required=True, help="fixture name (fixtures/api/NAME.json)")
+    parser.add_argument("--stub", action="store_true", help="record from the stand-in loaded with seed_data")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--api", help="backend URL (default: PSI_API_URL or http://localhost:3001)")
+    args = parser.parse_args(argv)
+
+    backend = None
+    if args.stub:
+        from seed_data import SEED_PASSWORD, add_hub, generate, load_stub
+        from stub_backend import StubBackend
+        backend = StubBackend()
+        ds = generate(60, seed=1)
+        email, password = add_hub(ds, 25), SEED_PASSWORD
+        ids = load_stub(backend.store, ds)
+        # One incoming request so the Peers page has something to show
+        backend.store.insert("peer_requests", sender_id=ids[40], receiver_id=ids[-1], status="pending")
+        api = backend.start()
+    elif args.email and args.password:
+        email, password, api = args.email, args.password, args.api
+    else:
+        parser.error("use --stub or give --email and --password")
+    try:
+        fixture = record_fixture(ApiClient(api), email, password)
+    finally:
+        if backend:
+            backend.stop()
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    with open(fixture_path(args.record), "w", encoding="utf-8") as f:
+        json.dump(fixture, f, indent=1)
+    print(f"✓ Recorded {len(fixture['routes'])} routes for {email} -> {fixture_path(args.record)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Batched DOM queries: one WebDriver round-trip per step
+Every find_element / .text / page_source is a separate HTTP call to
+chromedriver. Page objects here declare their locators once. A step collects
+its lookups, text reads, "contains" assertions and input fills into a Batch,
+which runs as a single execute_script call and returns everything at once.
+Elements come back as WebElements, so clicking one does not need a
+second lookup.
+
+    snap = PEERS.batch(driver).fill("email_input", email).element("add_button").run()
+    snap["add_button"].click()
+
+    snap = PEERS.batch(driver).contains("my_peers", email).run()
+    if snap.contains("my_peers", email): ...
+"""
+
+# Runs the whole batch in the page. Fills go through the native value setter
+# plus an input/change event, which is what React's onChange listens to.
+RUN_BATCH = """
+const queries = arguments[0];
+const find = (loc) => {
+    if (loc.by === 'css') return [...document.querySelectorAll(loc.value)];
+    const r = document.evaluate(loc.value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const out = [];
+    for (let i = 0; i < r.snapshotLength; i++) out.push(r.snapshotItem(i));
+    return out;
+};
+const setValue = (el, value) => {
+    const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event(el instanceof HTMLSelectElement ? 'change' : 'input', { bubbles: true }));
+};
+const results = {};
+for (const q of queries) {
+    const els = find(q.locator);
+    const r = results[q.key] = { count: els.length };
+    if (q.element) r.element = els[0] || null;
+    if (q.elements) r.elements = els;
+    if (q.text) r.text = els.map(e => e.innerText);
+    if (q.contains) r.contains = q.contains.map(t => els.some(e => e.innerText.includes(t)));
+    if (q.fill !== null && q.fill !== undefined && els[0]) { setValue(els[0], q.fill); r.filled = true; }
+}
+return { url: location.pathname, results: results };
+"""
+
+
+class Locator:
+    """A CSS or XPath selector; '{0}'-style placeholders are filled by calling it"""
+
+    def __init__(self, by, value):
+        self.by = by
+        self.value = value
+
+    def __call__(self, *args):
+        return Locator(self.by, self.value.format(*args))
+
+    def as_dict(self):
+        return {"by": self.by, "value": self.value}
+
+
+def css(value):
+    return Locator("css", value)
+
+
+def xpath(value):
+    return Locator("xpath", value)
+
+
+def button(label):
+    return xpath(f"//button[contains(text(), '{label}')]")
+
+
+def placeholder(text, tag="input"):
+    return css(f"{tag}[placeholder='{text}']")
+
+
+class Page:
+    """Named locators for one page, built once and shared by every test"""
+
+    def __init__(self, name, **locators):
+        self.name = name
+        self.locators = locators
+
+    def locator(self, name, *args):
+        loc = self.locators[name]
+        return loc(*args) if args else loc
+
+    def batch(self, driver):
+        return Batch(driver, self)
+
+
+class Batch:
+    def __init__(self, driver, page=None):
+        self.driver = driver
+        self.page = page
+        self.queries = {}
+
+    def _query(self, name, args):
+        """The query for `name` (a page locator name, with placeholder args, or a Locator)"""
+        if isinstance(name, Locator):
+            key, loc = name.value, name
+        else:
+            key, loc = name, self.page.locator(name, *args)
+        return self.queries.setdefault(key, {"key": key, "locator": loc.as_dict()})
+
+    def element(self, name, *args):
+        self._query(name, args)["element"] = True
+        return self
+
+    def elements(self, name, *args):
+        self._query(name, args)["elements"] = True
+        return self
+
+    def count(self, name, *args):
+        self._query(name, args)
+        return self
+
+    def text(self, name, *args):
+        self._query(name, args)["text"] = True
+        return self
+
+    def contains(self, name, *texts, args=()):
+        query = self._query(name, args)
+        query["contains"] = query.get("contains", []) + list(texts)
+        return self
+
+    def fill(self, name, value, *args):
+        self._query(name, args)["fill"] = value
+        return self
+
+    def run(self):
+        raw = self.driver.execute_script(RUN_BATCH, list(self.queries.values()))
+        return Snapshot(raw, self.queries)
+
+
+class Snapshot:
+    """What a batch found; look results up by locator name"""
+
+    def __init__(self, raw, queries):
+        self.url = raw["url"]
+        self.results = raw["results"]
+        self.queries = queries
+
+    def __getitem__(self, name):
+        """First matching WebElement, or None"""
+        return self.results[name].get("element")
+
+    def all(self, name):
+        return self.results[name].get("elements", [])
+
+    def count(self, name):
+        return self.results[name]["count"]
+
+    def exists(self, name):
+        return self.results[name]["count"] > 0
+
+    def text(self, name):
+        """Visible text of every match, joined"""
+        return "\n".join(self.results[name].get("text", []))
+
+    def contains(self, name, text):
+        """Whether any match of `name` shows `text`"""
+        texts = self.queries[name].get("contains", [])
+        return self.results[name]["contains"][texts.index(text)]
+
+    def filled(self, name):
+        return self.results[name].get("filled", False)
+
+    def missing(self):
+        return [name for name, r in self.results.items() if not r["count"]]
+
+
+SIDEBAR = Page(
+    "Sidebar",
+    nav=button("{0}"),
+)
+
+MY_SKILLS = Page(
+    "My Skills",
+    heading=xpath("//h2[contains(text(), 'My Skills')]"),
+    company_input=placeholder("e.g. Google"),
+    skill_input=placeholder("e.g. Python, React"),
+    update_button=button("Update Details"),
+    body=css("body"),
+)
+
+PEERS = Page(
+    "Peers",
+    nav=button("Peers"),
+    email_input=placeholder("Enter Peer Email (e.g. 01fe...@kletech.ac.in)"),
+    add_button=button("Add Peer"),
+    # Pending request card for a sender email -> its Accept button
+    accept_button=xpath("//div[contains(text(), '{0}')]/ancestor::div[contains(@class,'peer-card')]"
+                        "//button[contains(text(), 'Accept')]"),
+    my_peers=xpath("//h3[contains(text(), 'My Peers')]/.."),
+    # Cards in My Peers showing a given name (more than one is a duplicate link)
+    peer_name=xpath("//h3[contains(text(), 'My Peers')]/..//div[contains(@class,'peer-card')]//strong[text()='{0}']"),
+    body=css("body"),
+)
+
+RESOURCES = Page(
+    "Resources",
+    recommend_button=button("Recommend to Peer"),
+    peer_select=xpath("//select[option[text()='Select Peer...']]"),
+    skill_input=placeholder("e.g. Python"),
+    title_input=placeholder("Resource Title"),
+    url_input=placeholder("https://..."),
+    note_input=placeholder("Optional note"),
+    send_button=xpath("//button[text()='Send']"),
+    body=css("body"),
+)
@@ -0,0 +1,456 @@
+"""
+Peer-graph analytics on a compact array-backed adjacency index
+`peers(user_id, linked_user_id)` is a directed edge list: /api/peers/respond
+inserts both directions, /api/peers/remove deletes both, and /api/state/:userId
+asks Postgres which of a user's links are mutual with one ANY($1::int[]) query
+per load. This module loads the whole graph into sorted int64 edge keys
+((src << 32) | dst) with CSR row offsets, and answers in bulk:
+- mutual-peer checks (for every edge or for arbitrary pairs)
+- second-degree suggestions ranked by common peers (pending requests excluded)
+- connected components
+Accepted and removed peers are buffered and merged in linear time, without
+reloading or re-sorting the graph.
+
+    python peer_graph.py --bench 100000          # synthetic 100k-user benchmark
+    python peer_graph.py --check                 # compare with a plain dict-of-sets model
+    python peer_graph.py --user 12               # suggestions from the live database
+
+numpy is needed: pip install numpy
+"""
+
+import argparse
+import random
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the graph tools need it
+    np = None
+
+SHIFT = np.int64(32) if np is not None else 32
+LOW = (1 << 32) - 1
+
+
+def require_numpy():
+    if np is None:
+        raise SystemExit("❌ numpy is required for the peer graph: pip install numpy")
+
+
+def _unique(a, counts=False):
+    """np.unique for int64 keys via one sort (faster than its hash path for this)"""
+    a = np.sort(a)
+    first = np.ones(len(a), dtype=bool)
+    first[1:] = a[1:] != a[:-1]
+    if not counts:
+        return a[first]
+    starts = np.flatnonzero(first)
+    return a[starts], np.diff(np.append(starts, len(a)))
+
+
+def _member(sorted_keys, queries):
+    """queries that occur in the sorted array"""
+    if not len(sorted_keys):
+        return np.zeros(len(queries), dtype=bool)
+    pos = np.minimum(np.searchsorted(sorted_keys, queries), len(sorted_keys) - 1)
+    return sorted_keys[pos] == queries
+
+
+class PeerGraph:
+    """Directed peer links over user ids; node indexes are assigned in load order"""
+
+    def __init__(self, user_ids=(), src=(), dst=(), pending=()):
+        require_numpy()
+        self.ids = _unique(np.concatenate([np.asarray(user_ids, dtype=np.int64),
+                                           np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)]))
+        self._index = dict(zip(self.ids.tolist(), range(len(self.ids))))
+        self._sorted = True  # ids ascending, so searchsorted maps ids to indexes
+        self.keys = _unique(self._keys(self._lookup(src), self._lookup(dst)))
+        self._added, self._removed = set(), set()
+        self.pending = {int(k) for k in self._keys(self._lookup([p[0] for p in pending]),
+                                                   self._lookup([p[1] for p in pending]))}
+        self._indptr = None
+
+    # -- indexing -----------------------------------------------------------
+
+    @staticmethod
+    def _keys(a, b):
+        return (np.asarray(a, dtype=np.int64) << SHIFT) | np.asarray(b, dtype=np.int64)
+
+    def _lookup(self, uids):
+        """Node indexes of known user ids (bulk, via the sorted initial ids)"""
+        uids = np.asarray(uids, dtype=np.int64)
+        if self._sorted:
+            return np.searchsorted(self.ids, uids)
+        return np.fromiter((self._index[u] for u in uids.tolist()), dtype=np.int64, count=len(uids))
+
+    def _node(self, uid):
+        """Index of `uid`, adding the user if it is new"""
+        i = self._index.get(uid)
+        if i is None:
+            i = self._index[uid] = len(self.ids)
+            # New users normally get higher ids, which keeps the ids sorted
+            self._sorted = self._sorted and (not len(self.ids) or uid > self.ids[-1])
+            self.ids = np.append(self.ids, np.int64(uid))
+            self._indptr = None
+        return i
+
+    @property
+    def n(self):
+        return len(self.ids)
+
+    @property
+    def indptr(self):
+        """CSR row offsets into `keys` (the low 32 bits of each key are the column)"""
+        self.flush()
+        if self._indptr is None:
+            self._indptr = np.zeros(self.n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.keys >> SHIFT, minlength=self.n), out=self._indptr[1:])
+        return self._indptr
+
+    @property
+    def indices(self):
+        self.flush()
+        return self.keys & LOW
+
+    def neighbors(self, uid):
+        i = self._index.get(uid)
+        if i is None:
+            return []
+        ptr = self.indptr
+        return self.ids[self.indices[ptr[i]:ptr[i + 1]]].tolist()
+
+    # -- incremental updates ------------------------------------------------
+
+    def accept(self, sender, receiver):
+        """/api/peers/respond with action=accept: links in both directions"""
+        a, b = self._node(sender), self._node(receiver)
+        for key in ((a << 32) | b, (b << 32) | a):
+            self._removed.discard(key)
+            self._added.add(key)
+        self.pending.discard((a << 32) | b)
+
+    def request(self, sender, receiver):
+        """/api/peers/request: pending until accepted"""
+        self.pending.add((self._node(sender) << 32) | self._node(receiver))
+
+    def remove(self, user, linked):
+        """/api/peers/remove: drops both directions"""
+        a, b = self._node(user), self._node(linked)
+        for key in ((a << 32) | b, (b << 32) | a):
+            self._added.discard(key)
+            self._removed.add(key)
+
+    def flush(self):
+        """Merge buffered updates into the sorted keys: O(E + changes), no re-sort of E"""
+        if not self._added and not self._removed:
+            return
+        keys = self.keys
+        if self._removed:
+            removed = np.fromiter(self._removed, dtype=np.int64)
+            removed.sort()
+            keys = keys[~_member(removed, keys)]
+        if self._added:
+            added = np.fromiter(self._added, dtype=np.int64)
+            added.sort()
+            pos = np.searchsorted(keys, added)
+            new = (pos >= len(keys)) | (keys[np.minimum(pos, len(keys) - 1)] != added) if len(keys) else \
+                np.ones(len(added), dtype=bool)
+            keys = np.insert(keys, pos[new], added[new])
+        self.keys = keys
+        self._added, self._removed = set(), set()
+        self._indptr = None
+
+    # -- queries ------------------------------------------------------------
+
+    def _has(self, keys):
+        self.flush()
+        return _member(self.keys, keys)
+
+    def _known(self, uids):
+        if self._sorted:
+            pos = np.minimum(np.searchsorted(self.ids, uids), len(self.ids) - 1)
+            return self.ids[pos] == uids
+        return np.fromiter((u in self._index for u in uids.tolist()), dtype=bool, count=len(uids))
+
+    def has_links(self, users, others):
+        """users[i] -> others[i] exists, for arrays of user ids (unknown ids are never linked)"""
+        users, others = np.asarray(users, dtype=np.int64), np.asarray(others, dtype=np.int64)
+        known = self._known(users) & self._known(others) if len(self.ids) else np.zeros(len(users), dtype=bool)
+        result = np.zeros(len(users), dtype=bool)
+        if known.any():
+            result[known] = self._has(self._keys(self._lookup(users[known]), self._lookup(others[known])))
+        return result
+
+    def are_mutual(self, users, others):
+        return self.has_links(users, others) & self.has_links(others, users)
+
+    def mutual_mask(self):
+        """For every stored link, whether the reverse link exists (what /api/state asks per load)"""
+        self.flush()
+        reverse = ((self.keys & LOW) << SHIFT) | (self.keys >> SHIFT)
+        return self._has(reverse)
+
+    def mutual_peers(self, uid):
+        self.flush()
+        i = self._index.get(uid)
+        if i is None:
+            return []
+        ptr = self.indptr
+        row = self.keys[ptr[i]:ptr[i + 1]]
+        reverse = ((row & LOW) << SHIFT) | (row >> SHIFT)
+        return self.ids[(row & LOW)[self._has(reverse)]].tolist()
+
+    def suggestions(self, k=5, users=None):
+        """Friends of friends not yet linked or requested, most common peers first.
+        Returns aligned arrays (user id, suggested id, common peers), grouped by user
+        and ranked within each group, for `users` (default: everyone)."""
+        indptr, indices = self.indptr, self.indices
+        src = self.keys >> SHIFT
+        if users is not None:
+            rows = _unique(self._lookup([u for u in users if u in self._index]))
+            take = _member(rows, src)
+            src, via = src[take], indices[take]
+        else:
+            via = indices
+        # Expand each link u -> f into u -> (every peer of f), then count per (u, candidate)
+        counts = indptr[via + 1] - indptr[via]
+        total = int(counts.sum())
+        owner = np.repeat(src, counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        cand = indices[np.repeat(indptr[via], counts) + offsets]
+        pairs, common = _unique(self._keys(owner, cand)[cand != owner], counts=True)
+        keep = ~self._has(pairs)
+        if self.pending:
+            pending = np.fromiter(self.pending, dtype=np.int64)
+            pending.sort()
+            reverse = ((pairs & LOW) << SHIFT) | (pairs >> SHIFT)
+            keep &= ~_member(pending, pairs) & ~_member(pending, reverse)
+        pairs, common = pairs[keep], common[keep]
+        owner, cand = pairs >> SHIFT, pairs & LOW
+        # Per owner: most common first, then lowest id; then cut at k. Pairs are already
+        # ordered by (owner, candidate index), so one stable sort does it while indexes follow ids.
+        if self._sorted:
+            most = int(common.max()) if len(common) else 0
+            order = np.argsort(owner * (most + 1) + (most - common), kind="stable")
+        else:
+            order = np.lexsort((self.ids[cand], -common, owner))
+        owner, cand, common = owner[order], cand[order], common[order]
+        top = (np.arange(len(owner)) - np.searchsorted(owner, owner)) < k
+        return self.ids[owner[top]], self.ids[cand[top]], common[top]
+
+    def suggestions_for(self, uid, k=5):
+        """[(suggested id, common peers)] for one user"""
+        _, cand, common = self.suggestions(k, [uid])
+        return list(zip(cand.tolist(), common.tolist()))
+
+    def components(self):
+        """Connected components of the undirected graph: (labels per node, component sizes)"""
+        self.flush()
+        src, dst = self.keys >> SHIFT, self.keys & LOW
+        labels = np.arange(self.n, dtype=np.int64)
+        while True:
+            # Hook each node to the smallest label among its neighbours, then jump pointers
+            prev = labels.copy()
+            np.minimum.at(labels, src, labels[dst])
+            np.minimum.at(labels, dst, labels[src])
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+            if np.array_equal(labels, prev):
+                break
+        _, labels, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+        return labels, sizes
+
+
+def load_postgres(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM users")
+        users = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT user_id, linked_user_id FROM peers WHERE linked_user_id IS NOT NULL")
+        links = cur.fetchall()
+        cur.execute("SELECT sender_id, receiver_id FROM peer_requests WHERE status = 'pending'")
+        pending = cur.fetchall()
+    return PeerGraph(users, [l[0] for l in links], [l[1] for l in links], pending)
+
+
+def load_store(store):
+    links = [(r["user_id"], r["linked_user_id"]) for r in store.tables["peers"] if r.get("linked_user_id")]
+    pending = [(r["sender_id"], r["receiver_id"]) for r in store.tables["peer_requests"] if r["status"] == "pending"]
+    return PeerGraph([u["id"] for u in store.tables["users"]], [l[0] for l in links], [l[1] for l in links], pending)
+
+
+def synthetic(users, degree=6, one_way=0.05, pending=0.5, seed=0):
+    """Clustered random network like a college cohort: (user ids, src, dst, pending pairs)"""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, users + 1, dtype=np.int64)
+    m = users * degree // 2
+    a = rng.integers(0, users, m)
+    # Most links stay inside a batch-sized neighbourhood, a few cross the whole cohort
+    local = rng.random(m) < 0.8
+    b = np.where(local, (a + rng.integers(1, 200, m)) % users, rng.integers(0, users, m))
+    a, b = a[a != b], b[a != b]
+    src, dst = np.concatenate([a, b]), np.concatenate([b, a])
+    # Some links are one-directional, like rows left behind by old scripts
+    keep = np.concatenate([np.ones(len(a), dtype=bool), rng.random(len(b)) >= one_way])
+    p = int(users * pending)
+    pend = list(zip(ids[rng.integers(0, users, p)].tolist(), ids[rng.integers(0, users, p)].tolist()))
+    return ids, ids[src[keep]], ids[dst[keep]], [(s, r) for s, r in pend if s != r]
+
+
+class NaiveGraph:
+    """Dict-of-sets reference used by --check"""
+
+    def __init__(self, src, dst, pending):
+        self.out = {}
+        for s, d in zip(src, dst):
+            self.out.setdefault(s, set()).add(d)
+        self.pending = set(pending)
+
+    def suggestions(self, uid, k):
+        mine = self.out.get(uid, set())
+        common = {}
+        for f in mine:
+            for c in self.out.get(f, ()):
+                if c != uid and c not in mine and (uid, c) not in self.pending and (c, uid) not in self.pending:
+                    common[c] = common.get(c, 0) + 1
+        return sorted(common.items(), key=lambda i: (-i[1], i[0]))[:k]
+
+    def components(self, nodes):
+        undirected = {u: set() for u in nodes}
+        for s, ds in self.out.items():
+            for d in ds:
+                undirected[s].add(d)
+                undirected[d].add(s)
+        seen, sizes = set(), []
+        for u in nodes:
+            if u in seen:
+                continue
+            stack, size = [u], 0
+            seen.add(u)
+            while stack:
+                size += 1
+                for v in undirected[stack.pop()]:
+                    if v not in seen:
+                        seen.add(v)
+                        stack.append(v)
+            sizes.append(size)
+        return sorted(sizes)
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    value = fn()
+    print(f"  {label:44} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return value
+
+
+def bench(users, degree, updates):
+    ids, src, dst, pending = synthetic(users, degree)
+    print(f"\n{users} users, {len(src)} links, {len(pending)} pending requests")
+    graph = timed("build index", lambda: PeerGraph(ids, src, dst, pending))
+    mask = timed("mutual check for every link", graph.mutual_mask)
+    rng = np.random.default_rng(1)
+    a, b = ids[rng.integers(0, users, 100_000)], ids[rng.integers(0, users, 100_000)]
+    timed("100k arbitrary mutual-pair checks", lambda: graph.are_mutual(a, b))
+    sugg = timed("second-degree suggestions (top 5, all users)", lambda: graph.suggestions(5))
+    labels, sizes = timed("connected components", graph.components)
+
+    pyrng = random.Random(2)
+    edges = list(zip((graph.keys >> SHIFT).tolist()[:updates], (graph.keys & LOW).tolist()[:updates]))
+    def churn():
+        for n in range(updates):
+            if n % 2:
+                s, d = edges[n]
+                graph.remove(int(ids[s]), int(ids[d]))
+            else:
+                graph.accept(int(ids[pyrng.randrange(users)]), int(ids[pyrng.randrange(users)]))
+    timed(f"{updates} accept/remove events (buffered)", churn)
+    timed("merge into index", graph.flush)
+    timed("full rebuild, for comparison", lambda: PeerGraph(graph.ids, graph.ids[graph.keys >> SHIFT],
+                                                           graph.ids[graph.keys & LOW]))
+    print(f"  {mask.mean():.1%} of links mutual, {len(sizes)} components (largest {sizes.max()}), "
+          f"{len(np.unique(sugg[0]))} users with suggestions")
+
+
+def check(users=2000, degree=6):
+    """Bulk answers must equal the naive model's, before and after incremental updates"""
+    ids, src, dst, pending = synthetic(users, degree, seed=3)
+    graph = PeerGraph(ids, src, dst, pending)
+    naive = NaiveGraph(src.tolist(), dst.tolist(), pending)
+    rng = random.Random(4)
+    for n in range(200):
+        u, v = rng.choice(ids.tolist()), rng.choice(ids.tolist())
+        if n % 3:
+            graph.accept(u, v)
+            naive.out.setdefault(u, set()).add(v)
+            naive.out.setdefault(v, set()).add(u)
+            naive.pending.discard((u, v))
+        else:
+            s = rng.choice(list(naive.out))
+            if naive.out[s]:
+                d = rng.choice(sorted(naive.out[s]))
+                graph.remove(s, d)
+                naive.out[s].discard(d)
+                naive.out.get(d, set()).discard(s)
+    # A user with a lower id than everyone else: indexes no longer follow ids
+    graph.accept(0, int(ids[0]))
+    naive.out.setdefault(0, set()).add(int(ids[0]))
+    naive.out.setdefault(int(ids[0]), set()).add(0)
+    ids = np.append(ids, 0)
+    problems = []
+    owner, cand, common = graph.suggestions(5)
+    sugg = {}
+    for o, c, n in zip(owner.tolist(), cand.tolist(), common.tolist()):
+        sugg.setdefault(o, []).append((c, n))
+    for uid in ids.tolist():
+        if sugg.get(uid, []) != naive.suggestions(uid, 5):
+            problems.append(f"suggestions for {uid}")
+        expected = sorted(d for d in naive.out.get(uid, ()) if uid in naive.out.get(d, ()))
+        if sorted(graph.mutual_peers(uid)) != expected:
+            problems.append(f"mutual peers of {uid}")
+    if sorted(graph.components()[1].tolist()) != naive.components(ids.tolist()):
+        problems.append("component sizes")
+    if problems:
+        print(f"❌ {len(problems)} differences from the reference model, e.g. {problems[0]}")
+        return 1
+    print(f"✅ Mutual peers, suggestions and components match the reference model ({users} users, 201 updates)")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Peer-graph analytics: mutual checks, suggestions, components")
+    parser.add_argument("--bench", type=int, metavar="USERS", help="benchmark on a synthetic network of USERS")
+    parser.add_argument("--degree", type=int, default=6, help="average links per user for --bench")
+    parser.add_argument("--updates", type=int, default=10_000, help="accept/remove events for --bench")
+    parser.add_argument("--check", action="store_true", help="compare with a plain Python model")
+    parser.add_argument("--user", type=int, help="print mutual peers and suggestions for this user (live DB)")
+    parser.add_argument("--dsn", help="Postgres DSN (default: backend/.env)")
+    args = parser.parse_args(argv)
+    require_numpy()
+
+    if args.check:
+        return check()
+    if args.bench:
+        bench(args.bench, args.degree, args.updates)
+        return 0
+
+    from db_tools import connect
+    conn = connect(args.dsn)
+    try:
+        graph = timed("load peer graph", lambda: load_postgres(conn))
+    finally:
+        conn.close()
+    labels, sizes = graph.components()
+    print(f"✓ {graph.n} users, {len(graph.keys)} links, {graph.mutual_mask().mean():.1%} mutual, "
+          f"{len(sizes)} components (largest {sizes.max() if len(sizes) else 0})")
+    if args.user is not None:
+        print(f"Mutual peers of {args.user}: {graph.mutual_peers(args.user)}")
+        print(f"Suggestions: {graph.suggestions_for(args.user)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
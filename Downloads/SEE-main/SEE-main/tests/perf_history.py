@@ -0,0 +1,387 @@
+"""
+Performance history and regression gate
+Keeps every run's step durations, /api/ call latencies, per-page cost and
+pass rate in one SQLite file (reports/perf_history.db), so runs can be
+compared over time instead of by eye across result dumps.
+
+A metric regresses when the latest run is slower than the median of the
+previous runs (the rolling baseline) by more than the baseline's normal
+spread (robust z-score: median absolute deviation), by more than
+--min-change, and by more than a few milliseconds. `check` exits with 1 on
+a regression so CI fails on the numbers.
+
+    python perf_history.py ingest                 # reports/perf_*.json + results_*.jsonl
+    python perf_history.py ingest --legacy        # also the old *_results.txt dumps (pass/fail only)
+    python perf_history.py runs
+    python perf_history.py trend --match "api/state"
+    python perf_history.py check                  # latest run vs the 10 before it
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sqlite3
+import statistics
+import sys
+import time
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_DIR = os.path.join(TESTS_DIR, "reports")
+DB_PATH = os.path.join(REPORT_DIR, "perf_history.db")
+
+# Slowdowns below this are noise whatever the statistics say
+NOISE_FLOOR_MS = 20.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    stamp TEXT UNIQUE NOT NULL,
+    created REAL NOT NULL,
+    source TEXT NOT NULL,
+    label TEXT,
+    passed INTEGER,
+    total INTEGER,
+    elapsed_s REAL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    phase TEXT,
+    passed INTEGER,
+    total_s REAL,
+    wait_s REAL,
+    api_calls INTEGER,
+    api_ms REAL
+);
+CREATE TABLE IF NOT EXISTS calls (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL,
+    page TEXT,
+    duration_ms REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    page TEXT NOT NULL,
+    api_calls INTEGER,
+    api_ms REAL,
+    long_tasks INTEGER,
+    long_task_ms REAL
+);
+CREATE INDEX IF NOT EXISTS steps_run ON steps(run_id);
+CREATE INDEX IF NOT EXISTS calls_run ON calls(run_id);
+CREATE INDEX IF NOT EXISTS pages_run ON pages(run_id);
+"""
+
+# One value per run and metric, all in milliseconds (higher is worse)
+METRICS_SQL = """
+SELECT run_id, 'step ' || category || ': ' || name, total_s * 1000 FROM steps WHERE phase = 'test'
+UNION ALL
+SELECT run_id, 'page ' || page, api_ms + long_task_ms FROM pages
+"""
+
+SPARKS = "▁▂▃▄▅▆▇█"
+
+
+def connect(path=DB_PATH):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def endpoint_of(url):
+    """/api/state/42?x=1 -> /api/state/:id, so calls for different users group together"""
+    path = url.split("?", 1)[0].split("#", 1)[0]
+    return re.sub(r"/\d+(?=/|$)", "/:id", path)
+
+
+def _stamp_time(stamp):
+    try:
+        return time.mktime(time.strptime(stamp, "%Y%m%d-%H%M%S"))
+    except ValueError:
+        return time.time()
+
+
+def _has_run(conn, stamp):
+    return conn.execute("SELECT 1 FROM runs WHERE stamp = ?", (stamp,)).fetchone() is not None
+
+
+def _summarize_stream(path):
+    """(passed, total, elapsed_s, mode) from a result stream's run_start/run_end"""
+    passed = total = elapsed = mode = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event["event"] == "run_start":
+                mode = event.get("mode")
+            elif event["event"] == "run_end" and not event.get("aborted"):
+                passed, total, elapsed = event["passed"], event["total"], event["elapsed_s"]
+    return passed, total, elapsed, mode
+
+
+def ingest_run(conn, perf_path, stream_path=None):
+    """Store one run from perf_<stamp>.json (+ its results_<stamp>.jsonl); False if already stored"""
+    with open(perf_path, encoding="utf-8") as f:
+        report = json.load(f)
+    stamp = report.get("created") or os.path.basename(perf_path)[len("perf_"):-len(".json")]
+    if _has_run(conn, stamp):
+        return False
+    steps = report.get("steps", [])
+    passed = total = elapsed = mode = None
+    if stream_path and os.path.exists(stream_path):
+        passed, total, elapsed, mode = _summarize_stream(stream_path)
+    if total is None:
+        tests = [s for s in steps if s["phase"] == "test"]
+        passed, total = sum(1 for s in tests if s["passed"]), len(tests)
+    with conn:
+        run_id = conn.execute(
+            "INSERT INTO runs (stamp, created, source, label, passed, total, elapsed_s) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (stamp, _stamp_time(stamp), "perf", mode, passed, total, elapsed)).lastrowid
+        conn.executemany(
+            "INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(run_id, s["category"], s["name"], s["phase"], int(bool(s["passed"])), s["total_s"], s["wait_s"],
+              len(s.get("api", [])), sum(c["duration_ms"] for c in s.get("api", []))) for s in steps])
+        conn.executemany(
+            "INSERT INTO calls VALUES (?, ?, ?, ?)",
+            [(run_id, endpoint_of(c["url"]), c.get("page"), c["duration_ms"]) for s in steps for c in s.get("api", [])])
+        conn.executemany(
+            "INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+            [(run_id, page, p["api_calls"], p["api_ms"], p["long_tasks"], p["long_task_ms"])
+             for page, p in report.get("pages", {}).items()])
+    return True
+
+
+def parse_legacy(text):
+    """{category: {test: passed}} from the FINAL TEST REPORT block of a console dump"""
+    block = text.rsplit("FINAL TEST REPORT", 1)
+    if len(block) < 2:
+        return {}
+    results, category = {}, None
+    for line in block[1].splitlines():
+        if line.startswith("TOTAL RESULTS"):
+            break
+        if line and not line[0].isspace() and line.rstrip().endswith(":"):
+            category = line.rstrip()[:-1]
+            results[category] = {}
+        elif category and line.startswith("  ") and ":" in line:
+            name, status = line.strip().rsplit(":", 1)
+            if "PASSED" in status or "FAILED" in status:
+                results[category][name] = "PASSED" in status
+    return results
+
+
+def read_dump(path):
+    """The dumps were redirected from PowerShell, so most are UTF-16"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        return raw.decode("utf-16")
+    return raw.decode("utf-8", errors="replace")
+
+
+def ingest_legacy(conn, path):
+    """Store a *_results.txt dump as a pass/fail-only run dated by its mtime"""
+    stamp = "legacy:" + os.path.basename(path)
+    if _has_run(conn, stamp):
+        return False
+    results = parse_legacy(read_dump(path))
+    if not results:
+        return False
+    outcomes = [ok for tests in results.values() for ok in tests.values()]
+    with conn:
+        run_id = conn.execute(
+            "INSERT INTO runs (stamp, created, source, label, passed, total) VALUES (?, ?, ?, ?, ?, ?)",
+            (stamp, os.path.getmtime(path), "legacy", os.path.basename(path), sum(outcomes), len(outcomes))).lastrowid
+        conn.executemany("INSERT INTO steps (run_id, category, name, phase, passed) VALUES (?, ?, ?, 'test', ?)",
+                         [(run_id, category, name, int(ok))
+                          for category, tests in results.items() for name, ok in tests.items()])
+    return True
+
+
+def ingest_reports(conn, report_dir=REPORT_DIR, legacy_dir=None):
+    """Ingest every report not stored yet; returns the number of new runs"""
+    added = 0
+    for perf_path in sorted(glob.glob(os.path.join(report_dir, "perf_*.json"))):
+        stamp = os.path.basename(perf_path)[len("perf_"):-len(".json")]
+        added += ingest_run(conn, perf_path, os.path.join(report_dir, f"results_{stamp}.jsonl"))
+    if legacy_dir:
+        for path in sorted(glob.glob(os.path.join(legacy_dir, "*results*.txt"))):
+            added += ingest_legacy(conn, path)
+    return added
+
+
+def timed_runs(conn):
+    """Runs with timings (legacy dumps have none), oldest first"""
+    return [row[0] for row in conn.execute("SELECT id FROM runs WHERE source != 'legacy' ORDER BY created, id")]
+
+
+def metric_values(conn):
+    """{metric: {run_id: ms}}; endpoints use the run's median call latency"""
+    values = {}
+    for run_id, metric, value in conn.execute(METRICS_SQL):
+        if value is not None:
+            values.setdefault(metric, {})[run_id] = value
+    calls = {}
+    for run_id, endpoint, duration in conn.execute("SELECT run_id, endpoint, duration_ms FROM calls"):
+        calls.setdefault(endpoint, {}).setdefault(run_id, []).append(duration)
+    for endpoint, runs in calls.items():
+        values["endpoint " + endpoint] = {run_id: statistics.median(d) for run_id, d in runs.items()}
+    return values
+
+
+class Verdict:
+    def __init__(self, metric, value, baseline):
+        self.metric = metric
+        self.value = value
+        self.baseline = baseline
+        self.median = statistics.median(baseline) if baseline else None
+        self.regressed = False
+        if self.median is None:
+            self.z = self.change = None
+            return
+        # MAD scaled to match the standard deviation of normally distributed timings
+        spread = 1.4826 * statistics.median(abs(v - self.median) for v in baseline)
+        delta = value - self.median
+        self.z = delta / spread if spread else (float("inf") if delta > 0 else 0.0)
+        self.change = delta / self.median if self.median else (float("inf") if delta > 0 else 0.0)
+
+    def judge(self, z, min_change, noise_ms, min_runs):
+        self.regressed = (len(self.baseline) >= min_runs and self.z >= z and self.change >= min_change
+                          and self.value - self.median >= noise_ms)
+        return self.regressed
+
+
+def evaluate(conn, run_id=None, window=10):
+    """A Verdict per metric of `run_id` (default: latest) against the `window` runs before it"""
+    runs = timed_runs(conn)
+    if not runs:
+        return None, []
+    run_id = run_id or runs[-1]
+    previous = runs[:runs.index(run_id)][-window:]
+    verdicts = []
+    for metric, by_run in sorted(metric_values(conn).items()):
+        if run_id in by_run:
+            verdicts.append(Verdict(metric, by_run[run_id], [by_run[r] for r in previous if r in by_run]))
+    return run_id, verdicts
+
+
+def check(conn, run_id=None, window=10, z=3.5, min_change=0.15, noise_ms=NOISE_FLOOR_MS, min_runs=3):
+    """Print the gate; returns the regressed verdicts"""
+    run_id, verdicts = evaluate(conn, run_id, window)
+    if run_id is None:
+        print("⚠ No timed runs in the history yet")
+        return []
+    stamp = conn.execute("SELECT stamp FROM runs WHERE id = ?", (run_id,)).fetchone()[0]
+    regressions = [v for v in verdicts if v.judge(z, min_change, noise_ms, min_runs)]
+    print("\n" + "=" * 80)
+    print(" " * 24 + f"PERFORMANCE GATE: run {stamp}")
+    print("=" * 80)
+    print(f"{'METRIC':44} {'BASELINE':>9} {'CURRENT':>9} {'CHANGE':>7} {'Z':>6}")
+    print("-" * 80)
+    for v in verdicts:
+        if v.median is None:
+            print(f"{v.metric[:44]:44} {'-':>9} {v.value:9.1f} {'new':>7}")
+            continue
+        z_text = "inf" if v.z == float("inf") else f"{v.z:6.1f}"
+        mark = "❌" if v.regressed else "✓" if len(v.baseline) >= min_runs else "·"
+        print(f"{v.metric[:44]:44} {v.median:9.1f} {v.value:9.1f} {v.change:+7.0%} {z_text:>6} {mark}")
+    print("=" * 80)
+    if regressions:
+        print(f"\n❌ {len(regressions)} metric(s) regressed (z >= {z:g}, >= {min_change:.0%} and >= {noise_ms:g} ms "
+              f"slower than the median of up to {window} previous runs)")
+    else:
+        print(f"\n✅ No performance regressions against up to {window} previous runs")
+    return regressions
+
+
+def sparkline(values):
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    return "".join(SPARKS[int((v - low) / span * (len(SPARKS) - 1))] for v in values)
+
+
+def print_runs(conn, last=20):
+    rows = conn.execute("SELECT stamp, source, label, passed, total, elapsed_s FROM runs "
+                        "ORDER BY created DESC, id DESC LIMIT ?", (last,)).fetchall()
+    print(f"\n{'RUN':34} {'SOURCE':7} {'PASSED':>8} {'RATE':>6} {'ELAPSED':>8}  MODE / FILE")
+    print("-" * 80)
+    for stamp, source, label, passed, total, elapsed in reversed(rows):
+        rate = f"{passed / total:6.0%}" if total else "     -"
+        elapsed_text = f"{elapsed:7.1f}s" if elapsed is not None else "       -"
+        print(f"{stamp[:34]:34} {source:7} {f'{passed}/{total}':>8} {rate} {elapsed_text}  {label or ''}")
+
+
+def print_trend(conn, match=None, last=10):
+    runs = timed_runs(conn)[-last:]
+    values = metric_values(conn)
+    print(f"\nLast {len(runs)} timed runs (oldest → newest), milliseconds")
+    print(f"{'METRIC':44} {'TREND':{last}} {'MIN':>8} {'LATEST':>8} {'MAX':>8}")
+    print("-" * 80)
+    for metric, by_run in sorted(values.items()):
+        if match and match.lower() not in metric.lower():
+            continue
+        series = [by_run[r] for r in runs if r in by_run]
+        if series:
+            print(f"{metric[:44]:44} {sparkline(series):{last}} {min(series):8.1f} {series[-1]:8.1f} {max(series):8.1f}")
+    rates = conn.execute("SELECT passed, total FROM runs ORDER BY created, id").fetchall()[-last:]
+    rates = [p / t for p, t in rates if t]
+    if rates and not match:
+        print("-" * 80)
+        print(f"{'pass rate (all runs)':44} {sparkline(rates):{last}} {min(rates):8.0%} {rates[-1]:8.0%} {max(rates):8.0%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Store run timings in SQLite, show trends, gate on regressions")
+    parser.add_argument("--db", default=DB_PATH, help="history database (default: tests/reports/perf_history.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="store reports that are not in the history yet")
+    ingest.add_argument("--report-dir", default=REPORT_DIR)
+    ingest.add_argument("--legacy", action="store_true", help="also import tests/*_results.txt console dumps")
+    runs = sub.add_parser("runs", help="list stored runs with pass rates")
+    runs.add_argument("--last", type=int, default=20)
+    trend = sub.add_parser("trend", help="per-metric trend over the last runs")
+    trend.add_argument("--match", help="only metrics containing this text")
+    trend.add_argument("--last", type=int, default=10)
+    gate = sub.add_parser("check", help="exit 1 if the latest run regressed against the rolling baseline")
+    gate.add_argument("--run", help="run stamp to check (default: latest)")
+    gate.add_argument("--window", type=int, default=10, help="previous runs in the baseline")
+    gate.add_argument("--z", type=float, default=3.5, help="robust z-score needed to count as a regression")
+    gate.add_argument("--min-change", type=float, default=0.15, help="relative slowdown needed (0.15 = 15%%)")
+    gate.add_argument("--noise-ms", type=float, default=NOISE_FLOOR_MS, help="absolute slowdown needed")
+    gate.add_argument("--min-runs", type=int, default=3, help="baseline runs needed before a metric is gated")
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        if args.command == "ingest":
+            added = ingest_reports(conn, args.report_dir, TESTS_DIR if args.legacy else None)
+            print(f"✓ {added} new run(s) stored in {args.db}")
+        elif args.command == "runs":
+            print_runs(conn, args.last)
+        elif args.command == "trend":
+            print_trend(conn, args.match, args.last)
+        else:
+            run_id = None
+            if args.run:
+                row = conn.execute("SELECT id FROM runs WHERE stamp = ? AND source != 'legacy'",
+                                   (args.run,)).fetchone()
+                if not row:
+                    raise SystemExit(f"❌ No timed run {args.run} in {args.db}")
+                run_id = row[0]
+            regressions = check(conn, run_id, args.window, args.z, args.min_change, args.noise_ms, args.min_runs)
+            return 1 if regressions else 0
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
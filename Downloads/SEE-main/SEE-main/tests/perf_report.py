@@ -0,0 +1,229 @@
+"""
+Per-test timing and page-performance report
+Each test step is timed (setup / action / wait) and, once it finishes, the
+browser's Navigation Timing, Resource Timing (/api/ fetches) and long tasks
+recorded during the step are collected. Steps are written to JSON and CSV
+next to the console summary, so slow pages can be tracked run over run.
+"""
+
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import WebDriverException
+from command_profiler import PROFILER
+
+# Installed before any page script runs (via CDP) so long tasks and sidebar
+# switches are captured from the first frame.
+INSTALL_PAGE_OBSERVERS = """
+if (!window.__psiPerf) {
+    const perf = window.__psiPerf = { longTasks: [], views: [] };
+    try { performance.setResourceTimingBufferSize(5000); } catch (e) {}
+    try {
+        new PerformanceObserver(list => {
+            for (const e of list.getEntries()) perf.longTasks.push([e.startTime, e.duration]);
+        }).observe({ type: 'longtask', buffered: true });
+    } catch (e) {}
+    document.addEventListener('click', ev => {
+        const btn = ev.target.closest && ev.target.closest('.nav-btn');
+        if (btn) perf.views.push([performance.now(), btn.innerText.trim()]);
+    }, true);
+}
+"""
+
+MARK = "return [performance.timeOrigin, performance.now()];"
+
+# Everything recorded since `since` (or since navigation if the document changed).
+# API calls and long tasks are attributed to the sidebar page active when they started.
+COLLECT = """
+const [origin, since] = arguments;
+const fresh = performance.timeOrigin !== origin;
+const from = fresh ? 0 : since;
+const perf = window.__psiPerf || { longTasks: [], views: [] };
+const active = document.querySelector('.nav-btn.active');
+const views = perf.views.slice();
+const pageAt = t => {
+    let label = null;
+    for (const [at, name] of views) if (at <= t) label = name;
+    return label || (active ? active.innerText.trim() : location.pathname);
+};
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource').filter(e => e.startTime >= from);
+const api = resources.filter(e => e.name.includes('/api/')).map(e => ({
+    url: e.name.replace(location.origin, ''),
+    page: pageAt(e.startTime),
+    start_ms: e.startTime,
+    duration_ms: e.duration,
+    ttfb_ms: e.responseStart > 0 ? e.responseStart - e.requestStart : null,
+}));
+return {
+    page: active ? active.innerText.trim() : location.pathname,
+    navigation: fresh && nav ? {
+        ttfb_ms: nav.responseStart,
+        dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+        load_ms: nav.loadEventEnd,
+        transfer_kb: nav.transferSize / 1024,
+    } : null,
+    api: api,
+    assets: resources.length - api.length,
+    long_tasks: perf.longTasks.filter(t => t[0] >= from).map(t => ({ page: pageAt(t[0]), start_ms: t[0], duration_ms: t[1] })),
+};
+"""
+
+CSV_FIELDS = ["category", "name", "phase", "passed", "page", "total_s", "action_s", "wait_s",
+              "waits", "webdriver_calls", "api_calls", "api_ms", "api_max_ms", "long_tasks", "long_task_ms",
+              "dom_content_loaded_ms", "load_ms"]
+
+
+def _first_line(error, limit=300):
+    """WebDriver messages carry a stack trace after the first line"""
+    return (str(error).strip().splitlines() or [""])[0][:limit]
+
+
+class PerfRecorder:
+    def __init__(self):
+        self.steps = []
+        self._observed = set()
+        # Called with each finished step (e.g. result_stream); failed steps are
+        # screenshotted into screenshot_dir when it is set
+        self.listeners = []
+        self.screenshot_dir = None
+
+    def observe(self, driver):
+        """Make sure `driver` runs the page observers on every document"""
+        if driver.session_id in self._observed:
+            return
+        self._observed.add(driver.session_id)
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INSTALL_PAGE_OBSERVERS})
+        except (WebDriverException, AttributeError):
+            pass  # not Chromium: fall back to installing on the current page only
+        try:
+            driver.execute_script(INSTALL_PAGE_OBSERVERS)
+        except WebDriverException:
+            pass
+
+    @contextmanager
+    def step(self, category, name, driver, waits=None, phase="test"):
+        """Time the enclosed block; yields the step dict so callers can set `passed`"""
+        self.observe(driver)
+        PROFILER.instrument(driver)
+        try:
+            mark = driver.execute_script(MARK)
+        except WebDriverException:
+            mark = [None, 0]
+        waits_before = len(waits.timings) if waits else 0
+        record = {"category": category, "name": name, "phase": phase, "passed": False}
+        commands_from = PROFILER.mark(f"{category}: {name}") if PROFILER.enabled else None
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {_first_line(e)}"
+            raise
+        finally:
+            record["total_s"] = time.perf_counter() - start
+            if commands_from is not None:
+                # Before COLLECT, so the recorder's own calls are not counted
+                record["commands"] = PROFILER.summary(commands_from)
+            step_waits = waits.timings[waits_before:] if waits else []
+            record["wait_s"] = sum(seconds for _, seconds, _ in step_waits)
+            record["waits"] = [{"description": d, "seconds": s, "ok": ok} for d, s, ok in step_waits]
+            try:
+                record.update(driver.execute_script(COLLECT, *mark))
+            except WebDriverException as e:
+                record.update(page=None, navigation=None, api=[], assets=0, long_tasks=[],
+                              error=record.get("error") or _first_line(e))
+            if not record["passed"] and self.screenshot_dir:
+                record["screenshot"] = self._screenshot(driver, record)
+            self.steps.append(record)
+            for listener in self.listeners:
+                listener(record)
+
+    def _screenshot(self, driver, record):
+        os.makedirs(self.screenshot_dir, exist_ok=True)
+        slug = "".join(c if c.isalnum() else "_" for c in f"{record['category']}_{record['name']}")
+        path = os.path.join(self.screenshot_dir, f"{time.strftime('%Y%m%d-%H%M%S')}_{slug}.png")
+        try:
+            return path if driver.save_screenshot(path) else None
+        except WebDriverException:
+            return None
+
+    def run(self, category, name, test, method, phase="test"):
+        """Time `method()` (a bound method of `test`, returning pass/fail) as one step"""
+        with self.step(category, name, test.driver, getattr(test, "waits", None), phase) as record:
+            record["passed"] = bool(method())
+        return record["passed"]
+
+    def rows(self):
+        for step in self.steps:
+            api_ms = [call["duration_ms"] for call in step.get("api", [])]
+            tasks = [task["duration_ms"] for task in step.get("long_tasks", [])]
+            nav = step.get("navigation") or {}
+            yield {
+                "category": step["category"], "name": step["name"], "phase": step["phase"],
+                "passed": step["passed"], "page": step.get("page"),
+                "total_s": round(step["total_s"], 3),
+                "action_s": round(max(0.0, step["total_s"] - step["wait_s"]), 3),
+                "wait_s": round(step["wait_s"], 3),
+                "waits": len(step["waits"]),
+                "webdriver_calls": (step.get("commands") or {}).get("count"),
+                "api_calls": len(api_ms),
+                "api_ms": round(sum(api_ms), 1),
+                "api_max_ms": round(max(api_ms, default=0), 1),
+                "long_tasks": len(tasks),
+                "long_task_ms": round(sum(tasks), 1),
+                "dom_content_loaded_ms": nav.get("dom_content_loaded_ms"),
+                "load_ms": nav.get("load_ms"),
+            }
+
+    def pages(self):
+        """Backend latency and long tasks grouped by the sidebar page they happened on"""
+        pages = {}
+        for step in self.steps:
+            for call in step.get("api", []):
+                page = pages.setdefault(call["page"], {"api_calls": 0, "api_ms": 0.0, "long_tasks": 0, "long_task_ms": 0.0})
+                page["api_calls"] += 1
+                page["api_ms"] += call["duration_ms"]
+            for task in step.get("long_tasks", []):
+                page = pages.setdefault(task["page"], {"api_calls": 0, "api_ms": 0.0, "long_tasks": 0, "long_task_ms": 0.0})
+                page["long_tasks"] += 1
+                page["long_task_ms"] += task["duration_ms"]
+        return pages
+
+    def write(self, directory, stamp=None):
+        """Write perf_<stamp>.json (full detail) and perf_<stamp>.csv (one row per step)"""
+        os.makedirs(directory, exist_ok=True)
+        stamp = stamp or time.strftime("%Y%m%d-%H%M%S")
+        json_path = os.path.join(directory, f"perf_{stamp}.json")
+        csv_path = os.path.join(directory, f"perf_{stamp}.csv")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"created": stamp, "steps": self.steps, "pages": self.pages()}, f, indent=2)
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rows())
+        return json_path, csv_path
+
+    def print_summary(self):
+        print("\n" + "=" * 80)
+        print(" " * 28 + "STEP TIMING REPORT")
+        print("=" * 80)
+        print(f"{'STEP':34} {'PHASE':6} {'TOTAL':>7} {'ACTION':>7} {'WAIT':>7} {'API':>4} {'API ms':>8} {'LONG':>5}")
+        print("-" * 80)
+        for row in self.rows():
+            label = f"{row['category'].replace(' Tests', '')}: {row['name']}"[:34]
+            print(f"{label:34} {row['phase']:6} {row['total_s']:7.2f} {row['action_s']:7.2f} {row['wait_s']:7.2f} "
+                  f"{row['api_calls']:4d} {row['api_ms']:8.1f} {row['long_tasks']:5d}")
+        pages = self.pages()
+        if pages:
+            print("-" * 80)
+            for page, stats in sorted(pages.items(), key=lambda item: -item[1]["api_ms"]):
+                print(f"  {page:22} {stats['api_calls']:4d} API calls {stats['api_ms']:9.1f} ms   "
+                      f"{stats['long_tasks']:3d} long tasks {stats['long_task_ms']:8.1f} ms")
+        print("=" * 80)
+
+
+# One recorder per process; parallel workers send their steps back with the results
+RECORDER = PerfRecorder()
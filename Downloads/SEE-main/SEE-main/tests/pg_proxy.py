@@ -0,0 +1,92 @@
+"""
+Query-counting TCP proxy for the Postgres wire protocol
+Point the backend's DB_PORT at the proxy and it forwards everything to the
+real server while counting round-trips: one per simple Query ('Q') and one
+per extended-protocol Sync ('S'), which node-postgres sends once per
+parameterised db.query().
+"""
+
+import asyncio
+import struct
+import threading
+
+SSL_REQUEST = 80877103
+GSSENC_REQUEST = 80877104
+
+
+class QueryCountingProxy:
+    def __init__(self, upstream_host="localhost", upstream_port=5432, listen_host="127.0.0.1", listen_port=0):
+        self.upstream = (upstream_host, upstream_port)
+        self.listen = (listen_host, listen_port)
+        self.queries = 0
+        self.port = None
+        self._loop = None
+        self._server = None
+        self._ready = threading.Event()
+
+    async def _pipe(self, reader, writer):
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _client_to_server(self, reader, writer):
+        try:
+            # Untyped startup packets first (SSL/GSS negotiation, then StartupMessage)
+            while True:
+                head = await reader.readexactly(8)
+                length, code = struct.unpack("!ii", head)
+                writer.write(head + await reader.readexactly(length - 8))
+                await writer.drain()
+                if code not in (SSL_REQUEST, GSSENC_REQUEST):
+                    break
+            # Then typed messages: 1-byte tag + int32 length (including itself)
+            while True:
+                tag = await reader.readexactly(1)
+                raw_len = await reader.readexactly(4)
+                body = await reader.readexactly(struct.unpack("!i", raw_len)[0] - 4)
+                if tag in (b"Q", b"S"):
+                    self.queries += 1
+                writer.write(tag + raw_len + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection(*self.upstream)
+        await asyncio.gather(
+            self._client_to_server(client_reader, server_writer),
+            self._pipe(server_reader, client_writer),
+        )
+
+    async def _serve(self):
+        self._server = await asyncio.start_server(self._handle, *self.listen)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self):
+        """Run the proxy on a background thread; returns the listening port"""
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self._serve())
+            except asyncio.CancelledError:
+                pass
+        threading.Thread(target=run, daemon=True).start()
+        self._ready.wait(10)
+        return self.port
+
+    def stop(self):
+        if self._loop and self._server:
+            self._loop.call_soon_threadsafe(self._server.close)
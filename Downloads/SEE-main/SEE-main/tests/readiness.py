@@ -0,0 +1,176 @@
+"""
+Service readiness probe
+Checks the Vite dev server, the Express API and Postgres concurrently, retrying
+each with exponential backoff until it answers or the deadline passes, and
+reports per-service latency. HTTP services must return a status line (any
+status below 500); Postgres must answer an SSLRequest with 'S' or 'N', which
+a plain open port (or a half-started server) does not do.
+
+    python readiness.py                  # probe once
+    python readiness.py --wait 60        # wait up to 60s for everything
+    python readiness.py --only api postgres
+"""
+
+import argparse
+import asyncio
+import json
+import struct
+import sys
+import time
+from urllib.parse import urlsplit
+from api_session import api_url, frontend_url
+from db_tools import backend_env
+
+# Int32 length 8 + the SSLRequest code; the server answers with a single byte
+SSL_REQUEST = struct.pack("!ii", 8, 80877103)
+
+# Cheapest backend route: no query string -> `null` without touching the DB
+API_READY_PATH = "/api/users/search"
+
+
+class Service:
+    def __init__(self, name, host, port, kind="tcp", path="/"):
+        self.name = name
+        self.host = host
+        self.port = port
+        self.kind = kind
+        self.path = path
+
+    @property
+    def address(self):
+        return f"{self.host}:{self.port}" + (self.path if self.kind == "http" else "")
+
+    @classmethod
+    def from_url(cls, name, url, path="/"):
+        parts = urlsplit(url)
+        return cls(name, parts.hostname, parts.port or 80, "http", path)
+
+
+def default_services():
+    env = backend_env()
+    return [
+        Service.from_url("frontend", frontend_url()),
+        Service.from_url("api", api_url(), API_READY_PATH),
+        Service("postgres", env.get("DB_HOST", "localhost"), int(env.get("DB_PORT", 5432)), "postgres"),
+    ]
+
+
+async def _exchange(service, timeout):
+    """One probe; returns a short description of the answer or raises"""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(service.host, service.port), timeout)
+    try:
+        if service.kind == "tcp":
+            return "open"
+        if service.kind == "postgres":
+            writer.write(SSL_REQUEST)
+            await writer.drain()
+            answer = await asyncio.wait_for(reader.readexactly(1), timeout)
+            if answer not in (b"S", b"N"):
+                raise ConnectionError(f"unexpected SSLRequest answer {answer!r}")
+            return "accepting connections"
+        writer.write(f"GET {service.path} HTTP/1.1\r\nHost: {service.host}:{service.port}\r\n"
+                     f"Connection: close\r\n\r\n".encode())
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        parts = status_line.decode("latin-1").split()
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ConnectionError("no HTTP status line")
+        if int(parts[1]) >= 500:
+            raise ConnectionError(f"HTTP {parts[1]}")
+        return f"HTTP {parts[1]}"
+    finally:
+        writer.close()
+
+
+class ProbeResult:
+    def __init__(self, service):
+        self.service = service
+        self.ready = False
+        self.attempts = 0
+        self.latency = None       # the successful probe
+        self.ready_after = None   # since waiting started
+        self.detail = "not probed"
+
+    def as_dict(self):
+        return {"service": self.service.name, "address": self.service.address, "ready": self.ready,
+                "attempts": self.attempts, "latency_ms": None if self.latency is None else self.latency * 1000,
+                "ready_after_s": self.ready_after, "detail": self.detail}
+
+
+async def wait_for(service, deadline, probe_timeout=1.0, initial_delay=0.05, max_delay=1.0):
+    """Probe `service` with exponential backoff until it answers or `deadline` (event loop time)"""
+    loop = asyncio.get_running_loop()
+    result, delay, start = ProbeResult(service), initial_delay, loop.time()
+    while True:
+        result.attempts += 1
+        probe_start = time.perf_counter()
+        try:
+            result.detail = await _exchange(service, min(probe_timeout, max(deadline - loop.time(), 0.05)))
+            result.latency = time.perf_counter() - probe_start
+            result.ready_after = loop.time() - start
+            result.ready = True
+            return result
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            result.detail = str(e) or type(e).__name__
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return result
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
+async def wait_ready(services, timeout=30.0, probe_timeout=1.0):
+    """Probe all services concurrently; timeout 0 probes each one once"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    return await asyncio.gather(*(wait_for(s, deadline, probe_timeout) for s in services))
+
+
+def check(services=None, timeout=30.0, probe_timeout=1.0):
+    return asyncio.run(wait_ready(services or default_services(), timeout, probe_timeout))
+
+
+def print_report(results):
+    print(f"\n{'SERVICE':10} {'ADDRESS':34} {'STATUS':8} {'LATENCY':>9} {'READY AFTER':>12} {'TRIES':>6}")
+    print("-" * 84)
+    for r in results:
+        latency = f"{r.latency * 1000:7.1f}ms" if r.ready else "-"
+        after = f"{r.ready_after:10.2f}s" if r.ready else "-"
+        status = "✓ up" if r.ready else "❌ down"
+        print(f"{r.service.name:10} {r.service.address:34} {status:8} {latency:>9} {after:>12} {r.attempts:6}")
+        if not r.ready:
+            print(f"{'':10} {r.detail}")
+
+
+def ensure_ready(names=None, timeout=30.0):
+    """Wait for the named default services; prints the report and returns True if all are up"""
+    services = [s for s in default_services() if names is None or s.name in names]
+    print(f"\nWaiting up to {timeout:g}s for {', '.join(s.name for s in services)}...")
+    results = check(services, timeout)
+    print_report(results)
+    return all(r.ready for r in results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that the frontend, API and Postgres are up")
+    parser.add_argument("--wait", type=float, default=0.0, metavar="SECONDS",
+                        help="keep retrying with backoff for this long (default: probe once)")
+    parser.add_argument("--only", nargs="+", choices=["frontend", "api", "postgres"],
+                        help="probe only these services")
+    parser.add_argument("--port", type=int, action="append", default=[],
+                        help="also check that this localhost TCP port is open (repeatable)")
+    parser.add_argument("--probe-timeout", type=float, default=1.0, help="per-attempt timeout in seconds")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    services = [s for s in default_services() if not args.only or s.name in args.only]
+    services += [Service(f"port {p}", "localhost", p) for p in args.port]
+    results = check(services, args.wait, args.probe_timeout)
+    if args.json:
+        print(json.dumps([r.as_dict() for r in results], indent=2))
+    else:
+        print_report(results)
+    return 0 if all(r.ready for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
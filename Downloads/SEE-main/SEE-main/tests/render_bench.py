@@ -0,0 +1,277 @@
+"""
+Frontend render benchmark
+Repeats the Dashboard and sidebar navigations from TestDashboard and
+TestNavigation against seeded networks of increasing size and measures:
+- time to first painted chart canvas (cold page load and warm tab switch)
+- time to interactive for every sidebar page
+- JS heap growth across iterations (after a forced GC)
+Results are compared with a saved baseline; exit code 1 on regression.
+
+    python render_bench.py --stub --update-baseline      # record a baseline
+    python render_bench.py --stub --threshold 0.15       # compare against it
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from api_session import bootstrap_session, frontend_url
+from driver_pool import new_driver
+from perf_report import INSTALL_PAGE_OBSERVERS
+from seed_data import SEED_PASSWORD, add_hub, generate, load_postgres, load_stub, reset_postgres
+from waits import Waiter
+
+REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+BASELINE = os.path.join(REPORT_DIR, "render_baseline.json")
+SIZES = (10, 100, 1000)
+PAGES = ["Dashboard", "My Skills", "Skill Gap", "Peers", "Resources", "Profile"]
+BENCH_PREFIX = "01fe24rb"
+
+# Changes smaller than this are noise whatever the percentage says
+NOISE_FLOOR = {"ms": 20.0, "kb": 512.0}
+
+# Per document: remember the last DOM mutation and watch for the first chart
+# canvas with painted pixels (Chart.js draws on the next animation frames).
+INSTALL_RENDER_PROBE = """
+if (!window.__psiRender) {
+    const r = window.__psiRender = { firstCanvas: null, lastMutation: 0 };
+    new MutationObserver(() => { r.lastMutation = performance.now(); })
+        .observe(document.documentElement, { childList: true, subtree: true, characterData: true, attributes: true });
+    r.watchCanvas = since => {
+        r.firstCanvas = null;
+        const tick = () => {
+            for (const c of document.querySelectorAll('canvas')) {
+                if (!c.width || !c.height) continue;
+                const px = c.getContext('2d').getImageData(0, 0, c.width, c.height).data;
+                for (let i = 3; i < px.length; i += 64) {
+                    if (px[i]) { r.firstCanvas = performance.now() - since; return; }
+                }
+            }
+            requestAnimationFrame(tick);
+        };
+        requestAnimationFrame(tick);
+    };
+    r.watchCanvas(0);
+}
+"""
+
+# Click a sidebar button and return the click time on the page clock
+CLICK_NAV = """
+const label = arguments[0];
+const btn = [...document.querySelectorAll('.nav-btn')].find(b => b.innerText.trim() === label);
+if (!btn) return null;
+if (label === 'Dashboard') window.__psiRender.watchCanvas(performance.now());
+const t = performance.now();
+btn.click();
+return t;
+"""
+
+# Quiet = no DOM mutation and no long task for `quietMs`
+MAIN_THREAD_QUIET = """
+const quietMs = arguments[0];
+const r = window.__psiRender, perf = window.__psiPerf || { longTasks: [] };
+const lastTask = perf.longTasks.reduce((m, t) => Math.max(m, t[0] + t[1]), 0);
+return performance.now() - Math.max(r.lastMutation, lastTask) >= quietMs;
+"""
+
+# TTI: the latest of last DOM change, last /api/ response and last long task after the click
+INTERACTIVE_AT = """
+const since = arguments[0];
+const r = window.__psiRender, perf = window.__psiPerf || { longTasks: [] };
+const api = performance.getEntriesByType('resource')
+    .filter(e => e.name.includes('/api/') && e.startTime >= since)
+    .reduce((m, e) => Math.max(m, e.responseEnd), 0);
+const tasks = perf.longTasks.filter(t => t[0] >= since).reduce((m, t) => Math.max(m, t[0] + t[1]), 0);
+return Math.max(r.lastMutation, api, tasks, since) - since;
+"""
+
+
+def heap_kb(driver):
+    """Live JS heap after a forced GC"""
+    driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+    return driver.execute_cdp_cmd("Runtime.getHeapUsage", {})["usedSize"] / 1024
+
+
+class RenderBench:
+    def __init__(self, driver, base_url=None, timeout=30):
+        self.driver = driver
+        self.base_url = base_url or frontend_url()
+        self.waits = Waiter(driver, timeout=timeout)
+        for source in (INSTALL_PAGE_OBSERVERS, INSTALL_RENDER_PROBE):
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+
+    def settle(self, quiet=0.25):
+        self.waits.react_rendered()
+        self.waits.network_idle(quiet)
+        self.waits.until(lambda d: d.execute_script(MAIN_THREAD_QUIET, int(quiet * 1000)),
+                         f"main thread to be quiet ({quiet}s)")
+
+    def first_canvas(self):
+        try:
+            return self.waits.until(lambda d: d.execute_script("return window.__psiRender.firstCanvas;"),
+                                    "first chart canvas to paint")
+        except TimeoutException:
+            return None
+
+    def cold_dashboard(self):
+        """Full page load of the Dashboard; first canvas is measured from navigation start"""
+        self.driver.get(self.base_url)
+        first = self.first_canvas()
+        self.settle()
+        return first
+
+    def visit(self, page):
+        """Switch to `page` from the sidebar; returns (tti_ms, first_canvas_ms or None)"""
+        since = self.driver.execute_script(CLICK_NAV, page)
+        if since is None:
+            raise RuntimeError(f"no sidebar button labelled {page!r}")
+        first = self.first_canvas() if page == "Dashboard" else None
+        self.settle()
+        return self.driver.execute_script(INTERACTIVE_AT, since), first
+
+    def run(self, iterations, pages=PAGES):
+        samples = {"cold_first_canvas": [], "warm_first_canvas": []}
+        samples.update({f"tti/{page}": [] for page in pages})
+        for _ in range(iterations):
+            cold = self.cold_dashboard()
+            if cold is not None:
+                samples["cold_first_canvas"].append(cold)
+        # Warm navigations stay in one document so heap growth means retained memory
+        heap_start = heap_kb(self.driver)
+        for _ in range(iterations):
+            # Start away from the Dashboard so its switch mounts the charts again
+            for page in pages[1:] + pages[:1]:
+                tti, first = self.visit(page)
+                samples[f"tti/{page}"].append(tti)
+                if first is not None:
+                    samples["warm_first_canvas"].append(first)
+        heap_end = heap_kb(self.driver)
+        return samples, heap_start, heap_end
+
+
+def summarize(samples, heap_start, heap_end, iterations):
+    metrics = {}
+    for name, values in samples.items():
+        if values:
+            metrics[name] = {"unit": "ms", "median": statistics.median(values), "max": max(values), "n": len(values)}
+    growth = (heap_end - heap_start) / max(iterations, 1)
+    metrics["heap_growth_per_iteration"] = {"unit": "kb", "median": growth, "max": growth, "n": iterations}
+    metrics["heap_end"] = {"unit": "kb", "median": heap_end, "max": heap_end, "n": 1}
+    return metrics
+
+
+def compare(current, baseline, threshold):
+    """Print current vs baseline medians; returns the list of regressed metric keys"""
+    regressions = []
+    print("\n" + "=" * 80)
+    print(" " * 26 + "RENDER BENCHMARK vs BASELINE")
+    print("=" * 80)
+    print(f"{'METRIC':42} {'BASELINE':>10} {'CURRENT':>10} {'CHANGE':>8}")
+    print("-" * 80)
+    for size, metrics in current.items():
+        for name, m in metrics.items():
+            key = f"{size} peers / {name}"
+            base = baseline.get(size, {}).get(name)
+            if not base:
+                print(f"{key:42} {'-':>10} {m['median']:10.1f} {'new':>8}")
+                continue
+            delta = m["median"] - base["median"]
+            if base["median"] > 0:
+                change = delta / base["median"]
+            else:
+                change = float("inf") if delta > 0 else 0.0
+            regressed = change > threshold and delta > NOISE_FLOOR[m["unit"]]
+            mark = "❌" if regressed else "✓"
+            print(f"{key:42} {base['median']:10.1f} {m['median']:10.1f} {change:+7.0%} {mark}")
+            if regressed:
+                regressions.append(key)
+    print("=" * 80)
+    return regressions
+
+
+def seed(size, stub_backend=None, conn=None):
+    """Load a network of `size` users plus a hub linked to all of them; returns the hub login"""
+    ds = generate(size, seed=size, prefix=BENCH_PREFIX)
+    hub = add_hub(ds, size, prefix=BENCH_PREFIX)
+    if stub_backend:
+        stub_backend.store.reset()
+        load_stub(stub_backend.store, ds)
+    else:
+        reset_postgres(conn, BENCH_PREFIX)
+        load_postgres(conn, ds)
+    return hub
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Dashboard and sidebar rendering against seeded data")
+    parser.add_argument("--base-url", default=None,
+                        help="running Vite frontend (default: PSI_FRONTEND_URL or http://localhost:5173)")
+    parser.add_argument("--stub", action="store_true",
+                        help="serve the seeded data from the in-memory stand-in on :3001 (where Vite proxies /api)")
+    parser.add_argument("--dsn", help="seed Postgres instead (default: backend/.env); the backend must be running")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="peers of the benchmark user")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="save this run as the new baseline")
+    parser.add_argument("--json", help="also write this run's results to this file")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+
+    backend = conn = None
+    if args.stub:
+        from stub_backend import StubBackend
+        backend = StubBackend(port=3001)
+        backend.start()
+    else:
+        from db_tools import connect
+        conn = connect(args.dsn)
+
+    driver = new_driver(headless=not args.headed)
+    results = {}
+    try:
+        bench = RenderBench(driver, args.base_url)
+        for size in args.sizes:
+            hub = seed(size, backend, conn)
+            bootstrap_session(driver, bench.base_url, hub, SEED_PASSWORD, waits=bench.waits)
+            start = time.perf_counter()
+            samples, heap_start, heap_end = bench.run(args.iterations)
+            results[str(size)] = summarize(samples, heap_start, heap_end, args.iterations)
+            print(f"✓ {size} peers: {args.iterations} iterations in {time.perf_counter() - start:.1f}s")
+    except (WebDriverException, RuntimeError) as e:
+        print(f"❌ Benchmark failed: {e}")
+        return 2
+    finally:
+        driver.quit()
+        if backend:
+            backend.stop()
+        if conn:
+            reset_postgres(conn, BENCH_PREFIX)
+            conn.close()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+
+    run = {"created": time.strftime("%Y-%m-%d %H:%M:%S"), "iterations": args.iterations, "results": results}
+    for path in filter(None, [args.json, args.baseline if args.update_baseline else None]):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+    if args.update_baseline:
+        print(f"✓ Baseline saved to {args.baseline}")
+        return 0
+    if regressions:
+        print(f"❌ {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    print("✅ No render regressions" if baseline else "⚠ No baseline yet: run with --update-baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
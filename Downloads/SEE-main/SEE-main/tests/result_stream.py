@@ -0,0 +1,197 @@
+"""
+Streaming test results
+Every run appends structured events to a JSONL file as they happen:
+run_start, suite_start, step (timing, pass/fail, page, screenshot of
+failures), suite_end / suite_cached and run_end. Parallel workers append to
+the same file; each event is one short line written in a single append, so
+lines never interleave. The file can be followed live, exported to JUnit XML
+or diffed between runs.
+
+    python result_stream.py tail reports/results_<stamp>.jsonl --follow
+    python result_stream.py junit reports/results_<stamp>.jsonl -o junit.xml
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+# Set by the runner so worker processes find the run's stream
+STREAM_ENV = "PSI_RESULT_STREAM"
+
+STREAM = None
+
+
+class ResultStream:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.screenshot_dir = os.path.join(os.path.dirname(os.path.abspath(path)), "screenshots")
+
+    def emit(self, event, **fields):
+        line = json.dumps(dict({"ts": round(time.time(), 3), "event": event, "pid": os.getpid()}, **fields),
+                          separators=(",", ":"), default=str)
+        # O_APPEND + one write per event keeps concurrent writers' lines whole
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (line + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def step(self, record):
+        """PerfRecorder listener: one event per finished step"""
+        api = record.get("api") or []
+        self.emit("step", category=record["category"], name=record["name"], phase=record["phase"],
+                  passed=record["passed"], total_s=round(record["total_s"], 3), wait_s=round(record["wait_s"], 3),
+                  page=record.get("page"), api_calls=len(api),
+                  api_ms=round(sum(call["duration_ms"] for call in api), 1),
+                  error=None if record["passed"] else record.get("error"), screenshot=record.get("screenshot"))
+
+
+def attach(recorder, path=None):
+    """Stream `recorder`'s steps to `path` (or to the run's stream from the environment)"""
+    global STREAM
+    path = path or os.environ.get(STREAM_ENV)
+    if not path or (STREAM and STREAM.path == path):
+        return STREAM
+    STREAM = ResultStream(path)
+    recorder.listeners.append(STREAM.step)
+    recorder.screenshot_dir = STREAM.screenshot_dir
+    return STREAM
+
+
+def emit(event, **fields):
+    """Emit on this process's stream; a no-op when results are not being streamed"""
+    if STREAM:
+        STREAM.emit(event, **fields)
+
+
+def read_events(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def follow_events(path, poll=0.25):
+    """Yield events as they are appended; stops after run_end"""
+    while not os.path.exists(path):
+        time.sleep(poll)
+    with open(path, encoding="utf-8") as f:
+        buffer = ""
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                time.sleep(poll)
+                continue
+            buffer += chunk
+            if not buffer.endswith("\n"):
+                continue  # a line still being written
+            event = json.loads(buffer)
+            buffer = ""
+            yield event
+            if event["event"] == "run_end":
+                return
+
+
+def format_event(event):
+    kind = event["event"]
+    clock = time.strftime("%H:%M:%S", time.localtime(event["ts"]))
+    if kind == "run_start":
+        return f"{clock} ▶ Run started ({event.get('mode')}, {event.get('suites')} suites)"
+    if kind == "suite_start":
+        return f"{clock}   ▶ {event['category']}" + (f" as {event['email']}" if event.get("email") else "")
+    if kind == "step":
+        mark = "✓" if event["passed"] else "❌"
+        line = (f"{clock}     {mark} {event['category'].replace(' Tests', '')}: {event['name']} "
+                f"{event['total_s']:.2f}s (wait {event['wait_s']:.2f}s, {event['api_calls']} API calls)")
+        if event.get("error"):
+            line += f"\n               {event['error']}"
+        if event.get("screenshot"):
+            line += f"\n               screenshot: {event['screenshot']}"
+        return line
+    if kind in ("suite_end", "suite_cached"):
+        results = event.get("results") or {}
+        passed = sum(1 for ok in results.values() if ok)
+        note = " (cached)" if kind == "suite_cached" else ""
+        return f"{clock}   {'✓' if results and passed == len(results) else '❌'} {event['category']}: " \
+               f"{passed}/{len(results)} passed{note}"
+    if kind == "run_end" and event.get("aborted"):
+        return f"{clock} ■ Run aborted after {event['elapsed_s']:.1f}s"
+    if kind == "run_end":
+        return f"{clock} ■ Run finished: {event['passed']}/{event['total']} passed in {event['elapsed_s']:.1f}s"
+    return f"{clock} {kind}"
+
+
+def to_junit(events):
+    """JUnit XML: one testsuite per category, one testcase per step (setup failures are errors)"""
+    suites = {}
+    for event in events:
+        if event["event"] == "step":
+            suites.setdefault(event["category"], []).append(event)
+        elif event["event"] == "suite_cached":
+            for name, ok in (event.get("results") or {}).items():
+                suites.setdefault(event["category"], []).append(
+                    {"name": name, "phase": "test", "passed": ok, "total_s": 0.0, "cached": True})
+        elif event["event"] == "suite_end" and not event.get("results"):
+            suites.setdefault(event["category"], [])
+    root = ET.Element("testsuites", name="Peer Skill Insights Selenium")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0, "time": 0.0}
+    for category, steps in suites.items():
+        suite = ET.SubElement(root, "testsuite", name=category)
+        counts = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0, "time": 0.0}
+        for step in steps:
+            case = ET.SubElement(suite, "testcase", classname=category, name=step["name"],
+                                 time=f"{step['total_s']:.3f}")
+            counts["tests"] += 1
+            counts["time"] += step["total_s"]
+            if step.get("cached"):
+                ET.SubElement(case, "skipped", message="inputs unchanged since the last green run; cached result")
+                counts["skipped"] += 1
+            elif not step["passed"]:
+                tag = "error" if step["phase"] == "setup" else "failure"
+                ET.SubElement(case, tag, message=step.get("error") or f"{step['name']} failed")
+                counts["errors" if tag == "error" else "failures"] += 1
+            if step.get("screenshot"):
+                ET.SubElement(case, "system-out").text = f"[[ATTACHMENT|{step['screenshot']}]]"
+        for key, value in counts.items():
+            suite.set(key, f"{value:.3f}" if key == "time" else str(value))
+            totals[key] += value
+    for key, value in totals.items():
+        root.set(key, f"{value:.3f}" if key == "time" else str(value))
+    ET.indent(root)
+    return ET.tostring(root, encoding="unicode", xml_declaration=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Follow or export a streamed test run")
+    sub = parser.add_subparsers(dest="command", required=True)
+    tail = sub.add_parser("tail", help="print the events of a run")
+    tail.add_argument("path")
+    tail.add_argument("-f", "--follow", action="store_true", help="keep printing new events until the run ends")
+    junit = sub.add_parser("junit", help="export a run as JUnit XML")
+    junit.add_argument("path")
+    junit.add_argument("-o", "--out", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.command == "tail":
+        try:
+            for event in (follow_events(args.path) if args.follow else read_events(args.path)):
+                print(format_event(event), flush=True)
+        except KeyboardInterrupt:
+            pass
+        return 0
+    xml = to_junit(read_events(args.path))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(xml + "\n")
+        print(f"✓ JUnit XML written to {args.out}")
+    else:
+        print(xml)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,84 +5,288 @@ from test_dashboard import TestDashboard
 from test_peers import TestPeers
 from test_profile import TestProfile
 from test_navigation import TestNavigation
+from api_session import ApiClient, api_url, frontend_url
+from driver_pool import DriverPool
+from perf_report import RECORDER
+from isolation import IsolatedStack
+from offline_mode import load_fixture, offline_session
+from traffic import RECORD_PORT, TrafficRecorder
+from suite_selection import SuiteSelection
+from readiness import ensure_ready
+from waits import WAIT_BACKEND_ENV
+import command_profiler
+import perf_history
+import result_stream
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import atexit
+import os
+import sys
 import time
 
-def main():
-    print("\n" + "="*80)
-    print(" " * 20 + "PEER SKILL INSIGHTS SYSTEM")
-    print(" " * 25 + "SELENIUM TEST SUITE")
-    print("="*80)
-    
+PASSWORD = "Yash@#$234"
+
+# Every shard gets its own account so parallel suites never edit each other's
+# skills/profile. The backend only accepts 01fe...@kletech.ac.in usernames.
+WORKER_EMAIL = "01fe24sel{:03d}@kletech.ac.in"
+
+# Browsers for this process: the sequential run's pool, or one warm browser
+# per worker process that every shard on that worker reuses.
+POOL = None
+
+REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+
+
+def init_pool(size, headless):
+    global POOL
+    POOL = DriverPool(size, headless=headless)
+    atexit.register(POOL.close)
+
+
+def ensure_user(email, password=PASSWORD):
+    """Register a test account through the API (already existing is fine)"""
+    ApiClient().register(email, password)
+
+
+def timed_page(page_class, driver, category, name, method_name):
+    """Run one page test method on `driver` as a timed step"""
+    page_test = page_class(driver)
+    return RECORDER.run(category, name, page_test, getattr(page_test, method_name))
+
+
+def run_authenticated(email, category, name, page_class, method_name):
+    """Log in as `email` on a pooled browser and run one timed page test with it"""
+    with POOL.lease() as driver:
+        session = TestSkillManagement(email=email, driver=driver)
+        if not RECORDER.run(category, "Session Setup", session, session.setup_user, phase="setup"):
+            return {}
+        return {name: timed_page(page_class, driver, category, name, method_name)}
+
+
+def run_login_suite(email):
+    ensure_user(email)
+    with POOL.lease() as driver:
+        login_test = TestLogin(email=email, driver=driver)
+        try:
+            return login_test.run_all_tests(
+                timed=lambda name, method: RECORDER.run("Login Tests", name, login_test, method))
+        finally:
+            login_test.close()
+
+
+def run_skill_suite(email):
+    ensure_user(email)
+    category = "Skill Management Tests"
+    with POOL.lease() as driver:
+        skill_test = TestSkillManagement(email=email, driver=driver)
+        try:
+            if not RECORDER.run(category, "Session Setup", skill_test, skill_test.setup_user, phase="setup"):
+                return {}
+            return {
+                "Add Skill": RECORDER.run(category, "Add Skill", skill_test, skill_test.test_add_skill),
+                "Remove Skill": RECORDER.run(category, "Remove Skill", skill_test, skill_test.test_remove_skill),
+            }
+        finally:
+            skill_test.close()
+
+
+def run_dashboard_suite(email):
+    ensure_user(email)
+    return run_authenticated(email, "Dashboard Tests", "Visibility", TestDashboard, "test_dashboard_elements")
+
+
+def run_profile_suite(email):
+    ensure_user(email)
+    return run_authenticated(email, "Profile Tests", "Update Profile", TestProfile, "test_update_profile")
+
+
+def run_peers_suite(email):
+    # The peer flows need the two fixed accounts that are already linked,
+    # so this shard ignores its worker account.
+    with POOL.lease() as driver:
+        return {"Page Structure": timed_page(TestPeers, driver, "Peer Tests", "Page Structure", "test_peers_page")}
+
+
+def run_navigation_suite(email):
+    ensure_user(email)
+    return run_authenticated(email, "Navigation Tests", "Flow", TestNavigation, "test_navigation_flow")
+
+
+# Report order. Each entry is independent and can run in its own process.
+SUITES = [
+    ("Login Tests", run_login_suite),
+    ("Skill Management Tests", run_skill_suite),
+    ("Dashboard Tests", run_dashboard_suite),
+    ("Profile Tests", run_profile_suite),
+    ("Peer Tests", run_peers_suite),
+    ("Navigation Tests", run_navigation_suite),
+]
+
+
+# Pure UI checks that can run against recorded fixtures instead of the backend
+OFFLINE_SUITES = [
+    ("Dashboard Tests", "Visibility", TestDashboard, "test_dashboard_elements"),
+    ("Profile Tests", "Update Profile", TestProfile, "test_update_profile"),
+    ("Navigation Tests", "Flow", TestNavigation, "test_navigation_flow"),
+]
+
+
+def run_offline(fixture_name):
+    """Frontend-only suites with /api/ served from fixtures/api/<fixture_name>.json"""
+    fixture = load_fixture(fixture_name)
+    all_results = {}
+    with POOL.lease() as driver:
+        with offline_session(driver, frontend_url(), fixture) as session:
+            print(f"\nOffline as {session['username']} (fixture: {fixture_name})")
+            for i, (category, name, page_class, method_name) in enumerate(OFFLINE_SUITES, 1):
+                print(f"\n\n[{i}/{len(OFFLINE_SUITES)}] Running {category} (offline)...")
+                result_stream.emit("suite_start", category=category, offline=True)
+                all_results[category] = {name: timed_page(page_class, driver, category, name, method_name)}
+                result_stream.emit("suite_end", category=category, results=all_results[category])
+    return all_results
+
+
+def run_shard(index, isolate=False):
+    """Worker entry point: run suite `index` with its own driver and user (and database clone)"""
+    category, suite = SUITES[index]
+    email = WORKER_EMAIL.format(index)
+    print(f"\n[shard {index + 1}/{len(SUITES)}] {category} as {email}")
+    RECORDER.steps = []
+    result_stream.attach(RECORDER)
+    result_stream.emit("suite_start", category=category, email=email)
+    stack = None
+    try:
+        if isolate:
+            stack = IsolatedStack(index).start()
+        results = suite(email)
+    except Exception as e:
+        print(f"❌ {category} crashed: {e}")
+        results = {}
+    finally:
+        if stack:
+            stack.stop()
+    result_stream.emit("suite_end", category=category, results=results)
+    # Step timings travel back with the results; the parent writes the report
+    return category, results, RECORDER.steps
+
+
+def run_parallel(workers, headless=True, isolate=False, indexes=None):
+    indexes = list(range(len(SUITES))) if indexes is None else indexes
+    print(f"\nRunning {len(indexes)} suites on {workers} worker processes...")
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_pool,
+                             initargs=(1, headless)) as pool:
+        shard_results = pool.map(run_shard, indexes, [isolate] * len(indexes))
+        shards = {category: (results, steps) for category, results, steps in shard_results}
+    # Merge in the usual report order, not completion order
     all_results = {}
-    
+    for index in indexes:
+        category = SUITES[index][0]
+        all_results[category], steps = shards.get(category, ({}, []))
+        RECORDER.steps.extend(steps)
+    return all_results
+
+
+def run_selected(indexes, isolate=False):
+    """Run some of the suites one after another in this process, each as its own shard"""
+    all_results, steps = {}, []
+    for index in indexes:
+        category, results, shard_steps = run_shard(index, isolate)
+        all_results[category] = results
+        steps.extend(shard_steps)
+    RECORDER.steps = steps
+    return all_results
+
+
+def run_sequential():
+    all_results = {}
+
     # Test 1: Login Functionality (Standalone)
     print("\n\n[1/6] Running Login Tests...")
     print("-" * 80)
-    login_test = TestLogin()
-    try:
-        login_results = login_test.run_all_tests()
-        all_results["Login Tests"] = login_results
-    finally:
-        login_test.close()
-    
-    time.sleep(2)
-    
+    result_stream.emit("suite_start", category="Login Tests")
+    with POOL.lease() as driver:
+        login_test = TestLogin(driver=driver)
+        try:
+            login_results = login_test.run_all_tests(
+                timed=lambda name, method: RECORDER.run("Login Tests", name, login_test, method))
+            all_results["Login Tests"] = login_results
+        finally:
+            login_test.close()
+    result_stream.emit("suite_end", category="Login Tests", results=all_results.get("Login Tests", {}))
+
     # Test 2: Skill Management (Uses authenticated session)
     # We will use this session for the subsequent tests to be faster
     print("\n\n[2/6] Running Skill Management Tests (and initializing session)...")
     print("-" * 80)
-    skill_test = TestSkillManagement()
-    
+    # The pool hands back the same (reset) warm browser used for login
+    driver = POOL.acquire()
+    skill_test = TestSkillManagement(driver=driver)
+    result_stream.emit("suite_start", category="Skill Management Tests")
+
     try:
-        if not skill_test.setup_user():
-             print("CRITICAL: Failed to setup authenticated session.")
-             return
-             
+        if not RECORDER.run("Skill Management Tests", "Session Setup", skill_test, skill_test.setup_user, phase="setup"):
+            print("CRITICAL: Failed to setup authenticated session.")
+            result_stream.emit("suite_end", category="Skill Management Tests", results={})
+            # The remaining suites share this session; report them as not run
+            for category, _ in SUITES[1:]:
+                all_results[category] = {}
+            return all_results
+
         # Run Skill Tests
         skill_results = {}
-        skill_results["Add Skill"] = skill_test.test_add_skill()
-        skill_results["Remove Skill"] = skill_test.test_remove_skill()
-        
+        skill_results["Add Skill"] = RECORDER.run("Skill Management Tests", "Add Skill", skill_test, skill_test.test_add_skill)
+        skill_results["Remove Skill"] = RECORDER.run("Skill Management Tests", "Remove Skill", skill_test, skill_test.test_remove_skill)
+
         all_results["Skill Management Tests"] = skill_results
-        
-        # Share driver
-        driver = skill_test.driver
-        
+        result_stream.emit("suite_end", category="Skill Management Tests", results=skill_results)
+
         # Test 3: Dashboard
         print("\n\n[3/6] Running Dashboard Tests...")
+        result_stream.emit("suite_start", category="Dashboard Tests")
         all_results["Dashboard Tests"] = {
-            "Visibility": TestDashboard(driver).test_dashboard_elements()
+            "Visibility": timed_page(TestDashboard, driver, "Dashboard Tests", "Visibility", "test_dashboard_elements")
         }
-        
+        result_stream.emit("suite_end", category="Dashboard Tests", results=all_results["Dashboard Tests"])
+
         # Test 4: Profile
         print("\n\n[4/6] Running Profile Tests...")
+        result_stream.emit("suite_start", category="Profile Tests")
         all_results["Profile Tests"] = {
-             "Update Profile": TestProfile(driver).test_update_profile()
+            "Update Profile": timed_page(TestProfile, driver, "Profile Tests", "Update Profile", "test_update_profile")
         }
-        
+        result_stream.emit("suite_end", category="Profile Tests", results=all_results["Profile Tests"])
+
         # Test 5: Peers
         print("\n\n[5/6] Running Peer Tests...")
+        result_stream.emit("suite_start", category="Peer Tests")
         all_results["Peer Tests"] = {
-             "Page Structure": TestPeers(driver).test_peers_page()
+            "Page Structure": timed_page(TestPeers, driver, "Peer Tests", "Page Structure", "test_peers_page")
         }
-        
+        result_stream.emit("suite_end", category="Peer Tests", results=all_results["Peer Tests"])
+
         # Test 6: Navigation
         print("\n\n[6/6] Running Navigation Tests...")
+        result_stream.emit("suite_start", category="Navigation Tests")
         all_results["Navigation Tests"] = {
-             "Flow": TestNavigation(driver).test_navigation_flow()
+            "Flow": timed_page(TestNavigation, driver, "Navigation Tests", "Flow", "test_navigation_flow")
         }
-        
+        result_stream.emit("suite_end", category="Navigation Tests", results=all_results["Navigation Tests"])
+
     finally:
         skill_test.close()
-    
-    # Final Summary
+        POOL.release(driver)
+
+    return all_results
+
+
+def print_report(all_results):
     print("\n\n" + "="*80)
     print(" " * 30 + "FINAL TEST REPORT")
     print("="*80)
-    
+
     total_passed = 0
     total_tests = 0
-    
+
     for category, tests in all_results.items():
         print(f"\n{category}:")
         if tests:
@@ -94,12 +298,12 @@ def main():
                 total_tests += 1
         else:
             print("  ⚠ No tests run or setup failed.")
-    
+
     print("\n" + "="*80)
     pass_rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
     print(f"TOTAL RESULTS: {total_passed}/{total_tests} tests passed ({pass_rate:.1f}%)")
     print("="*80)
-    
+
     if total_passed == total_tests and total_tests > 0:
         print("\n🎉 ALL TESTS PASSED! 🎉")
     elif total_passed >= total_tests * 0.8:
@@ -108,8 +312,165 @@ def main():
         print("\n⚠️  Some tests failed - Needs attention")
     else:
         print("\n❌ Many tests failed - Requires fixes")
-    
+
     print("\n")
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Peer Skill Insights Selenium suites")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="worker processes; >1 shards suites across browsers (default: 1, sequential)")
+    parser.add_argument("--headed", action="store_true",
+                        help="show the browser windows instead of running headless Chrome")
+    parser.add_argument("--isolate", action="store_true",
+                        help="give every shard its own database clone, backend and frontend; without "
+                             "--workers the suites run one after another, each on its own clone "
+                             "(needs psycopg2 and `python isolation.py --make-template`)")
+    parser.add_argument("--offline", nargs="?", const="default", metavar="FIXTURE",
+                        help="run only the frontend suites with /api/ served from fixtures/api/FIXTURE.json")
+    parser.add_argument("--record-traffic", metavar="TRACE",
+                        help="record all backend traffic to this .jsonl.gz trace (see traffic.py); "
+                             f"start Vite with PSI_API_TARGET=http://localhost:{RECORD_PORT} to include the browser's calls")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="skip suites whose components, routes and tests are unchanged since their last "
+                             "green run and reuse the cached results (see suite_selection.py)")
+    parser.add_argument("--ready-timeout", type=float, default=30.0, metavar="SECONDS",
+                        help="how long to wait for the frontend, API and Postgres before giving up (default: 30)")
+    parser.add_argument("--skip-readiness", action="store_true",
+                        help="launch the browsers without checking the services first")
+    parser.add_argument("--stream", metavar="JSONL",
+                        help="where result events are streamed (default: <report-dir>/results_<stamp>.jsonl); "
+                             "follow with `python result_stream.py tail FILE --follow`")
+    parser.add_argument("--junit", metavar="XML", help="also export the results as JUnit XML")
+    parser.add_argument("--profile-commands", action="store_true",
+                        help="record every WebDriver command per test step and print round-trip counts, "
+                             "call sites and the slowest commands (see command_profiler.py)")
+    parser.add_argument("--wait-backend", choices=["events", "poll"],
+                        help="how Waiter waits: in-page events (default) or WebDriverWait polling")
+    parser.add_argument("--history", action="store_true",
+                        help="store this run's timings in reports/perf_history.db (see perf_history.py)")
+    parser.add_argument("--perf-gate", action="store_true",
+                        help="store the run and exit 1 if a step, page or endpoint got significantly slower "
+                             "than the rolling baseline")
+    parser.add_argument("--report-dir", default=REPORT_DIR,
+                        help="where the per-step timing JSON/CSV is written (default: tests/reports)")
+    args = parser.parse_args(argv)
+    if args.offline and args.changed_only:
+        parser.error("--changed-only does not apply to --offline runs")
+
+    print("\n" + "="*80)
+    print(" " * 20 + "PEER SKILL INSIGHTS SYSTEM")
+    print(" " * 25 + "SELENIUM TEST SUITE")
+    print("="*80)
+
+    if not args.skip_readiness:
+        # Offline runs only need Vite; isolated shards start their own backend and Vite
+        if args.offline:
+            needed = ["frontend"]
+        elif args.isolate:
+            needed = ["postgres"]
+        else:
+            needed = ["frontend", "api", "postgres"]
+        if not ensure_ready(needed, args.ready_timeout):
+            print("\n❌ Services not ready; start them (see Prerequisites) or pass --skip-readiness\n")
+            return 1
+
+    recorder = None
+    if args.record_traffic:
+        recorder = TrafficRecorder(api_url(), args.record_traffic, "localhost", RECORD_PORT)
+        # Workers inherit the environment, so their API calls go through the recorder too
+        os.environ["PSI_API_URL"] = recorder.start()
+        print(f"● Recording backend traffic to {args.record_traffic} via {os.environ['PSI_API_URL']}")
+
+    if args.wait_backend:
+        # Read by every Waiter, in this process and in the workers
+        os.environ[WAIT_BACKEND_ENV] = args.wait_backend
+    if args.profile_commands:
+        # Workers inherit the environment and profile their own browsers
+        os.environ[command_profiler.PROFILE_ENV] = "1"
+        command_profiler.PROFILER.enabled = True
+
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    stream_path = args.stream or os.path.join(args.report_dir, f"results_{stamp}.jsonl")
+    # Workers inherit the environment and append to the same file
+    os.environ[result_stream.STREAM_ENV] = stream_path
+    result_stream.attach(RECORDER, stream_path)
+    print(f"● Streaming results to {stream_path}")
+
+    selection = None if args.offline else SuiteSelection()
+    indexes = list(range(len(SUITES)))
+    if args.changed_only:
+        selection.print_plan()
+        indexes = [i for i, (category, _) in enumerate(SUITES) if selection.needs_run(category)]
+
+    mode = "offline" if args.offline else f"parallel x{args.workers}" if args.workers > 1 else "sequential"
+    if args.isolate and not args.offline:
+        mode += ", isolated"
+    result_stream.emit("run_start", mode=mode, suites=len(OFFLINE_SUITES) if args.offline else len(indexes))
+    start = time.time()
+    try:
+        if args.offline:
+            init_pool(1, headless=not args.headed)
+            all_results = run_offline(args.offline)
+        elif not indexes:
+            print("\n✓ Nothing changed since the last green run")
+            all_results = {}
+        elif args.workers > 1:
+            all_results = run_parallel(min(args.workers, len(indexes)), headless=not args.headed,
+                                       isolate=args.isolate, indexes=indexes)
+        elif args.isolate or len(indexes) < len(SUITES):
+            # One suite at a time; with --isolate each on its own clone, never the shared database
+            init_pool(1, headless=not args.headed)
+            all_results = run_selected(indexes, isolate=args.isolate)
+        else:
+            init_pool(1, headless=not args.headed)
+            all_results = run_sequential()
+    except BaseException:
+        # Let followers of the stream stop instead of waiting for a run_end
+        result_stream.emit("run_end", passed=0, total=0, elapsed_s=time.time() - start, aborted=True)
+        raise
+    finally:
+        if recorder:
+            recorder.stop()
+            print(f"● {recorder.count} requests recorded to {args.record_traffic}")
+    if selection:
+        selection.update(all_results)
+        for category, _ in SUITES:
+            if category not in all_results:
+                result_stream.emit("suite_cached", category=category, results=selection.cached_results(category))
+        # Report skipped suites with their cached results, in the usual order
+        all_results = {category: all_results[category] if category in all_results
+                       else selection.cached_results(category) for category, _ in SUITES}
+    print_report(all_results)
+    RECORDER.print_summary()
+    if args.profile_commands:
+        command_profiler.print_report(RECORDER.steps)
+    outcomes = [ok for results in all_results.values() for ok in results.values()]
+    result_stream.emit("run_end", passed=sum(outcomes), total=len(outcomes), elapsed_s=time.time() - start)
+    json_path, csv_path = RECORDER.write(args.report_dir, stamp)
+    print(f"Step timings: {json_path}\n              {csv_path}")
+    print(f"Result stream: {stream_path}")
+    if args.junit:
+        with open(args.junit, "w", encoding="utf-8") as f:
+            f.write(result_stream.to_junit(result_stream.read_events(stream_path)) + "\n")
+        print(f"JUnit XML: {args.junit}")
+    print(f"Wall-clock time: {time.time() - start:.1f}s\n")
+    # A suite that ran with no results could not set up its session
+    setup_failed = [category for category, results in all_results.items() if not results]
+    regressed = False
+
+    if args.history or args.perf_gate:
+        conn = perf_history.connect()
+        try:
+            perf_history.ingest_run(conn, json_path, stream_path)
+            print(f"● Run stored in {perf_history.DB_PATH}")
+            # The gate fails the run on the numbers, on top of any functional failure
+            regressed = args.perf_gate and perf_history.check(conn)
+        finally:
+            conn.close()
+    if setup_failed:
+        print(f"❌ No results (session setup failed) for: {', '.join(setup_failed)}")
+    return 1 if setup_failed or sum(outcomes) < len(outcomes) or regressed else 0
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,441 @@
+"""
+Benchmark for POST /api/state/save
+MySkills.jsx and Profile.jsx send the whole skill list on every edit.
+server.js then deletes the user's skills twice and re-inserts skills and
+resources one INSERT at a time. This measures:
+1. save latency and queries per save with 10 .. 10,000 skills and resources
+   per user
+2. concurrent saves for the same user: latency, and whether the rows left
+   behind are exactly one writer's list
+3. with Postgres, reference write paths on the same data, straight to the
+   database: server.js's statements one at a time, one transaction with
+   multi-row INSERTs, and one transaction with COPY
+
+express.json() rejects bodies over 100kb, so the largest saves get 413
+from the endpoint. The reference paths still give numbers for those sizes.
+
+    python save_bench.py --stub                     # in-memory stand-in, counts from X-Query-Count
+    python save_bench.py --spawn-backend            # real server.js + Postgres via the counting proxy
+    python save_bench.py --base-url http://localhost:3101 --proxy-port 6543
+"""
+
+import argparse
+import csv
+import http.client
+import io
+import json
+import statistics
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+from db_tools import connect, connect_params, execute_values
+from load_test import percentile
+from pg_proxy import QueryCountingProxy
+
+ROW_COUNTS = (10, 100, 1000, 10000)
+SKILLS = ["Python", "Java", "React", "SQL", "Git", "Docker", "AWS", "Linux"]
+COMPANIES = ["Google", "Infosys", "Bosch", "Wipro"]
+USER_PREFIX = "01fe24svb"
+
+
+def make_payload(user_id, rows, writer=0):
+    """What MySkills.jsx would send for a user with `rows` skills and `rows` resources.
+    Every row is tagged with `writer` so a mix of two saves can be told apart."""
+    tag = f"writer {writer}"
+    return {
+        "userId": user_id,
+        "mySkills": [{"skill": f"{SKILLS[i % len(SKILLS)]} {i}", "company": tag} for i in range(rows)],
+        "profile": {"name": "Save Bench", "meta": "3rd Year", "companies": COMPANIES[:2], "avatar": ""},
+        "resources": [{"skill": SKILLS[i % len(SKILLS)], "title": f"Guide {i}", "url": f"https://example.com/{i}",
+                       "note": "", "author": tag, "peerIndex": 0} for i in range(rows)],
+    }
+
+
+def seed_stub(store):
+    store.reset()
+    return store.insert("users", username=f"{USER_PREFIX}main@kletech.ac.in", password="x",
+                        name="Save Bench", company=None, meta=None, avatar=None)["id"]
+
+
+def cleanup_postgres(conn):
+    with conn.cursor() as cur:
+        # skills and resources go with the user (ON DELETE CASCADE)
+        cur.execute("DELETE FROM users WHERE username LIKE %s", (USER_PREFIX + "%",))
+    conn.commit()
+
+
+def seed_postgres(conn):
+    cleanup_postgres(conn)
+    with conn.cursor() as cur:
+        cur.execute("INSERT INTO users (username, password, name) VALUES (%s, 'x', 'Save Bench') RETURNING id",
+                    (f"{USER_PREFIX}main@kletech.ac.in",))
+        user_id = cur.fetchone()[0]
+    conn.commit()
+    return user_id
+
+
+def post_save(conn, payload):
+    """One save on an open connection; returns (status, seconds, X-Query-Count)"""
+    body = json.dumps(payload).encode()
+    start = time.perf_counter()
+    conn.request("POST", "/api/state/save", body=body, headers={"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    resp.read()
+    elapsed = time.perf_counter() - start
+    if resp.getheader("Connection", "").lower() == "close":
+        conn.close()  # Express closes after a 413; http.client reconnects on the next request
+    return resp.status, elapsed, int(resp.getheader("X-Query-Count", 0))
+
+
+def measure_endpoint(base_url, user_id, rows, repeats, counter=None, warmup=1):
+    """Time `repeats` saves of `rows` skills and resources"""
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=600)
+    payload = make_payload(user_id, rows)
+    latencies, queries = [], []
+    try:
+        for i in range(warmup + repeats):
+            before = counter() if counter else 0
+            status, elapsed, header_queries = post_save(conn, payload)
+            if status != 200:
+                # The body is over the limit, or the save failed; no point repeating it
+                return {"status": status, "payload_kb": len(json.dumps(payload)) / 1024}
+            if counter and i == 0 and counter() == before:
+                raise RuntimeError("no queries reached the counting proxy; point the backend's DB_PORT at it")
+            if i < warmup:
+                continue
+            latencies.append(elapsed)
+            queries.append(counter() - before if counter else header_queries)
+    finally:
+        conn.close()
+    latencies.sort()
+    return {
+        "status": 200,
+        "payload_kb": len(json.dumps(payload)) / 1024,
+        "median_ms": statistics.median(latencies) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "queries": statistics.median(queries),
+    }
+
+
+def saved_rows(base_url, user_id):
+    """(skills, resources, writers) the user has after a save, read back through the API"""
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+    try:
+        conn.request("GET", f"/api/state/{user_id}")
+        state = json.loads(conn.getresponse().read())
+    finally:
+        conn.close()
+    writers = {s["company"] for s in state["mySkills"]} | {r["author"] for r in state["resources"]}
+    return len(state["mySkills"]), len(state["resources"]), len(writers)
+
+
+def run_concurrently(writers, save):
+    """Start `save(writer)` in one thread per writer at the same instant; returns their latencies"""
+    barrier = threading.Barrier(writers)
+    latencies, errors = [None] * writers, []
+
+    def worker(k):
+        try:
+            barrier.wait()
+            start = time.perf_counter()
+            save(k)
+            latencies[k] = time.perf_counter() - start
+        except Exception as e:
+            errors.append(f"writer {k}: {type(e).__name__}: {e}")
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sorted(x for x in latencies if x is not None), errors
+
+
+def concurrent_endpoint(base_url, user_id, rows, writers):
+    parts = urlsplit(base_url)
+    payloads = [make_payload(user_id, rows, k) for k in range(writers)]
+
+    def save(k):
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=600)
+        try:
+            status, _, _ = post_save(conn, payloads[k])
+        finally:
+            conn.close()
+        if status != 200:
+            raise RuntimeError(f"save -> {status}")
+
+    latencies, errors = run_concurrently(writers, save)
+    return latencies, errors, saved_rows(base_url, user_id)
+
+
+# --- Reference write paths, straight to Postgres ---------------------------
+
+def _skill_rows(user_id, payload):
+    return [(user_id, s["skill"], s["company"]) for s in payload["mySkills"]]
+
+
+def _resource_rows(user_id, payload):
+    return [(user_id, r["skill"], r["title"], r["url"], r["note"], r["author"], r["peerIndex"])
+            for r in payload["resources"]]
+
+
+def _update_profile(cur, user_id, payload):
+    profile = payload["profile"]
+    cur.execute("UPDATE users SET name=%s, meta=%s, company=%s, avatar=%s WHERE id=%s",
+                (profile["name"], profile["meta"], json.dumps(profile["companies"]), profile["avatar"], user_id))
+
+
+def save_rows(conn, user_id, payload):
+    """server.js's statements, one round-trip each and no transaction"""
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            _update_profile(cur, user_id, payload)
+            cur.execute("DELETE FROM skills WHERE user_id=%s", (user_id,))
+            cur.execute("DELETE FROM skills WHERE user_id=%s", (user_id,))
+            for row in _skill_rows(user_id, payload):
+                cur.execute("INSERT INTO skills (user_id, skill, company) VALUES (%s,%s,%s)", row)
+            cur.execute("DELETE FROM resources WHERE user_id=%s", (user_id,))
+            for row in _resource_rows(user_id, payload):
+                cur.execute("INSERT INTO resources (user_id, skill, title, url, note, author, peer_index) "
+                            "VALUES (%s,%s,%s,%s,%s,%s,%s)", row)
+    finally:
+        conn.autocommit = False
+
+
+def _begin_save(cur, user_id, payload):
+    # Lock the user row so concurrent saves for one user run one after another.
+    # Without it each transaction's DELETE misses the rows the other just
+    # inserted, and both lists survive.
+    cur.execute("SELECT id FROM users WHERE id=%s FOR UPDATE", (user_id,))
+    _update_profile(cur, user_id, payload)
+    cur.execute("DELETE FROM skills WHERE user_id=%s", (user_id,))
+    cur.execute("DELETE FROM resources WHERE user_id=%s", (user_id,))
+
+
+def save_multirow(conn, user_id, payload):
+    """One transaction: multi-row INSERTs, 1000 rows per statement"""
+    with conn.cursor() as cur:
+        _begin_save(cur, user_id, payload)
+        execute_values(cur, "INSERT INTO skills (user_id, skill, company) VALUES %s",
+                       _skill_rows(user_id, payload), page_size=1000)
+        execute_values(cur, "INSERT INTO resources (user_id, skill, title, url, note, author, peer_index) VALUES %s",
+                       _resource_rows(user_id, payload), page_size=1000)
+    conn.commit()
+
+
+def _copy(cur, table, columns, rows):
+    buffer = io.StringIO()
+    # Quoted, so empty notes stay '' instead of becoming NULL
+    csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC).writerows(rows)
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def save_copy(conn, user_id, payload):
+    """One transaction: COPY FROM STDIN"""
+    with conn.cursor() as cur:
+        _begin_save(cur, user_id, payload)
+        _copy(cur, "skills", ("user_id", "skill", "company"), _skill_rows(user_id, payload))
+        _copy(cur, "resources", ("user_id", "skill", "title", "url", "note", "author", "peer_index"),
+              _resource_rows(user_id, payload))
+    conn.commit()
+
+
+WRITE_PATHS = {"server.js rows": save_rows, "multi-row": save_multirow, "copy": save_copy}
+
+
+def db_rows(conn, user_id):
+    """(skills, resources, writers) the user has in Postgres"""
+    with conn.cursor() as cur:
+        cur.execute("SELECT count(*), count(DISTINCT company) FROM skills WHERE user_id=%s", (user_id,))
+        skills, skill_writers = cur.fetchone()
+        cur.execute("SELECT count(*), count(DISTINCT author) FROM resources WHERE user_id=%s", (user_id,))
+        resources, resource_writers = cur.fetchone()
+    conn.commit()
+    return skills, resources, max(skill_writers, resource_writers)
+
+
+def measure_path(conn, user_id, rows, save, repeats, warmup=1):
+    payload = make_payload(user_id, rows)
+    latencies = []
+    for i in range(warmup + repeats):
+        start = time.perf_counter()
+        save(conn, user_id, payload)
+        if i >= warmup:
+            latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+
+def concurrent_path(dsn, conn, user_id, rows, writers, save):
+    payloads = [make_payload(user_id, rows, k) for k in range(writers)]
+    conns = [connect(dsn) for _ in range(writers)]
+    try:
+        latencies, errors = run_concurrently(writers, lambda k: save(conns[k], user_id, payloads[k]))
+    finally:
+        for c in conns:
+            c.close()
+    return latencies, errors, db_rows(conn, user_id)
+
+
+# --- Report ------------------------------------------------------------------
+
+def report_scaling(rows):
+    print("\n" + "=" * 80)
+    print(" " * 22 + "POST /api/state/save SCALING")
+    print("=" * 80)
+    print(f"{'ROWS':>7} {'PAYLOAD KB':>11} {'STATUS':>7} {'QUERIES/SAVE':>13} {'MEDIAN ms':>11} {'P95 ms':>9} "
+          f"{'ms/ROW':>8}")
+    print("-" * 80)
+    for row in rows:
+        if row["status"] != 200:
+            note = "body over express.json()'s 100kb limit" if row["status"] == 413 else "save failed"
+            print(f"{row['rows']:7d} {row['payload_kb']:11.1f} {row['status']:7d}   {note}")
+            continue
+        print(f"{row['rows']:7d} {row['payload_kb']:11.1f} {row['status']:7d} {row['queries']:13.0f} "
+              f"{row['median_ms']:11.2f} {row['p95_ms']:9.2f} {row['median_ms'] / row['rows']:8.4f}")
+    print("=" * 80)
+
+
+def report_paths(rows):
+    names = list(WRITE_PATHS)
+    print("\n" + "=" * 80)
+    print(" " * 16 + "REFERENCE WRITE PATHS (median ms, straight to Postgres)")
+    print("=" * 80)
+    print(f"{'ROWS':>7} {'ENDPOINT':>10} " + " ".join(f"{name:>15}" for name in names) + f" {'SPEEDUP':>9}")
+    print("-" * 80)
+    for row in rows:
+        paths = row["paths"]
+        endpoint = row.get("median_ms")
+        best = min(paths[name] for name in names[1:])
+        speedup = f"{paths[names[0]] / best:8.1f}x" if best else "-"
+        print(f"{row['rows']:7d} {(f'{endpoint:.1f}' if endpoint else row['status']):>10} "
+              + " ".join(f"{paths[name]:15.1f}" for name in names) + f" {speedup:>9}")
+    print("-" * 80)
+    print("SPEEDUP = server.js rows / fastest bulk path, same statements minus the HTTP hop")
+    print("=" * 80)
+
+
+def report_concurrency(results, rows, writers):
+    print("\n" + "=" * 80)
+    print(" " * 14 + f"CONCURRENT SAVES FOR ONE USER ({writers} at once, {rows} rows each)")
+    print("=" * 80)
+    print(f"{'PATH':16} {'P50 ms':>9} {'P95 ms':>9} {'MAX ms':>9} {'SKILLS':>8} {'RESOURCES':>10} {'WRITERS':>8}")
+    print("-" * 80)
+    ok = True
+    for name, (latencies, errors, (skills, resources, mixed)) in results.items():
+        clean = skills == rows and resources == rows and mixed == 1 and not errors
+        ok = ok and clean
+        if latencies:
+            timing = (f"{percentile(latencies, 50) * 1000:9.1f} {percentile(latencies, 95) * 1000:9.1f} "
+                      f"{latencies[-1] * 1000:9.1f}")
+        else:
+            timing = f"{'-':>9} {'-':>9} {'-':>9}"
+        print(f"{name:16} {timing} {skills:8d} {resources:10d} {mixed:8d}  {'✓' if clean else '❌'}")
+        for error in errors[:3]:
+            print(f"    {error}")
+    print("-" * 80)
+    print(f"A clean save leaves exactly {rows} skills and {rows} resources, all from one writer")
+    print("=" * 80)
+    if ok:
+        print("✅ Concurrent saves leave one writer's list")
+    else:
+        print("❌ Concurrent saves left duplicated or mixed rows")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the state save path and a bulk-write reference")
+    parser.add_argument("--stub", action="store_true", help="use the in-memory stand-in backend")
+    parser.add_argument("--spawn-backend", action="store_true",
+                        help="start backend/server.js with DB_PORT pointed at a counting proxy")
+    parser.add_argument("--base-url", help="already running backend whose DB_PORT points at --proxy-port")
+    parser.add_argument("--proxy-port", type=int, default=0, help="port for the counting proxy")
+    parser.add_argument("--backend-port", type=int, default=3101)
+    parser.add_argument("--dsn", help="Postgres DSN (default: backend/.env)")
+    parser.add_argument("--query-delay-ms", type=float, default=0.2,
+                        help="with --stub, simulated latency per query (about a local Postgres round-trip)")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(ROW_COUNTS),
+                        help="skills and resources per user at each size")
+    parser.add_argument("--repeats", type=int, default=5, help="timed saves per size")
+    parser.add_argument("--writers", type=int, default=4, help="concurrent saves for the same user")
+    parser.add_argument("--concurrent-rows", type=int, default=100, help="rows per concurrent save")
+    parser.add_argument("--json", help="write all measurements to this file")
+    args = parser.parse_args(argv)
+
+    rows = []
+    concurrency = {}
+    if args.stub:
+        from stub_backend import StubBackend
+        # Interleaved like Node, so concurrent saves overlap the way they do in server.js
+        backend = StubBackend(query_delay=args.query_delay_ms / 1000, interleave=True)
+        base_url = backend.start()
+        try:
+            for n in args.rows:
+                user_id = seed_stub(backend.store)
+                rows.append(dict(rows=n, **measure_endpoint(base_url, user_id, n, args.repeats)))
+                print(f"✓ {n} rows measured")
+            user_id = seed_stub(backend.store)
+            concurrency["endpoint"] = concurrent_endpoint(base_url, user_id, args.concurrent_rows, args.writers)
+        finally:
+            backend.stop()
+        print("⚠ Reference write paths need Postgres; run with --spawn-backend or --base-url for them")
+    else:
+        if not args.spawn_backend and not args.base_url:
+            parser.error("choose --stub, --spawn-backend or --base-url")
+        if args.base_url and not args.spawn_backend and not args.proxy_port:
+            # A random proxy port is one the running backend cannot be pointed at
+            parser.error("--base-url needs --proxy-port: the backend's DB_PORT must point at the counting proxy")
+        params = connect_params()
+        proxy = QueryCountingProxy(params["host"], params["port"], listen_port=args.proxy_port)
+        proxy_port = proxy.start()
+        print(f"→ Counting proxy on :{proxy_port} -> {params['host']}:{params['port']}")
+        backend = None
+        conn = connect(args.dsn)
+        try:
+            base_url = args.base_url
+            if args.spawn_backend:
+                from backend_process import BackendProcess
+                backend = BackendProcess(args.backend_port, DB_PORT=proxy_port, DB_HOST="127.0.0.1")
+                base_url = backend.start()
+            user_id = seed_postgres(conn)
+            for n in args.rows:
+                row = dict(rows=n, **measure_endpoint(base_url, user_id, n, args.repeats, lambda: proxy.queries))
+                row["paths"] = {name: measure_path(conn, user_id, n, save, args.repeats)
+                                for name, save in WRITE_PATHS.items()}
+                rows.append(row)
+                print(f"✓ {n} rows measured")
+            concurrency["endpoint"] = concurrent_endpoint(base_url, user_id, args.concurrent_rows, args.writers)
+            for name, save in WRITE_PATHS.items():
+                concurrency[name] = concurrent_path(args.dsn, conn, user_id, args.concurrent_rows, args.writers, save)
+        finally:
+            cleanup_postgres(conn)
+            conn.close()
+            if backend:
+                backend.stop()
+            proxy.stop()
+
+    report_scaling(rows)
+    if any("paths" in row for row in rows):
+        report_paths(rows)
+    ok = report_concurrency(concurrency, args.concurrent_rows, args.writers)
+    if any(row["status"] == 413 for row in rows):
+        print("⚠ The endpoint cannot store the largest lists at all (413)"
+              + ("; the reference paths above have numbers for those sizes" if not args.stub else ""))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "rows": rows,
+                "concurrency": {name: {"latencies_ms": [x * 1000 for x in latencies], "errors": errors,
+                                       "skills": counts[0], "resources": counts[1], "writers": counts[2]}
+                                for name, (latencies, errors, counts) in concurrency.items()},
+                "passed": ok,
+            }, f, indent=2)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
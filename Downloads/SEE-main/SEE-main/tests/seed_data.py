@@ -0,0 +1,267 @@
+"""
+Deterministic bulk data seeding
+Generates thousands of users with skills, companies, mutual peer links,
+peer_requests and resources from a seed, and loads them into Postgres with
+COPY (or multi-row INSERTs) or into the in-memory stand-in backend.
+The same seed always produces the same dataset.
+
+    python seed_data.py --users 5000 --seed 7            # add seeded users
+    python seed_data.py --reset                          # remove seeded users only
+    python seed_data.py --truncate --users 5000          # wipe all app tables first
+    python seed_data.py --stub --users 5000 --port 3001  # serve the dataset from the stand-in
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import time
+from db_tools import connect, execute_values
+
+SEED_PREFIX = "01fe24sd"
+SEED_PASSWORD = "Seed@#$123"
+# bcryptjs hash (cost 10) of SEED_PASSWORD, so seeded users can log in through server.js
+SEED_PASSWORD_HASH = "$2b$10$ewLePqU5leRE2zg9bVLoBu0077hnFc/CnqhTnAUT9BkZCW46oBVNu"
+
+# Most popular first; picks are Zipf-weighted so a few skills dominate, like real profiles
+SKILLS = [
+    "Python", "Java", "JavaScript", "SQL", "React", "C++", "HTML", "CSS", "Git",
+    "Data Structures", "Algorithms", "Node.js", "Communication", "Problem Solving",
+    "Machine Learning", "Linux", "Docker", "AWS", "MongoDB", "Leadership",
+    "TypeScript", "Selenium", "Kubernetes", "Figma", "Go", "Rust", "Flutter",
+    "TensorFlow", "Spring Boot", "Django", "Tableau", "Excel",
+]
+COMPANIES = [
+    "Google", "Microsoft", "Amazon", "Infosys", "TCS", "Wipro", "Accenture", "Bosch",
+    "Oracle", "Adobe", "Cisco", "Intel", "Deloitte", "Capgemini", "Flipkart", "Zoho",
+]
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Ananya", "Rohan", "Sneha", "Karthik", "Meera",
+               "Vikram", "Pooja", "Arjun", "Kavya", "Nikhil", "Riya", "Siddharth", "Tanvi"]
+LAST_NAMES = ["Patil", "Kulkarni", "Hegde", "Shetty", "Rao", "Naik", "Joshi", "Desai"]
+
+TABLES = ("users", "skills", "peers", "peer_requests", "peer_skills", "resources")
+
+
+class Dataset:
+    """Rows keyed by user index (0..n-1); ids are resolved when loading"""
+
+    def __init__(self):
+        self.users = []          # (username, name, company_json, meta)
+        self.skills = []         # (user_idx, skill, company)
+        self.peers = []          # (user_idx, linked_user_idx)
+        self.peer_requests = []  # (sender_idx, receiver_idx, status)
+        self.resources = []      # (user_idx, skill, title, url, note, author, peer_index)
+
+    def counts(self):
+        return {"users": len(self.users), "skills": len(self.skills), "peers": len(self.peers),
+                "peer_requests": len(self.peer_requests), "resources": len(self.resources)}
+
+
+def generate(users=1000, seed=42, skills_per_user=(2, 8), peers_per_user=4, pending_per_user=1,
+             resources_per_user=3, prefix=SEED_PREFIX):
+    rng = random.Random(seed)
+    skill_weights = [1 / (rank + 1) for rank in range(len(SKILLS))]
+    ds = Dataset()
+
+    user_companies = []
+    for i in range(users):
+        companies = rng.sample(COMPANIES, rng.choice((0, 1, 1, 2)))
+        user_companies.append(companies)
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        # Same encoding /api/state/save writes: a JSON array string
+        ds.users.append((f"{prefix}{i:06d}@kletech.ac.in", name, json.dumps(companies, separators=(",", ":")),
+                         f"CS Student @ KLE Tech, batch {2024 + i % 4}"))
+
+        picked = set()
+        for _ in range(rng.randint(*skills_per_user)):
+            picked.add(rng.choices(SKILLS, skill_weights)[0])
+        for skill in sorted(picked):
+            ds.skills.append((i, skill, rng.choice(companies) if companies and rng.random() < 0.5 else ""))
+
+    # Accepted requests become links in both directions, like /api/peers/respond
+    linked = set()
+    for i in range(users):
+        for _ in range(peers_per_user // 2 + rng.randint(0, 1)):
+            j = rng.randrange(users)
+            pair = (min(i, j), max(i, j))
+            if i == j or pair in linked:
+                continue
+            linked.add(pair)
+            ds.peer_requests.append((i, j, "accepted"))
+            ds.peers.append((i, j))
+            ds.peers.append((j, i))
+
+    pending = set()
+    for i in range(users):
+        for _ in range(pending_per_user):
+            j = rng.randrange(users)
+            pair = (min(i, j), max(i, j))
+            if i == j or pair in linked or pair in pending:
+                continue
+            pending.add(pair)
+            ds.peer_requests.append((i, j, "pending"))
+
+    for i in range(users):
+        for k in range(rng.randint(0, resources_per_user * 2)):
+            skill = rng.choices(SKILLS, skill_weights)[0]
+            recommended = rng.random() < 0.3
+            ds.resources.append((i, skill, f"{skill} guide #{k + 1}", f"https://example.com/{i}/{k}",
+                                 "Recommended by a peer" if recommended else "",
+                                 ds.users[rng.randrange(users)][1] if recommended else "You",
+                                 -1 if recommended else 0))
+    return ds
+
+
+def add_hub(ds, peers, prefix=SEED_PREFIX):
+    """Append one account linked both ways to the first `peers` users; returns its username"""
+    hub = len(ds.users)
+    username = f"{prefix}hub@kletech.ac.in"
+    ds.users.append((username, "Hub User", "[]", "Benchmark account"))
+    for skill in SKILLS[:5]:
+        ds.skills.append((hub, skill, ""))
+    for j in range(min(peers, hub)):
+        ds.peer_requests.append((hub, j, "accepted"))
+        ds.peers.append((hub, j))
+        ds.peers.append((j, hub))
+    return username
+
+
+def _copy(cur, table, columns, rows):
+    buf = io.StringIO()
+    # Quoted "" stays an empty string; an unquoted empty field would load as NULL
+    csv.writer(buf, quoting=csv.QUOTE_NONNUMERIC).writerows(rows)
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+def _insert(cur, table, columns, rows, page_size=1000):
+    execute_values(cur, f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s", rows, page_size=page_size)
+
+
+def load_postgres(conn, ds, method="copy"):
+    """Bulk-load `ds` in one transaction; returns {table: seconds}"""
+    write = _copy if method == "copy" else _insert
+    timings = {}
+    with conn.cursor() as cur:
+        # Usernames are deterministic, so a second run would die on users.username UNIQUE
+        cur.execute("SELECT count(*) FROM users WHERE username = ANY(%s)", ([u[0] for u in ds.users],))
+        existing = cur.fetchone()[0]
+        if existing:
+            conn.rollback()
+            raise SystemExit(f"❌ {existing} of these users are already seeded; pass --reset to replace them")
+        start = time.perf_counter()
+        write(cur, "users", ("username", "password", "name", "company", "meta"),
+              [(u, SEED_PASSWORD_HASH, name, company, meta) for u, name, company, meta in ds.users])
+        timings["users"] = time.perf_counter() - start
+
+        cur.execute("SELECT username, id FROM users WHERE username = ANY(%s)", ([u[0] for u in ds.users],))
+        by_name = dict(cur.fetchall())
+        ids = [by_name[u[0]] for u in ds.users]
+        names = [u[1] for u in ds.users]
+        companies = [u[2] for u in ds.users]
+
+        steps = [
+            ("skills", ("user_id", "skill", "company"),
+             [(ids[i], skill, company) for i, skill, company in ds.skills]),
+            ("peers", ("user_id", "linked_user_id", "name", "company"),
+             [(ids[i], ids[j], names[j], companies[j]) for i, j in ds.peers]),
+            ("peer_requests", ("sender_id", "receiver_id", "status"),
+             [(ids[i], ids[j], status) for i, j, status in ds.peer_requests]),
+            ("resources", ("user_id", "skill", "title", "url", "note", "author", "peer_index"),
+             [(ids[i], *rest) for i, *rest in ds.resources]),
+        ]
+        for table, columns, rows in steps:
+            start = time.perf_counter()
+            if rows:
+                write(cur, table, columns, rows)
+            timings[table] = time.perf_counter() - start
+    conn.commit()
+    return timings
+
+
+def load_stub(store, ds):
+    """Load `ds` into a stub_backend.StubStore; returns the user ids in order"""
+    with store.lock:
+        ids = [store.insert("users", username=u, password=SEED_PASSWORD, name=name, company=company,
+                            meta=meta, avatar=None)["id"] for u, name, company, meta in ds.users]
+        for i, skill, company in ds.skills:
+            store.insert("skills", user_id=ids[i], skill=skill, company=company)
+        for i, j in ds.peers:
+            store.insert("peers", user_id=ids[i], linked_user_id=ids[j], name=ds.users[j][1], company=ds.users[j][2])
+        for i, j, status in ds.peer_requests:
+            store.insert("peer_requests", sender_id=ids[i], receiver_id=ids[j], status=status)
+        for i, skill, title, url, note, author, peer_index in ds.resources:
+            store.insert("resources", user_id=ids[i], skill=skill, title=title, url=url, note=note,
+                         author=author, peer_index=peer_index)
+    return ids
+
+
+def reset_postgres(conn, prefix=SEED_PREFIX, truncate=False):
+    """Remove seeded users (cascades to their rows), or TRUNCATE every app table"""
+    with conn.cursor() as cur:
+        if truncate:
+            cur.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+        else:
+            cur.execute("SELECT id FROM users WHERE username LIKE %s", (prefix + "%",))
+            ids = [r[0] for r in cur.fetchall()]
+            if ids:
+                # peers.linked_user_id has no FK, so reverse links are removed by hand
+                cur.execute("DELETE FROM peers WHERE linked_user_id = ANY(%s)", (ids,))
+                cur.execute("DELETE FROM users WHERE id = ANY(%s)", (ids,))
+    conn.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed the Peer Skill Insights database with realistic volume")
+    parser.add_argument("--users", type=int, default=0, help="number of users to generate (0 = only reset)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--peers-per-user", type=int, default=4)
+    parser.add_argument("--resources-per-user", type=int, default=3)
+    parser.add_argument("--prefix", default=SEED_PREFIX, help="username prefix of seeded accounts")
+    parser.add_argument("--method", choices=("copy", "insert"), default="copy")
+    parser.add_argument("--reset", action="store_true", help="delete previously seeded users first")
+    parser.add_argument("--truncate", action="store_true", help="TRUNCATE all app tables first (destroys real data)")
+    parser.add_argument("--dsn", help="Postgres DSN (default: backend/.env)")
+    parser.add_argument("--stub", action="store_true", help="serve the dataset from the in-memory stand-in instead")
+    parser.add_argument("--port", type=int, default=3001, help="stand-in port with --stub")
+    args = parser.parse_args(argv)
+
+    if args.stub:
+        from stub_backend import StubBackend
+        ds = generate(args.users or 1000, args.seed, peers_per_user=args.peers_per_user,
+                      resources_per_user=args.resources_per_user, prefix=args.prefix)
+        backend = StubBackend("0.0.0.0", args.port)
+        load_stub(backend.store, ds)
+        backend.start()
+        print(f"✓ Stand-in serving {ds.counts()} on :{args.port} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            backend.stop()
+        return
+
+    conn = connect(args.dsn)
+    try:
+        if args.reset or args.truncate:
+            start = time.perf_counter()
+            reset_postgres(conn, args.prefix, truncate=args.truncate)
+            print(f"✓ Reset in {time.perf_counter() - start:.2f}s")
+        if args.users:
+            start = time.perf_counter()
+            ds = generate(args.users, args.seed, peers_per_user=args.peers_per_user,
+                          resources_per_user=args.resources_per_user, prefix=args.prefix)
+            print(f"✓ Generated {ds.counts()} in {time.perf_counter() - start:.2f}s (seed {args.seed})")
+            timings = load_postgres(conn, ds, args.method)
+            counts = ds.counts()
+            for table, seconds in timings.items():
+                rate = counts.get(table, 0) / seconds if seconds else 0
+                print(f"   {table:14} {counts.get(table, 0):8d} rows  {seconds:6.2f}s  {rate:10.0f} rows/s")
+            print(f"✓ Loaded with {args.method.upper()}; log in as {args.prefix}000000@kletech.ac.in / {SEED_PASSWORD}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
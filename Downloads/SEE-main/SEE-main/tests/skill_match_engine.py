@@ -0,0 +1,236 @@
+"""
+Vectorized skill-match engine for cohort analytics
+/api/skill-match/:userId compares one user's skills with TOP_20_SKILLS per
+request. This engine reads the whole skills table at once and builds a
+user x skill sparse matrix (CSR). One pass then computes every user's match
+percentage, matched/missing skills, and the cohort-wide gaps.
+Normalization and rounding follow server.js: skills are trimmed and
+lowercased, and the percentage uses Math.round.
+
+Benchmarks the engine against one endpoint call per user and checks that
+every user's result is identical to the endpoint's (exit code 1 if not):
+
+    python skill_match_engine.py --stub --users 5000     # seeded stand-in backend
+    python skill_match_engine.py --sample 500            # Postgres + running server.js
+
+numpy is needed for the engine: pip install numpy
+"""
+
+import argparse
+import random
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # optional: only this engine needs it
+    np = None
+
+from api_session import ApiClient
+from stub_backend import TOP_20_SKILLS
+
+
+def require_numpy():
+    if np is None:
+        raise SystemExit("❌ numpy is required for the skill-match engine: pip install numpy")
+
+
+def normalize(skill):
+    """The server's filter + normalization; None for rows it ignores"""
+    if not isinstance(skill, str) or not skill:
+        return None
+    return skill.strip().lower()
+
+
+class SkillMatrix:
+    """Users x distinct normalized skills, stored as CSR (indptr/indices, no values)"""
+
+    def __init__(self, user_ids, rows):
+        require_numpy()
+        self.user_ids = np.asarray(sorted(set(user_ids)), dtype=np.int64)
+        self.vocab = {}
+        row_of = {uid: i for i, uid in enumerate(self.user_ids.tolist())}
+        user_idx, skill_idx = [], []
+        for user_id, skill in rows:
+            name = normalize(skill)
+            i = row_of.get(user_id)
+            if name is None or i is None:
+                continue
+            user_idx.append(i)
+            skill_idx.append(self.vocab.setdefault(name, len(self.vocab)))
+        user_idx = np.asarray(user_idx, dtype=np.int64)
+        skill_idx = np.asarray(skill_idx, dtype=np.int64)
+        # Sort by (user, skill) and drop duplicates: the server puts them in a Set
+        width = max(len(self.vocab), 1)
+        keys = np.unique(user_idx * width + skill_idx)
+        rows_sorted, self.indices = keys // width, keys % width
+        self.indptr = np.zeros(len(self.user_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows_sorted, minlength=len(self.user_ids)), out=self.indptr[1:])
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    def match(self, top=TOP_20_SKILLS):
+        return MatchResult(self, top)
+
+
+class MatchResult:
+    """Every user's /api/skill-match answer, computed in one vectorized pass"""
+
+    def __init__(self, matrix, top):
+        self.matrix = matrix
+        self.top = list(top)
+        # Column of each vocabulary entry in `top`, -1 if it is not a top skill
+        to_top = np.full(len(matrix.vocab) + 1, -1, dtype=np.int64)
+        for j, skill in enumerate(self.top):
+            col = matrix.vocab.get(skill.lower())
+            if col is not None:
+                to_top[col] = j
+        rows = np.repeat(np.arange(len(matrix.user_ids)), np.diff(matrix.indptr))
+        cols = to_top[matrix.indices]
+        hit = cols >= 0
+        self.matched = np.zeros((len(matrix.user_ids), len(self.top)), dtype=bool)
+        self.matched[rows[hit], cols[hit]] = True
+        self.counts = self.matched.sum(axis=1)
+        # Math.round((matchCount / n) * 100): same float ops, then round half up
+        self.percentages = np.floor(self.counts / len(self.top) * 100 + 0.5).astype(np.int64)
+        self._row = {uid: i for i, uid in enumerate(matrix.user_ids.tolist())}
+
+    def for_user(self, user_id):
+        """Same shape as the endpoint's JSON; unknown users have no skills, like on the server"""
+        i = self._row.get(user_id)
+        flags = self.matched[i] if i is not None else np.zeros(len(self.top), dtype=bool)
+        count = int(flags.sum())
+        return {
+            "percentage": int(np.floor(count / len(self.top) * 100 + 0.5)),
+            "matchedSkills": [s for s, hit in zip(self.top, flags) if hit],
+            "missingSkills": [s for s, hit in zip(self.top, flags) if not hit],
+            "totalTopSkills": len(self.top),
+        }
+
+    def cohort_gaps(self):
+        """[(skill, users missing it, share missing)], most missed first"""
+        users = max(len(self.matrix.user_ids), 1)
+        missing = len(self.matrix.user_ids) - self.matched.sum(axis=0)
+        order = np.argsort(-missing, kind="stable")
+        return [(self.top[j], int(missing[j]), missing[j] / users) for j in order]
+
+    def distribution(self, bucket=10):
+        """{bucket start: users} for match percentages"""
+        edges = np.arange(0, 100 + bucket, bucket)
+        hist, _ = np.histogram(self.percentages, bins=np.append(edges[:-1], 101))
+        return {int(start): int(n) for start, n in zip(edges[:-1], hist)}
+
+
+def load_postgres(conn):
+    """Bulk-read user ids and (user_id, skill) rows"""
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM users")
+        user_ids = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT user_id, skill FROM skills")
+        rows = cur.fetchall()
+    return user_ids, rows
+
+
+def load_store(store):
+    with store.lock:
+        return ([u["id"] for u in store.tables["users"]],
+                [(r["user_id"], r.get("skill")) for r in store.tables["skills"]])
+
+
+def add_variants(store, ids, seed=7):
+    """Spelling variants real users type (case, padding, repeats, blanks) to exercise normalization"""
+    rng = random.Random(seed)
+    for user_id in ids[::7]:
+        skill = rng.choice(TOP_20_SKILLS)
+        for variant in (f"  {skill}", skill.upper(), skill.lower() + " ", ""):
+            store.insert("skills", user_id=user_id, skill=variant, company="")
+
+
+def per_user(client, user_ids):
+    """Call the endpoint once per user; returns ({user_id: response}, seconds)"""
+    start = time.perf_counter()
+    responses = {uid: client.get(f"/api/skill-match/{uid}") for uid in user_ids}
+    return responses, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute skill-match for every user at once and check it")
+    parser.add_argument("--stub", action="store_true", help="seed the in-memory stand-in instead of using Postgres")
+    parser.add_argument("--users", type=int, default=2000, help="users to seed with --stub")
+    parser.add_argument("--dsn", help="Postgres DSN (default: backend/.env)")
+    parser.add_argument("--api", help="backend URL for the per-user calls (default: PSI_API_URL or http://localhost:3001)")
+    parser.add_argument("--sample", type=int, help="only call the endpoint for this many users (all by default)")
+    parser.add_argument("--top-gaps", type=int, default=10, help="cohort gaps to print")
+    args = parser.parse_args(argv)
+    require_numpy()
+
+    backend = None
+    if args.stub:
+        from seed_data import generate, load_stub
+        from stub_backend import StubBackend
+        backend = StubBackend()
+        ids = load_stub(backend.store, generate(args.users, seed=16))
+        add_variants(backend.store, ids)
+        api = backend.start()
+    else:
+        api = args.api
+    try:
+        start = time.perf_counter()
+        if backend:
+            user_ids, rows = load_store(backend.store)
+        else:
+            from db_tools import connect
+            conn = connect(args.dsn)
+            try:
+                user_ids, rows = load_postgres(conn)
+            finally:
+                conn.close()
+        loaded = time.perf_counter()
+        matrix = SkillMatrix(user_ids, rows)
+        built = time.perf_counter()
+        result = matrix.match()
+        done = time.perf_counter()
+
+        sample = list(matrix.user_ids.tolist())
+        if args.sample and args.sample < len(sample):
+            sample = random.Random(0).sample(sample, args.sample)
+        client = ApiClient(api)
+        responses, http_seconds = per_user(client, sample)
+        client.close()
+    finally:
+        if backend:
+            backend.stop()
+
+    engine_seconds = done - loaded
+    print(f"\n✓ {len(matrix.user_ids)} users, {len(rows)} skill rows, {len(matrix.vocab)} distinct skills, "
+          f"{matrix.nnz} non-zeros")
+    print(f"  bulk read      {(loaded - start) * 1000:9.1f} ms")
+    print(f"  build matrix   {(built - loaded) * 1000:9.1f} ms")
+    print(f"  match all      {(done - built) * 1000:9.1f} ms")
+    per_call = http_seconds / max(len(sample), 1)
+    print(f"  endpoint       {http_seconds * 1000:9.1f} ms for {len(sample)} users "
+          f"({per_call * 1000:.2f} ms/user, ~{per_call * len(matrix.user_ids):.1f}s for all)")
+    print(f"  speedup        {per_call * len(matrix.user_ids) / max(engine_seconds, 1e-9):9.0f}x "
+          f"(engine build + match vs one call per user)")
+
+    print("\nMatch distribution:")
+    for bucket, n in result.distribution().items():
+        print(f"  {bucket:3d}-{100 if bucket == 90 else bucket + 9:3d}%  {n:7d}")
+    print(f"\nCohort gaps (top {args.top_gaps}):")
+    for skill, missing, share in result.cohort_gaps()[:args.top_gaps]:
+        print(f"  {skill:20} missing for {missing:7d} users ({share:.0%})")
+
+    mismatches = [uid for uid, resp in responses.items() if result.for_user(uid) != resp]
+    if mismatches:
+        print(f"\n❌ {len(mismatches)}/{len(responses)} users differ from the endpoint, e.g. user {mismatches[0]}:")
+        print(f"   engine:   {result.for_user(mismatches[0])}")
+        print(f"   endpoint: {responses[mismatches[0]]}")
+        return 1
+    print(f"\n✅ Engine matches the endpoint for all {len(responses)} checked users")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
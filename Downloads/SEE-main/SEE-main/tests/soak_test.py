@@ -0,0 +1,479 @@
+"""
+Multi-user soak test: concurrent peer requests, accepts and recommendations
+Drives many sessions at once, each one a fresh user. A barrier between the
+phases makes every session act at the same moment, so the backend gets
+real bursts:
+1. every user sends a peer request (/api/peers/request) to the next user in
+   a ring. The first --races pairs across the ring also request each other
+   at the same instant (crossed requests).
+2. every receiver waits until the request shows on its Peers page and
+   accepts it. For the first --races receivers a second accept is fired at
+   the same moment (double accept).
+3. every sender waits until the receiver appears in My Peers
+4. every user sends its receiver a resource through the "Recommend to Peer"
+   modal, then waits until the one sent to it shows on its Resources page
+Latency is measured from the action until the other user sees the result.
+The app has no push, so watchers reload every --refresh seconds, and the
+latencies include up to one refresh interval.
+
+Afterwards the backend is checked for the damage fix_peer_duplicates.js
+cleans up today: duplicate links, one-way links, duplicate or leftover
+pending requests, and expected links or resources that never appeared.
+Exit code 1 if anything is found.
+
+    python soak_test.py --sessions 24 --stub              # browsers; stand-in on :3001 (Vite must be running)
+    python soak_test.py --sessions 40 --api-only --stub   # no browsers: backend races only
+    python soak_test.py --sessions 24 --reset             # real backend + Postgres; drop earlier soak users first
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select
+from api_session import ApiClient, api_url, bootstrap_session, frontend_url
+from load_test import percentile
+from page_query import PEERS, RESOURCES, SIDEBAR
+from waits import Waiter
+
+# The backend only accepts 01fe...@kletech.ac.in usernames
+SOAK_PREFIX = "01fe24sk"
+PASSWORD = "Soak@#$123"
+REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+
+
+def soak_email(run, index):
+    return f"{SOAK_PREFIX}{run}{index:03d}@kletech.ac.in"
+
+
+def wait_until(check, timeout, interval):
+    """Call `check()` until it returns something truthy; returns (value, seconds waited)"""
+    start = time.perf_counter()
+    while True:
+        value = check()
+        elapsed = time.perf_counter() - start
+        if value or elapsed >= timeout:
+            return value, elapsed
+        time.sleep(min(interval, max(timeout - elapsed, 0)))
+
+
+class Timeline:
+    """Latency samples, response statuses and problems, shared by all sessions"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)                     # measure -> [seconds]
+        self.statuses = defaultdict(lambda: defaultdict(int))  # action -> status -> count
+        self.problems = []                                   # [(kind, detail)]
+
+    def sample(self, measure, seconds):
+        with self.lock:
+            self.samples[measure].append(seconds)
+
+    def status(self, action, status):
+        with self.lock:
+            self.statuses[action][status] += 1
+
+    def problem(self, kind, detail):
+        with self.lock:
+            self.problems.append((kind, detail))
+        print(f"❌ {kind}: {detail}")
+
+    def as_dict(self):
+        return {
+            "latency": {measure: {"count": len(v), "p50_ms": percentile(sorted(v), 50) * 1000,
+                                  "p95_ms": percentile(sorted(v), 95) * 1000, "max_ms": max(v) * 1000}
+                        for measure, v in self.samples.items()},
+            "statuses": {action: dict(counts) for action, counts in self.statuses.items()},
+            "problems": [{"kind": kind, "detail": detail} for kind, detail in self.problems],
+        }
+
+    def report(self):
+        print("\n" + "=" * 80)
+        print(" " * 30 + "SOAK TEST REPORT")
+        print("=" * 80)
+        print(f"{'UNTIL THE OTHER USER SEES IT':34} {'COUNT':>6} {'P50 ms':>10} {'P95 ms':>10} {'MAX ms':>10}")
+        print("-" * 80)
+        for measure, values in self.samples.items():
+            values = sorted(values)
+            print(f"{measure:34} {len(values):6d} {percentile(values, 50) * 1000:10.1f} "
+                  f"{percentile(values, 95) * 1000:10.1f} {values[-1] * 1000:10.1f}")
+        print("-" * 80)
+        print(f"{'RESPONSES':34} STATUS: COUNT")
+        for action, counts in self.statuses.items():
+            print(f"{action:34} " + ", ".join(f"{status}: {n}" for status, n in sorted(counts.items(), key=str)))
+        print("=" * 80)
+        if self.problems:
+            print(f"\n❌ {len(self.problems)} problem(s):")
+            for kind, n in Counter(kind for kind, _ in self.problems).most_common():
+                print(f"   {n:4d}  {kind}")
+        else:
+            print("\n✅ No duplicate, one-way or missing links, no stuck requests, every item arrived")
+
+
+class ApiSession:
+    """A user driven through the backend only; it 'sees' whatever the API returns"""
+
+    def __init__(self, email, base_url):
+        self.email = email
+        self.client = ApiClient(base_url)
+        self.user_id = None
+
+    def login(self):
+        self.user_id = self.client.login(self.email, PASSWORD)["userId"]
+
+    def send_request(self, receiver_email):
+        status, _ = self.client.request("POST", "/api/peers/request",
+                                        {"senderId": self.user_id, "receiverEmail": receiver_email})
+        return status
+
+    def _request_ids(self, sender_email):
+        requests = self.client.get(f"/api/peers/requests/{self.user_id}") or []
+        return [r["id"] for r in requests if r["email"].lower() == sender_email.lower()]
+
+    def _respond(self, request_id):
+        # ApiClient keeps one connection per thread, so racing threads can share it
+        status, _ = self.client.request("POST", "/api/peers/respond", {"requestId": request_id, "action": "accept"})
+        return status
+
+    def pending_from(self, sender_email):
+        """Handles of the pending requests from `sender_email` (request ids)"""
+        return self._request_ids(sender_email)
+
+    def accept(self, sender_email, handle, double=False):
+        """Accept; with `double`, a second accept races the first. Returns the statuses"""
+        if not double:
+            return [self._respond(handle)]
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            return list(pool.map(self._respond, [handle, handle]))
+
+    def peer_count(self, peer_email):
+        state = self.client.get(f"/api/state/{self.user_id}")
+        return sum(1 for p in state["peers"] if (p.get("name") or "").lower() == peer_email.lower())
+
+    def recommend(self, receiver_email, receiver_id, title):
+        """Returns (status, when it was sent)"""
+        sent = time.perf_counter()
+        status, _ = self.client.request("POST", "/api/resources/recommend", {
+            "senderId": self.user_id, "receiverId": receiver_id,
+            "resource": {"skill": "Soak", "title": title, "url": "https://example.com/soak", "note": ""}})
+        return status, sent
+
+    def has_resource(self, title):
+        state = self.client.get(f"/api/state/{self.user_id}")
+        return any(r["title"] == title for r in state["resources"])
+
+    def close(self):
+        self.client.close()
+
+
+class BrowserSession(ApiSession):
+    """A user in its own browser; it 'sees' what its pages show after a reload"""
+
+    def __init__(self, email, base_url, driver, frontend):
+        super().__init__(email, base_url)
+        self.driver = driver
+        self.frontend = frontend
+        self.waits = Waiter(driver, timeout=20)
+
+    def login(self):
+        self.user_id = bootstrap_session(self.driver, self.frontend, self.email, PASSWORD,
+                                         self.client, self.waits)["userId"]
+
+    def open(self, label):
+        """Reload (the app only fetches its state on load) and open a sidebar page"""
+        self.driver.refresh()
+        self.waits.present((By.CLASS_NAME, "sidebar"))
+        self.waits.network_idle()
+        nav = SIDEBAR.batch(self.driver).element("nav", label).run()["nav"]
+        nav.click()
+        self.waits.network_idle()
+
+    def pending_from(self, sender_email):
+        """Handles of the pending requests from `sender_email` (Accept buttons)"""
+        self.open("Peers")
+        return PEERS.batch(self.driver).elements("accept_button", sender_email).run().all("accept_button")
+
+    def accept(self, sender_email, handle, double=False):
+        racer = None
+        if double:
+            # Fire an API accept for the same request while the button is clicked
+            request_id = self._request_ids(sender_email)[0]
+            statuses = []
+            racer = threading.Thread(target=lambda: statuses.append(self._respond(request_id)))
+            racer.start()
+        handle.click()
+        ui_status = 200
+        try:
+            # Peers.jsx alerts "Failed" when the accept is refused
+            self.waits.alert_present(timeout=1).accept()
+            ui_status = 400
+        except Exception:
+            pass
+        self.waits.network_idle()
+        if racer:
+            racer.join()
+            return [ui_status] + statuses
+        return [ui_status]
+
+    def peer_count(self, peer_email):
+        self.open("Peers")
+        return PEERS.batch(self.driver).count("peer_name", peer_email).run().count("peer_name")
+
+    def recommend(self, receiver_email, receiver_id, title):
+        self.open("Resources")
+        RESOURCES.batch(self.driver).element("recommend_button").run()["recommend_button"].click()
+        select = self.waits.present((By.XPATH, RESOURCES.locator("peer_select").value))
+        # Option labels are peer names; soak users have none, so it is their email
+        Select(select).select_by_visible_text(receiver_email)
+        snap = (RESOURCES.batch(self.driver)
+                .fill("skill_input", "Soak").fill("title_input", title)
+                .fill("url_input", "https://example.com/soak").element("send_button").run())
+        sent = time.perf_counter()
+        snap["send_button"].click()
+        alert = self.waits.alert_present()
+        status = 200 if "sent" in alert.text.lower() else 400
+        alert.accept()
+        return status, sent
+
+    def has_resource(self, title):
+        self.open("Resources")
+        return RESOURCES.batch(self.driver).contains("body", title).run().contains("body", title)
+
+
+class Soak:
+    def __init__(self, sessions, races, timeline, refresh, timeout, run):
+        self.sessions = sessions
+        self.n = len(sessions)
+        self.emails = [s.email for s in sessions]
+        self.ring = {i: (i + 1) % self.n for i in range(self.n)}
+        self.crossed = {j: j + self.n // 2 for j in range(races)}
+        self.double_accept = set(range(races))  # receivers that race two accepts
+        self.timeline = timeline
+        self.refresh = refresh
+        self.timeout = timeout
+        self.run_tag = run
+        self.barrier = threading.Barrier(self.n)
+        self.sent = {}       # (sender, receiver) -> (perf_counter, status)
+        self.accepted = {}   # (sender, receiver) -> perf_counter
+        self.recommended = {}  # (sender, receiver) -> (perf_counter, title)
+        self.lock = threading.Lock()
+
+    def targets(self, i):
+        targets = [self.ring[i]]
+        partner = self.crossed.get(i, next((j for j, k in self.crossed.items() if k == i), None))
+        return targets + ([partner] if partner is not None else [])
+
+    def title(self, sender, receiver):
+        return f"Soak {self.run_tag} {sender}->{receiver}"
+
+    def phase(self):
+        self.barrier.wait(timeout=self.timeout * 4)
+
+    def worker(self, i):
+        s, tl = self.sessions[i], self.timeline
+        try:
+            s.login()
+            self.phase()
+
+            # 1. Everyone sends at once (crossed pairs to each other too)
+            for target in self.targets(i):
+                status = s.send_request(self.emails[target])
+                tl.status("peer request", status)
+                with self.lock:
+                    self.sent[(i, target)] = (time.perf_counter(), status)
+            self.phase()
+
+            # 2. Receivers wait for each request that was accepted by the API, then accept it
+            incoming = sorted(src for (src, dst), (_, status) in self.sent.items() if dst == i and status == 200)
+            for src in incoming:
+                handles, waited = wait_until(lambda: s.pending_from(self.emails[src]), self.timeout, self.refresh)
+                if not handles:
+                    tl.problem("request never shown", f"{self.emails[src]} -> {s.email}")
+                    continue
+                tl.sample("peer request", time.perf_counter() - self.sent[(src, i)][0])
+                if len(handles) > 1:
+                    tl.problem("duplicate pending request", f"{self.emails[src]} -> {s.email} x{len(handles)}")
+                double = i in self.double_accept and self.ring[src] == i
+                statuses = s.accept(self.emails[src], handles[0], double)
+                for status in statuses:
+                    tl.status("double accept" if double else "accept", status)
+                if double and sum(1 for st in statuses if st == 200) > 1:
+                    tl.problem("double accept both succeeded", f"{self.emails[src]} -> {s.email}")
+                if any(st == 200 for st in statuses):
+                    with self.lock:
+                        self.accepted[(src, i)] = time.perf_counter()
+            self.phase()
+
+            # 3. Senders wait for the receiver in My Peers
+            for (src, dst), at in list(self.accepted.items()):
+                if src != i:
+                    continue
+                count, _ = wait_until(lambda: s.peer_count(self.emails[dst]), self.timeout, self.refresh)
+                if not count:
+                    tl.problem("accepted peer never shown", f"{s.email} -> {self.emails[dst]}")
+                    continue
+                tl.sample("accepted peer", time.perf_counter() - at)
+                if count > 1:
+                    tl.problem("duplicate peer shown", f"{s.email} sees {self.emails[dst]} x{count}")
+            self.phase()
+
+            # 4. Recommend to the ring receiver, then wait for the one from the ring sender
+            receiver = self.ring[i]
+            if (i, receiver) in self.accepted or (receiver, i) in self.accepted:
+                title = self.title(i, receiver)
+                status, at = s.recommend(self.emails[receiver], self.sessions[receiver].user_id, title)
+                tl.status("recommendation", status)
+                if status == 200:
+                    with self.lock:
+                        self.recommended[(i, receiver)] = (at, title)
+            self.phase()
+            sender = next(src for src, dst in self.ring.items() if dst == i)
+            if (sender, i) in self.recommended:
+                at, title = self.recommended[(sender, i)]
+                seen, _ = wait_until(lambda: s.has_resource(title), self.timeout, self.refresh)
+                if seen:
+                    tl.sample("recommendation", time.perf_counter() - at)
+                else:
+                    tl.problem("recommendation never shown", f"{title!r} for {s.email}")
+        except threading.BrokenBarrierError:
+            pass  # another session failed; it reported why
+        except Exception as e:
+            tl.problem("session error", f"{s.email}: {type(e).__name__}: {e}")
+            self.barrier.abort()
+
+    def run(self):
+        threads = [threading.Thread(target=self.worker, args=(i,), daemon=True) for i in range(self.n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def expected_links(self):
+        pairs = {frozenset(edge) for edge in self.ring.items()}
+        return pairs | {frozenset(edge) for edge in self.crossed.items()}
+
+    def check_backend(self, client):
+        """Links and pending requests as the backend has them after the run"""
+        tl = self.timeline
+        ids = {s.user_id: s.email for s in self.sessions if s.user_id is not None}
+        links = set()
+        for s in self.sessions:
+            if s.user_id is None:
+                continue
+            state = client.get(f"/api/state/{s.user_id}")
+            linked = Counter(p.get("linkedId") for p in state["peers"] if p.get("linkedId") in ids)
+            for other, n in linked.items():
+                links.add((s.user_id, other))
+                if n > 1:
+                    tl.problem("duplicate link", f"{s.email} -> {ids[other]} x{n}")
+            pending = Counter(r["email"].lower() for r in client.get(f"/api/peers/requests/{s.user_id}") or [])
+            for email, n in pending.items():
+                tl.problem("leftover pending request" if n == 1 else "duplicate pending request",
+                           f"{email} -> {s.email}" + (f" x{n}" if n > 1 else ""))
+        for a, b in links:
+            if (b, a) not in links:
+                tl.problem("one-way link", f"{ids[a]} -> {ids[b]}")
+        index = {s.email: s.user_id for s in self.sessions}
+        for pair in self.expected_links():
+            a, b = (index[self.emails[i]] for i in pair)
+            if a is not None and b is not None and (a, b) not in links and (b, a) not in links:
+                tl.problem("missing link", f"{ids[a]} <-> {ids[b]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent multi-user soak test for peers and recommendations")
+    parser.add_argument("--sessions", type=int, default=12, help="concurrent users (at least 4)")
+    parser.add_argument("--races", type=int, default=2,
+                        help="crossed request pairs and double accepts to provoke (default: 2 each)")
+    parser.add_argument("--api-only", action="store_true", help="drive the backend only, no browsers")
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--stub", action="store_true",
+                        help="serve the API from the in-memory stand-in, with requests interleaved like Node")
+    parser.add_argument("--no-interleave", action="store_true",
+                        help="with --stub, run each request alone (a control: no races should show)")
+    parser.add_argument("--query-delay-ms", type=float, default=2.0, help="simulated query latency with --stub")
+    parser.add_argument("--reset", action="store_true", help="delete earlier soak users from Postgres first")
+    parser.add_argument("--refresh", type=float, default=0.5, help="seconds between a watcher's reloads")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for each item to show up")
+    parser.add_argument("--report", metavar="JSON", help="also write the results here")
+    args = parser.parse_args(argv)
+    if args.sessions < 4:
+        parser.error("--sessions must be at least 4")
+    args.races = min(args.races, args.sessions // 2 - 1)
+
+    backend = None
+    if args.stub:
+        from stub_backend import StubBackend
+        # Browsers reach the stand-in through Vite's /api proxy on :3001
+        backend = StubBackend(port=0 if args.api_only else 3001,
+                              query_delay=args.query_delay_ms / 1000, interleave=not args.no_interleave)
+        base_url = backend.start()
+    else:
+        base_url = api_url()
+        if args.reset:
+            from db_tools import connect
+            from seed_data import reset_postgres
+            conn = connect()
+            try:
+                reset_postgres(conn, SOAK_PREFIX)
+            finally:
+                conn.close()
+            print(f"✓ Removed earlier {SOAK_PREFIX}* users")
+    if not args.api_only:
+        from readiness import ensure_ready
+        if not ensure_ready(["frontend"] if args.stub else ["frontend", "api"], timeout=10):
+            print("\n❌ Services not ready (see Prerequisites in README.md)")
+            return 1
+
+    run = f"{int(time.time()) % 0xFFFFFF:06x}"
+    emails = [soak_email(run, i) for i in range(args.sessions)]
+    client = ApiClient(base_url)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda email: ApiClient(base_url).register(email, PASSWORD), emails))
+    print(f"✓ Registered {len(emails)} users ({SOAK_PREFIX}{run}*)")
+
+    pool = None
+    if args.api_only:
+        sessions = [ApiSession(email, base_url) for email in emails]
+    else:
+        from driver_pool import DriverPool
+        print(f"→ Launching {args.sessions} browsers...")
+        pool = DriverPool(args.sessions, headless=not args.headed)
+        drivers = [pool.acquire() for _ in emails]
+        sessions = [BrowserSession(email, base_url, driver, frontend_url()) for email, driver in zip(emails, drivers)]
+
+    timeline = Timeline()
+    soak = Soak(sessions, args.races, timeline, args.refresh, args.timeout, run)
+    mode = "API only" if args.api_only else "browsers"
+    print(f"→ {args.sessions} sessions ({mode}), {args.races} crossed pairs, {args.races} double accepts")
+    start = time.perf_counter()
+    try:
+        soak.run()
+        soak.check_backend(client)
+    finally:
+        for s in sessions:
+            s.close()
+        if pool:
+            pool.close()
+        if backend:
+            backend.stop()
+    elapsed = time.perf_counter() - start
+
+    timeline.report()
+    print(f"Wall-clock time: {elapsed:.1f}s\n")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(dict(timeline.as_dict(), sessions=args.sessions, races=args.races, mode=mode,
+                           elapsed_s=elapsed), f, indent=2)
+        print(f"Results: {args.report}")
+    return 1 if timeline.problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
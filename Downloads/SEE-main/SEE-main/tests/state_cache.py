@@ -0,0 +1,86 @@
+"""
+Cached authenticated browser state, keyed by user
+After a user's first login we keep their localStorage and cookies; later
+switches back to that user restore the snapshot instead of logging in again.
+"""
+
+import time
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
+from api_session import ORIGIN_PAGE, bootstrap_session
+from waits import Waiter
+
+DEFAULT_TTL = 30 * 60  # seconds; the app has no token expiry of its own
+
+
+class BrowserStateCache:
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self._entries = {}  # key -> {"local": {...}, "cookies": [...], "expires_at": float}
+
+    def snapshot(self, driver, key):
+        """Store the current page's localStorage and cookies under `key`"""
+        local = driver.execute_script(
+            "const out = {};"
+            "for (let i = 0; i < localStorage.length; i++) {"
+            "  const k = localStorage.key(i); out[k] = localStorage.getItem(k);"
+            "}"
+            "return out;"
+        )
+        cookies = driver.get_cookies()
+        expires_at = time.time() + self.ttl
+        # A cookie that dies sooner (e.g. a session token) caps the entry
+        for cookie in cookies:
+            if cookie.get("expiry"):
+                expires_at = min(expires_at, cookie["expiry"])
+        self._entries[key] = {"local": local, "cookies": cookies, "expires_at": expires_at}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry and entry["expires_at"] <= time.time():
+            del self._entries[key]
+            return None
+        return entry
+
+    def restore(self, driver, key, base_url):
+        """Load `key`'s snapshot into the browser and open the app; False on a miss"""
+        entry = self.get(key)
+        if entry is None:
+            return False
+        driver.get(base_url + ORIGIN_PAGE)
+        driver.delete_all_cookies()
+        for cookie in entry["cookies"]:
+            driver.add_cookie(cookie)
+        driver.execute_script(
+            "localStorage.clear();"
+            "for (const [k, v] of Object.entries(arguments[0])) localStorage.setItem(k, v);",
+            entry["local"]
+        )
+        driver.get(base_url)
+        return True
+
+    def invalidate(self, key=None):
+        """Drop one user's snapshot, or all of them when `key` is None"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+# Shared by every test class in this process
+STATE_CACHE = BrowserStateCache()
+
+
+def switch_user(driver, base_url, email, password, cache=None, client=None, waits=None):
+    """Become `email`: restore a cached session if we have one, else log in via the API"""
+    cache = cache or STATE_CACHE
+    waits = waits or Waiter(driver)
+    if cache.restore(driver, email, base_url):
+        try:
+            waits.present((By.CLASS_NAME, "sidebar"))
+            return "restored"
+        except TimeoutException:
+            cache.invalidate(email)
+    bootstrap_session(driver, base_url, email, password, client, waits)
+    cache.snapshot(driver, email)
+    return "logged in"
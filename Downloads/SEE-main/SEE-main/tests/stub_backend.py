@@ -0,0 +1,509 @@
+"""
+In-memory stand-in for the Express backend (backend/server.js)
+Serves the same /api/* routes with the same responses from Python dicts, so
+the HTTP tools can run with no Node, Postgres or outside services.
+
+Every handler walks through the same sequence of queries server.js issues
+and counts them; the count is returned in the X-Query-Count header.
+
+Handlers normally run one at a time. With `interleave`, a handler lets other
+requests run while it waits on each simulated query, the way Node runs other
+requests at every `await db.query(...)`. That makes server.js's
+check-then-insert races (e.g. crossed peer requests, double accepts)
+reproducible here.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Same list as TOP_20_SKILLS in backend/server.js
+TOP_20_SKILLS = [
+    "Python", "Java", "C++", "JavaScript", "HTML", "CSS", "React", "Node.js",
+    "SQL", "MongoDB", "Git", "Docker", "AWS", "Linux",
+    "Machine Learning", "Data Structures", "Algorithms",
+    "Communication", "Problem Solving", "Leadership"
+]
+
+# express.json()'s default body limit; larger bodies get 413 before any handler runs
+JSON_LIMIT = 100 * 1024
+
+EMAIL_RE = re.compile(r"^01fe.*@kletech\.ac\.in$", re.IGNORECASE)
+
+
+class HttpError(Exception):
+    def __init__(self, status, error):
+        super().__init__(error)
+        self.status = status
+        self.error = error
+
+
+def parse_companies(raw):
+    """The JSON-array-or-plain-string company encoding used by /api/state/:userId"""
+    raw = raw or ""
+    try:
+        parsed = json.loads(raw)
+    except ValueError:
+        return [raw] if raw.strip() else []
+    if isinstance(parsed, list):
+        return parsed
+    return [str(parsed)] if parsed else []
+
+
+def parse_company_field(raw):
+    """The looser parse used by /api/users/search and /api/peers/requests"""
+    if raw is None:
+        return None  # JSON.parse(null) === null
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return [raw] if raw else []
+
+
+class StubStore:
+    """The backend's tables (see backend/db.js) as lists of dicts"""
+
+    def __init__(self, query_delay=0.0, interleave=False):
+        self.query_delay = query_delay
+        self.interleave = interleave
+        self.lock = threading.RLock()
+        # Each request is handled on its own thread; this counts that request's queries only
+        self._request = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Empty every table, e.g. between benchmark sizes, while the server keeps running"""
+        with self.lock:
+            self.tables = {name: [] for name in ("users", "skills", "peers", "peer_requests", "peer_skills",
+                                                 "resources")}
+            self._ids = {name: 0 for name in self.tables}
+            # table -> user_id -> rows, standing in for the user_id lookups Postgres does by index
+            self._by_user = {name: {} for name in self.tables}
+            self.queries = 0
+
+    def q(self):
+        """Account for one db.query() round-trip"""
+        self.queries += 1
+        self._request.queries = getattr(self._request, "queries", 0) + 1
+        if self.interleave:
+            # Other requests run while this one awaits its query
+            self.lock.release()
+            try:
+                time.sleep(self.query_delay)
+            finally:
+                self.lock.acquire()
+        elif self.query_delay:
+            time.sleep(self.query_delay)
+
+    def start_request(self):
+        self._request.queries = 0
+
+    def request_queries(self):
+        """Queries issued on this thread since start_request()"""
+        return getattr(self._request, "queries", 0)
+
+    def insert(self, table, **row):
+        self._ids[table] += 1
+        row["id"] = self._ids[table]
+        self.tables[table].append(row)
+        self._by_user[table].setdefault(row.get("user_id"), []).append(row)
+        return row
+
+    def rows(self, table, **where):
+        source = self._by_user[table].get(where["user_id"], []) if "user_id" in where else self.tables[table]
+        return [r for r in source if all(r.get(k) == v for k, v in where.items())]
+
+    def delete(self, table, **where):
+        doomed = self.rows(table, **where)
+        if doomed:
+            ids = {r["id"] for r in doomed}
+            self.tables[table] = [r for r in self.tables[table] if r["id"] not in ids]
+            for r in doomed:
+                self._by_user[table][r.get("user_id")].remove(r)
+        return len(doomed)
+
+    def user_by_name(self, username):
+        name = (username or "").lower()
+        return next((u for u in self.tables["users"] if u["username"].lower() == name), None)
+
+    def user(self, user_id):
+        return next((u for u in self.tables["users"] if u["id"] == user_id), None)
+
+
+def as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HttpError(500, "invalid input syntax for type integer")
+
+
+class Api:
+    """Route handlers, one method per endpoint in server.js"""
+
+    def __init__(self, store):
+        self.db = store
+        self.routes = [
+            ("GET", re.compile(r"^/api/skill-match/([^/]+)$"), self.skill_match),
+            ("POST", re.compile(r"^/api/register$"), self.register),
+            ("POST", re.compile(r"^/api/login$"), self.login),
+            ("POST", re.compile(r"^/api/state/save$"), self.save_state),
+            ("POST", re.compile(r"^/api/resources/recommend$"), self.recommend),
+            ("GET", re.compile(r"^/api/state/([^/]+)$"), self.load_state),
+            ("GET", re.compile(r"^/api/users/search$"), self.search_users),
+            ("POST", re.compile(r"^/api/peers/request$"), self.peer_request),
+            ("GET", re.compile(r"^/api/peers/requests/([^/]+)$"), self.peer_requests),
+            ("POST", re.compile(r"^/api/peers/respond$"), self.peer_respond),
+            ("POST", re.compile(r"^/api/peers/remove$"), self.peer_remove),
+        ]
+
+    def dispatch(self, method, path, query, body):
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                with self.db.lock:
+                    return handler(*match.groups(), query=query, body=body or {})
+        raise HttpError(404, f"Cannot {method} {path}")
+
+    def skill_match(self, user_id, **_):
+        db = self.db
+        db.q()
+        mine = {r["skill"].strip().lower() for r in db.rows("skills", user_id=as_int(user_id))
+                if isinstance(r.get("skill"), str) and r["skill"]}
+        matched = [s for s in TOP_20_SKILLS if s.lower() in mine]
+        missing = [s for s in TOP_20_SKILLS if s.lower() not in mine]
+        return {
+            # Math.round, not Python's banker's rounding
+            "percentage": int(len(matched) / len(TOP_20_SKILLS) * 100 + 0.5),
+            "matchedSkills": matched,
+            "missingSkills": missing,
+            "totalTopSkills": len(TOP_20_SKILLS),
+        }
+
+    def register(self, body, **_):
+        username, password = body.get("username"), body.get("password")
+        if not username or not password:
+            raise HttpError(400, "Username & password required")
+        if not EMAIL_RE.match(username):
+            raise HttpError(400, "Email must start with 01fe and end with @kletech.ac.in")
+        self.db.q()
+        if self.db.user_by_name(username):
+            raise HttpError(409, "Username already exists")
+        self.db.q()
+        self.db.insert("users", username=username, password=password, company=None, name=None, meta=None, avatar=None)
+        return {"success": True}
+
+    def login(self, body, **_):
+        self.db.q()
+        user = self.db.user_by_name(body.get("username"))
+        # Stand-in keeps plain passwords; the real server compares bcrypt hashes
+        if not user or user["password"] != body.get("password"):
+            raise HttpError(401, "Invalid credentials")
+        return {"success": True, "userId": user["id"], "username": user["username"]}
+
+    def save_state(self, body, **_):
+        db = self.db
+        user_id = body.get("userId")
+        if not user_id:
+            raise HttpError(400, "Missing userId")
+        user_id = as_int(user_id)
+        profile = body.get("profile")
+        if profile:
+            if isinstance(profile.get("companies"), list):
+                company = json.dumps(profile["companies"], separators=(",", ":"))
+            else:
+                company = profile.get("company") or ""
+            db.q()
+            user = db.user(user_id)
+            if user:
+                user.update(name=profile.get("name"), meta=profile.get("meta"), company=company, avatar=profile.get("avatar"))
+        # server.js clears the user's skills twice before re-inserting
+        db.q()
+        db.delete("skills", user_id=user_id)
+        db.q()
+        db.delete("skills", user_id=user_id)
+        for s in body.get("mySkills") or []:
+            db.q()
+            if isinstance(s, dict):
+                db.insert("skills", user_id=user_id, skill=s.get("skill"), company=s.get("company"))
+            else:
+                db.insert("skills", user_id=user_id, skill=s, company="")
+        resources = body.get("resources")
+        if isinstance(resources, list):
+            db.q()
+            db.delete("resources", user_id=user_id)
+            for r in resources:
+                db.q()
+                skill = r.get("skill")
+                if isinstance(skill, dict):
+                    skill = skill.get("skill")
+                db.insert("resources", user_id=user_id, skill=skill, title=r.get("title"), url=r.get("url"),
+                          note=r.get("note"), author=r.get("author"), peer_index=r.get("peerIndex"))
+        return {"success": True}
+
+    def recommend(self, body, **_):
+        db = self.db
+        sender_id, receiver_id, resource = body.get("senderId"), body.get("receiverId"), body.get("resource")
+        if not sender_id or not receiver_id or not resource:
+            raise HttpError(400, "Missing required fields")
+        db.q()
+        sender = db.user(as_int(sender_id))
+        db.q()
+        receiver = db.user(as_int(receiver_id))
+        if not sender or not receiver:
+            raise HttpError(500, "Recommendation failed")
+        db.q()
+        db.insert("resources", user_id=receiver["id"], skill=resource.get("skill"), title=resource.get("title"),
+                  url=resource.get("url"), note=resource.get("note"),
+                  author=sender["name"] or sender["username"], peer_index=-1)
+        note = (resource["note"] + " " if resource.get("note") else "") + f"(Sent to {receiver['name'] or receiver['username']})"
+        db.q()
+        db.insert("resources", user_id=sender["id"], skill=resource.get("skill"), title=resource.get("title"),
+                  url=resource.get("url"), note=note, author="You", peer_index=0)
+        return {"success": True}
+
+    def load_state(self, user_id, **_):
+        db = self.db
+        user_id = as_int(user_id)
+        db.q()
+        user = db.user(user_id) or {}
+        db.q()
+        my_skills = [{"skill": r["skill"], "company": r["company"]} for r in db.rows("skills", user_id=user_id)]
+        db.q()
+        peer_rows = sorted(db.rows("peers", user_id=user_id), key=lambda r: r["id"])
+        db.q()
+        resource_rows = db.rows("resources", user_id=user_id)
+
+        peers, linked_ids, peer_index = [], [], {}
+        for index, peer in enumerate(peer_rows):
+            # One skills query per peer, exactly like the loop in server.js
+            db.q()
+            if peer.get("linked_user_id"):
+                skill_rows = db.rows("skills", user_id=peer["linked_user_id"])
+                linked_ids.append(peer["linked_user_id"])
+                peer_index[peer["linked_user_id"]] = index
+            else:
+                skill_rows = db.rows("peer_skills", peer_id=peer["id"])
+            peers.append({
+                "id": peer["id"],
+                "name": peer.get("name"),
+                "company": peer.get("company"),
+                "skills": [r["skill"] for r in skill_rows],
+                "linkedId": peer.get("linked_user_id"),
+            })
+
+        shared = []
+        if linked_ids:
+            db.q()
+            wanted = set(linked_ids)
+            mutual = {r["user_id"] for r in db.tables["peers"] if r["user_id"] in wanted and r.get("linked_user_id") == user_id}
+            if mutual:
+                db.q()
+                shared = [{
+                    "skill": r["skill"], "title": r["title"], "url": r["url"], "note": r["note"],
+                    "author": r["author"], "peerIndex": peer_index.get(r["user_id"]),
+                } for r in db.tables["resources"] if r["user_id"] in mutual]
+
+        return {
+            "profile": {
+                "name": user.get("name") or "",
+                "meta": user.get("meta") or "",
+                "company": user.get("company") or "",
+                "companies": parse_companies(user.get("company")),
+                "avatar": user.get("avatar") or "",
+            },
+            "mySkills": my_skills,
+            "peers": peers,
+            "resources": [{
+                "skill": r["skill"], "title": r["title"], "url": r["url"], "note": r["note"],
+                "author": r["author"], "peerIndex": r["peer_index"],
+            } for r in resource_rows],
+            "sharedResources": shared,
+        }
+
+    def search_users(self, query, **_):
+        q = (query.get("q") or [None])[0]
+        if not q:
+            return None
+        db = self.db
+        db.q()
+        user = db.user_by_name(q)
+        if not user:
+            return None
+        db.q()
+        skills = [{"skill": r["skill"], "company": r["company"]} for r in db.rows("skills", user_id=user["id"])]
+        return {"id": user["id"], "name": user["name"] or user["username"],
+                "company": parse_company_field(user.get("company")), "skills": skills}
+
+    def peer_request(self, body, **_):
+        db = self.db
+        sender_id, email = body.get("senderId"), body.get("receiverEmail")
+        if not sender_id or not email:
+            raise HttpError(400, "Missing senderId or receiverEmail")
+        sender_id = as_int(sender_id)
+        db.q()
+        receiver = db.user_by_name(email)
+        if not receiver:
+            raise HttpError(404, "User not found")
+        receiver_id = receiver["id"]
+        if sender_id == receiver_id:
+            raise HttpError(400, "Cannot add yourself")
+        db.q()
+        if db.rows("peers", user_id=sender_id, linked_user_id=receiver_id):
+            raise HttpError(400, "Already peers")
+        db.q()
+        if db.rows("peer_requests", sender_id=sender_id, receiver_id=receiver_id, status="pending"):
+            raise HttpError(400, "Request already pending")
+        db.q()
+        if db.rows("peer_requests", sender_id=receiver_id, receiver_id=sender_id, status="pending"):
+            raise HttpError(400, "They already sent you a request. Check your pending requests.")
+        db.q()
+        db.insert("peer_requests", sender_id=sender_id, receiver_id=receiver_id, status="pending")
+        return {"success": True, "message": "Request sent"}
+
+    def peer_requests(self, user_id, **_):
+        db = self.db
+        db.q()
+        out = []
+        for r in db.rows("peer_requests", receiver_id=as_int(user_id), status="pending"):
+            sender = db.user(r["sender_id"])
+            out.append({"id": r["id"], "email": sender["username"], "name": sender["name"],
+                        "company": parse_company_field(sender.get("company"))})
+        return out
+
+    def peer_respond(self, body, **_):
+        db = self.db
+        action = body.get("action")
+        if action not in ("accept", "reject"):
+            raise HttpError(400, "Invalid action")
+        db.q()
+        request = next(iter(db.rows("peer_requests", id=as_int(body.get("requestId")))), None)
+        if not request:
+            raise HttpError(404, "Request not found")
+        if request["status"] != "pending":
+            raise HttpError(400, "Request already processed")
+        db.q()
+        if action == "reject":
+            request["status"] = "rejected"
+            return {"success": True, "message": "Request rejected"}
+        request["status"] = "accepted"
+        db.q()
+        u1, u2 = db.user(request["sender_id"]), db.user(request["receiver_id"])
+        db.q()
+        db.insert("peers", user_id=u1["id"], linked_user_id=u2["id"], name=u2["name"] or u2["username"], company=u2["company"])
+        db.q()
+        db.insert("peers", user_id=u2["id"], linked_user_id=u1["id"], name=u1["name"] or u1["username"], company=u1["company"])
+        return {"success": True, "message": "Request accepted"}
+
+    def peer_remove(self, body, **_):
+        db = self.db
+        user_id, peer_id = as_int(body.get("userId")), as_int(body.get("peerId"))
+        db.q()
+        peer = next(iter(db.rows("peers", id=peer_id, user_id=user_id)), None)
+        if not peer:
+            raise HttpError(404, "Peer not found")
+        db.q()
+        db.delete("peers", id=peer_id)
+        if peer.get("linked_user_id"):
+            db.q()
+            db.delete("peers", user_id=peer["linked_user_id"], linked_user_id=user_id)
+        return {"success": True}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like Express
+    # Headers and body go out as separate writes; without this, Nagle plus
+    # delayed ACKs add ~40ms+ to every keep-alive response.
+    disable_nagle_algorithm = True
+
+    def _handle(self, method):
+        api = self.server.api
+        parts = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        api.db.start_request()
+        try:
+            if length > JSON_LIMIT:
+                raise HttpError(413, "request entity too large")
+            body = json.loads(raw) if raw else None
+            status, data = 200, api.dispatch(method, parts.path, parse_qs(parts.query), body)
+        except HttpError as e:
+            status, data = e.status, {"error": e.error}
+        except ValueError:
+            status, data = 400, {"error": "Invalid JSON"}
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-Query-Count", str(api.db.request_queries()))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default listen backlog of 5 drops SYNs under load
+
+
+class StubBackend:
+    """Run the stand-in on a background thread: `with StubBackend() as url: ...`"""
+
+    def __init__(self, host="127.0.0.1", port=0, query_delay=0.0, interleave=False):
+        self.store = StubStore(query_delay, interleave)
+        self.server = _Server((host, port), _Handler)
+        self.server.api = Api(self.store)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="In-memory stand-in for the Express API")
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--query-delay-ms", type=float, default=0.0,
+                        help="simulated latency per database round-trip")
+    parser.add_argument("--interleave", action="store_true",
+                        help="let requests run concurrently between queries, like Node's awaits")
+    args = parser.parse_args(argv)
+    backend = StubBackend(port=args.port, query_delay=args.query_delay_ms / 1000, interleave=args.interleave)
+    print(f"🚀 Stub backend running at {backend.url}")
+    try:
+        backend.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backend.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Smart suite selection: only re-run suites whose inputs changed
+Every suite is mapped to the JSX components, server.js routes and test
+modules it exercises. Each route is fingerprinted from its own handler in
+server.js, so editing /api/peers/respond does not invalidate the Profile
+suite. Code shared by every route (requires, middleware, helpers, db.js) and
+by every page (App.jsx, main.jsx, styles, Vite config) is an input of all
+suites. The test helpers a suite's Python files import (directly or through
+other helpers) are found from their imports and are inputs too. A suite whose tests all passed is cached with its fingerprint, and
+`run_all_tests.py --changed-only` reuses those results while the inputs match.
+
+    python suite_selection.py            # what --changed-only would run, and why
+    python suite_selection.py --clear    # forget all cached results
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import time
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(TESTS_DIR)
+CACHE_PATH = os.path.join(TESTS_DIR, "reports", "selection_cache.json")
+
+# Inputs of every suite (paths relative to the project root)
+COMMON_FILES = [
+    "frontend/src/App.jsx", "frontend/src/main.jsx", "frontend/src/App.css", "frontend/src/index.css",
+    "frontend/index.html", "frontend/vite.config.js", "frontend/package.json",
+    "backend/db.js", "backend/package.json",
+    "tests/run_all_tests.py", "tests/api_session.py", "tests/waits.py", "tests/driver_pool.py",
+    "tests/perf_report.py", "tests/page_query.py", "tests/command_profiler.py",
+]
+
+# Suite -> what it exercises. Dashboard.jsx is the landing page after login,
+# so every suite that logs in renders it. Routes ending in "/" are prefixes.
+SUITE_DEPENDENCIES = {
+    "Login Tests": {
+        "files": ["frontend/src/Dashboard.jsx", "tests/test_login.py"],
+        "routes": ["POST /api/login", "POST /api/register", "GET /api/state/:userId"],
+    },
+    "Skill Management Tests": {
+        "files": ["frontend/src/Dashboard.jsx", "frontend/src/MySkills.jsx", "tests/test_skill_management.py"],
+        "routes": ["POST /api/login", "POST /api/register", "GET /api/state/:userId",
+                   "POST /api/state/save", "GET /api/skill-match/:userId"],
+    },
+    "Dashboard Tests": {
+        "files": ["frontend/src/Dashboard.jsx", "tests/test_dashboard.py", "tests/test_skill_management.py"],
+        "routes": ["POST /api/login", "POST /api/register", "GET /api/state/:userId"],
+    },
+    "Profile Tests": {
+        "files": ["frontend/src/Dashboard.jsx", "frontend/src/Profile.jsx", "tests/test_profile.py",
+                  "tests/test_skill_management.py"],
+        "routes": ["POST /api/login", "POST /api/register", "GET /api/state/:userId", "POST /api/state/save"],
+    },
+    "Peer Tests": {
+        "files": ["frontend/src/Dashboard.jsx", "frontend/src/Peers.jsx", "frontend/src/Resources.jsx",
+                  "tests/test_peers.py", "tests/state_cache.py"],
+        "routes": ["POST /api/login", "GET /api/state/:userId", "GET /api/peers/", "POST /api/peers/",
+                   "POST /api/resources/recommend"],
+    },
+    "Navigation Tests": {
+        "files": ["frontend/src/Dashboard.jsx", "frontend/src/SkillGap.jsx", "frontend/src/Resources.jsx",
+                  "tests/test_navigation.py", "tests/test_skill_management.py"],
+        "routes": ["POST /api/login", "POST /api/register", "GET /api/state/:userId"],
+    },
+}
+
+ROUTE_START = re.compile(r"^app\.(get|post|put|patch|delete)\(\s*['\"]([^'\"]+)['\"]")
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def file_fingerprint(rel_path):
+    path = os.path.join(PROJECT_DIR, rel_path)
+    if not os.path.exists(path):
+        return "missing"
+    with open(path, "rb") as f:
+        return _digest(f.read())
+
+
+def local_imports(rel_path, seen=None):
+    """tests/*.py modules that `rel_path` imports, followed through the helpers they import"""
+    seen = set() if seen is None else seen
+    path = os.path.join(PROJECT_DIR, rel_path)
+    if not rel_path.endswith(".py") or not os.path.exists(path):
+        return seen
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            module = f"tests/{name.split('.')[0]}.py"
+            if module not in seen and os.path.exists(os.path.join(PROJECT_DIR, module)):
+                seen.add(module)
+                local_imports(module, seen)
+    return seen
+
+
+def route_fingerprints(server_path=None):
+    """Fingerprint each route handler of server.js; the rest of the file is 'server.js (shared)'"""
+    server_path = server_path or os.path.join(PROJECT_DIR, "backend", "server.js")
+    routes, shared, current = {}, [], None
+    with open(server_path, encoding="utf-8") as f:
+        for line in f:
+            match = ROUTE_START.match(line)
+            if match:
+                current = f"{match.group(1).upper()} {match.group(2)}"
+                routes[current] = [line]
+            elif current:
+                routes[current].append(line)
+                if line.rstrip() == "});":  # end of the top-level handler
+                    current = None
+            elif line.strip():
+                shared.append(line)
+    fingerprints = {route: _digest("".join(lines).encode()) for route, lines in routes.items()}
+    fingerprints["server.js (shared)"] = _digest("".join(shared).encode())
+    return fingerprints
+
+
+def suite_inputs(category, routes):
+    """{input name: fingerprint} for one suite"""
+    deps = SUITE_DEPENDENCIES[category]
+    files = COMMON_FILES + deps["files"]
+    imported = set()
+    for path in deps["files"]:  # not COMMON_FILES: the runner imports every module
+        local_imports(path, imported)
+    inputs = {path: file_fingerprint(path) for path in files + sorted(imported - set(files))}
+    inputs["server.js (shared)"] = routes["server.js (shared)"]
+    for wanted in deps["routes"]:
+        matched = [r for r in routes if r == wanted or (wanted.endswith("/") and r.startswith(wanted))]
+        if not matched:
+            inputs[wanted] = "missing"
+        for route in matched:
+            inputs[route] = routes[route]
+    return inputs
+
+
+class SuiteSelection:
+    """Decides which suites need to run and caches the results of green ones"""
+
+    def __init__(self, categories=None, cache_path=CACHE_PATH):
+        self.cache_path = cache_path
+        self.cache = {}
+        if os.path.exists(cache_path):
+            with open(cache_path, encoding="utf-8") as f:
+                self.cache = json.load(f)
+        routes = route_fingerprints()
+        self.inputs = {category: suite_inputs(category, routes)
+                       for category in (categories or SUITE_DEPENDENCIES)}
+
+    def changed_inputs(self, category):
+        """Inputs that differ from the last green run, or None if there is no green run"""
+        entry = self.cache.get(category)
+        if not entry:
+            return None
+        return sorted(name for name, fp in self.inputs[category].items() if entry["inputs"].get(name) != fp)
+
+    def needs_run(self, category):
+        return self.changed_inputs(category) != []
+
+    def cached_results(self, category):
+        return self.cache[category]["results"]
+
+    def print_plan(self):
+        print("\nSuite selection (--changed-only):")
+        for category in self.inputs:
+            changed = self.changed_inputs(category)
+            if changed is None:
+                print(f"  ▶ {category}: no green run cached")
+            elif changed:
+                shown = ", ".join(changed[:4]) + (f" (+{len(changed) - 4} more)" if len(changed) > 4 else "")
+                print(f"  ▶ {category}: {shown} changed")
+            else:
+                print(f"  ↺ {category}: unchanged since {self.cache[category]['when']}, reusing results")
+
+    def update(self, all_results):
+        """Cache suites whose tests all passed; failing suites lose their cached entry"""
+        for category, results in all_results.items():
+            if category not in self.inputs:
+                continue
+            if results and all(results.values()):
+                self.cache[category] = {"inputs": self.inputs[category], "results": results,
+                                        "when": time.strftime("%Y-%m-%d %H:%M:%S")}
+            else:
+                self.cache.pop(category, None)
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump(self.cache, f, indent=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show which suites --changed-only would run")
+    parser.add_argument("--clear", action="store_true", help="forget all cached suite results")
+    args = parser.parse_args(argv)
+
+    if args.clear:
+        if os.path.exists(CACHE_PATH):
+            os.remove(CACHE_PATH)
+        print("✓ Suite cache cleared")
+        return
+    selection = SuiteSelection()
+    selection.print_plan()
+    runs = [c for c in selection.inputs if selection.needs_run(c)]
+    print(f"\n{len(runs)}/{len(selection.inputs)} suites would run")
+
+
+if __name__ == "__main__":
+    main()
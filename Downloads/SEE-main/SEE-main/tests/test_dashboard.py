@@ -1,15 +1,16 @@
 
-import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from api_session import frontend_url
+from waits import Waiter
 
 class TestDashboard:
     def __init__(self, driver=None):
         self.driver = driver if driver else webdriver.Chrome()
-        self.base_url = "http://localhost:5173"
+        self.base_url = frontend_url()
         self.wait = WebDriverWait(self.driver, 10)
+        self.waits = Waiter(self.driver)
 
     def test_dashboard_elements(self):
         print("\n" + "-"*50)
@@ -18,10 +19,10 @@ class TestDashboard:
         try:
             # Ensure on Dashboard
             self.driver.find_element(By.XPATH, "//button[contains(text(), 'Dashboard')]").click()
-            time.sleep(1)
+            self.waits.react_rendered()
             
             # Check Headers
-            self.wait.until(EC.presence_of_element_located((By.XPATH, "//h2[contains(text(), 'Dashboard')]")))
+            self.waits.present((By.XPATH, "//h2[contains(text(), 'Dashboard')]"))
             print("✓ Dashboard Header found")
             
             # Check Charts
@@ -1,15 +1,17 @@
 
-import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from api_session import frontend_url
+from waits import Waiter
 
 class TestNavigation:
     def __init__(self, driver=None):
         self.driver = driver if driver else webdriver.Chrome()
-        self.base_url = "http://localhost:5173"
+        self.base_url = frontend_url()
         self.wait = WebDriverWait(self.driver, 10)
+        self.waits = Waiter(self.driver)
 
     def test_navigation_flow(self):
         print("\n" + "-"*50)
@@ -23,7 +25,7 @@ class TestNavigation:
                 print(f"→ Navigating to {page}...")
                 btn = self.driver.find_element(By.XPATH, f"//button[contains(text(), '{page}')]")
                 btn.click()
-                time.sleep(1)
+                self.waits.react_rendered()
                 
                 # Check for header
                 try:
@@ -1,15 +1,17 @@
 
-import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from api_session import frontend_url
+from waits import Waiter
 
 class TestProfile:
     def __init__(self, driver=None):
         self.driver = driver if driver else webdriver.Chrome()
-        self.base_url = "http://localhost:5173"
+        self.base_url = frontend_url()
         self.wait = WebDriverWait(self.driver, 10)
+        self.waits = Waiter(self.driver)
 
     def test_update_profile(self):
         print("\n" + "-"*50)
@@ -18,7 +20,7 @@ class TestProfile:
         try:
             # Navigate to Profile
             self.driver.find_element(By.XPATH, "//button[contains(text(), 'Profile')]").click()
-            time.sleep(1)
+            self.waits.react_rendered()
             print("✓ Navigated to Profile")
             
             # Find Inputs
@@ -38,7 +40,13 @@ class TestProfile:
             # Save
             save_btn = self.driver.find_element(By.ID, "saveProfileBtn")
             save_btn.click()
-            time.sleep(1)
+            try:
+                # Profile.jsx confirms the save with alert("Profile saved!")
+                alert = self.waits.alert_present()
+                print(f"✓ Alert: {alert.text}")
+                alert.accept()
+            except:
+                pass
             
             # Check for success message or persistence
             # We can check a success message if one appears, or just reload page and check values
@@ -53,7 +61,7 @@ class TestProfile:
             
             # Reload and verify
             self.driver.refresh()
-            time.sleep(2)
+            self.waits.react_rendered()
             self.driver.find_element(By.XPATH, "//button[contains(text(), 'Profile')]").click() # Re-nav if refresh resets view
             
             name_val = self.driver.find_element(By.ID, "nameInput").get_attribute("value")
@@ -3,58 +3,33 @@ Selenium Test - Skill Management Functionality
 Tests adding and removing skills/companies
 """
 
-import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from waits import Waiter
+from api_session import bootstrap_session, frontend_url
+from page_query import MY_SKILLS
+
+SKILL_REMOVE_TRIGGERS = (By.XPATH, "//h4[contains(text(), 'Your Skills')]/following-sibling::div[@class='tag-list']//span[contains(text(), '×')]")
 
 class TestSkillManagement:
-    def __init__(self):
-        self.driver = webdriver.Chrome()
-        self.driver.maximize_window()
-        self.base_url = "http://localhost:5173"
+    def __init__(self, email="01fe24bcs200@kletech.ac.in", password="Yash@#$234", driver=None):
+        self.owns_driver = driver is None
+        self.driver = driver if driver else webdriver.Chrome()
+        if self.owns_driver:
+            self.driver.maximize_window()
+        self.base_url = frontend_url()
         self.wait = WebDriverWait(self.driver, 10)
-        self.username = f"skilltest_{int(time.time())}"
-        self.password = "pass123"
+        self.waits = Waiter(self.driver)
+        self.email = email
+        self.password = password
         
     def setup_user(self):
-        """Login with existing user"""
-        print(f"→ Setting up user (Login only): 01fe24bcs200@kletech.ac.in...")
-        self.driver.get(self.base_url)
-        time.sleep(1)
-        
-        # Logout if needed
+        """Open the app already logged in (session bootstrapped over the API)"""
+        print(f"→ Setting up user (API login): {self.email}...")
         try:
-            self.driver.find_element(By.CLASS_NAME, "sidebar")
-            self.driver.execute_script("localStorage.clear();")
-            self.driver.refresh()
-            time.sleep(1)
-        except:
-            pass
-            
-        # Login
-        try:
-             # If on register, switch to login
-            try:
-                switch = self.driver.find_element(By.CLASS_NAME, "auth-switch")
-                if "Login" in switch.text:
-                    switch.click()
-            except:
-                pass 
-                
-            email = self.wait.until(EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Email']")))
-            email.clear()
-            email.send_keys("01fe24bcs200@kletech.ac.in")
-            
-            pw = self.driver.find_element(By.XPATH, "//input[@placeholder='Password']")
-            pw.clear()
-            pw.send_keys("Yash@#$234")
-            
-            self.driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
-            
-            self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "sidebar")))
+            bootstrap_session(self.driver, self.base_url, self.email, self.password, waits=self.waits)
             print("✓ User setup complete (Logged in)")
             return True
         except Exception as e:
@@ -69,43 +44,47 @@ class TestSkillManagement:
         
         try:
             # Navigate to My Skills
-            nav_btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'My Skills')]")))
+            nav_btn = self.waits.clickable((By.XPATH, "//button[contains(text(), 'My Skills')]"))
             nav_btn.click()
-            time.sleep(1)
             
             print("✓ Navigated to My Skills")
             
             # Verify page load
-            self.wait.until(EC.presence_of_element_located((By.XPATH, "//h2[contains(text(), 'My Skills')]")))
-            
-            # Input Company
-            comp_input = self.driver.find_element(By.XPATH, "//input[@placeholder='e.g. Google']")
-            comp_input.clear()
-            comp_input.send_keys("TestCorp")
+            self.waits.present((By.XPATH, "//h2[contains(text(), 'My Skills')]"))
+            
+            # Fill Company and Skills and find Update in one round-trip
+            snap = (MY_SKILLS.batch(self.driver)
+                    .fill("company_input", "TestCorp")
+                    .fill("skill_input", "Selenium, Python")
+                    .element("update_button")
+                    .run())
+            if not (snap.filled("company_input") and snap.filled("skill_input")) or snap["update_button"] is None:
+                print(f"❌ TEST FAILED: Skill form not found (missing: {', '.join(snap.missing())})")
+                return False
             print("✓ Entered Company: TestCorp")
-            
-            # Input Skill
-            skill_input = self.driver.find_element(By.XPATH, "//input[@placeholder='e.g. Python, React']")
-            skill_input.clear()
-            skill_input.send_keys("Selenium, Python")
             print("✓ Entered Skills: Selenium, Python")
             
             # Click Update
-            btn = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Update Details')]")
-            btn.click()
+            self.waits.track_network()
+            snap["update_button"].click()
             print("✓ Clicked Update Details")
             
-            # Wait for update
-            time.sleep(2)
+            # Wait for the save + state refresh round-trip
+            self.waits.network_idle()
+            try:
+                self.waits.text_present("TestCorp", "Selenium", timeout=2)
+            except TimeoutException:
+                pass
             
             # Verify tags appeared
             # We look for text 'TestCorp' and 'Selenium'
-            body_text = self.driver.find_element(By.TAG_NAME, "body").text
+            snap = MY_SKILLS.batch(self.driver).contains("body", "TestCorp", "Selenium").run()
             
-            if "TestCorp" in body_text and "Selenium" in body_text:
+            if snap.contains("body", "TestCorp") and snap.contains("body", "Selenium"):
                 print("✅ TEST PASSED: Skills and Company added successfully!")
                 return True
             else:
+                body_text = MY_SKILLS.batch(self.driver).text("body").run().text("body")
                 print(f"❌ TEST FAILED: Skills/Company not found in page text.\nPage Text Snippet:\n{body_text[:500]}")
                 return False
                 
@@ -146,7 +125,10 @@ class TestSkillManagement:
             print(f"✓ Found {count_before} skills. Removing first one...")
             
             triggers[0].click()
-            time.sleep(2)
+            try:
+                self.waits.element_count_changed(SKILL_REMOVE_TRIGGERS, count_before)
+            except TimeoutException:
+                pass
             
             # Re-check count
             skills_section = self.driver.find_element(By.XPATH, "//h4[contains(text(), 'Your Skills')]/following-sibling::div[@class='tag-list']")
@@ -185,9 +167,10 @@ class TestSkillManagement:
         return results
 
     def close(self):
-        time.sleep(2)
-        self.driver.quit()
-        print("\n✓ Browser closed")
+        self.waits.print_summary()
+        if self.owns_driver:
+            self.driver.quit()
+            print("\n✓ Browser closed")
 
 if __name__ == "__main__":
     test = TestSkillManagement()
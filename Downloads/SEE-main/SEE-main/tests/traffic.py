@@ -0,0 +1,445 @@
+"""
+Record and replay backend traffic
+The recorder is a small HTTP reverse proxy in front of server.js that writes
+every request (method, path, JSON body) and its outcome (status, latency,
+size) with its start offset to a gzipped JSONL trace. The replayer re-issues
+a trace against any backend at the original pace, N times faster, or as
+fast as possible, optionally as many staggered virtual users.
+
+Logins, pending-request lists and state loads also keep the ids they
+returned. Each virtual user replays the trace under its own renamed
+accounts: it registers the accounts the trace only logs in to, learns the
+new user, request and peer ids from its own responses, and rewrites paths
+and bodies to them. N users are therefore N distinct users' load, and
+--stub works from an empty store.
+
+    python traffic.py record --listen 3901 --upstream http://localhost:3001 --out run.jsonl.gz
+    PSI_API_TARGET=http://localhost:3901 npm run dev            # browser traffic through the recorder
+    python run_all_tests.py --record-traffic run.jsonl.gz       # or let the runner start it
+    python traffic.py replay run.jsonl.gz --speed 4 --users 20 --stagger 0.5
+"""
+
+import argparse
+import asyncio
+import gzip
+import itertools
+import json
+import re
+import threading
+import time
+from http.client import responses
+from load_test import ConnectionPool, Stats, percentile, route_of
+from api_session import api_url
+
+TRACE_VERSION = 1
+RECORD_PORT = 3901
+
+# Routes whose last path segment is a user id
+USER_PATH = re.compile(r"^(/api/(?:state|skill-match|peers/requests)/)(\d+)$")
+USER_ID_KEYS = ("userId", "senderId", "receiverId")
+USERNAME_KEYS = ("username", "receiverEmail")
+
+
+def _parse_body(raw):
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None  # the app only sends JSON; anything else is not replayable
+
+
+def hands_out_ids(method, path):
+    """Whether the response to this request has ids later requests refer to"""
+    path = path.split("?", 1)[0]
+    return (method == "POST" and path == "/api/login") or (
+        method == "GET" and USER_PATH.match(path) is not None and not path.startswith("/api/skill-match/"))
+
+
+def response_ids(method, path, data):
+    """{"u": user id} for a login, {"r": {request id: sender email}} for
+    pending requests, {"p": {peer id: linked user id}} for a state load"""
+    if data is None:
+        return None
+    if path == "/api/login":
+        return {"u": data.get("userId")}
+    if path.startswith("/api/peers/requests/"):
+        return {"r": {str(r["id"]): r["email"] for r in data}}
+    return {"p": {str(p["id"]): p.get("linkedId") for p in data.get("peers", [])}}
+
+
+class TrafficRecorder:
+    """Reverse proxy to `upstream` that appends each exchange to a trace file"""
+
+    def __init__(self, upstream, path, listen_host="127.0.0.1", listen_port=0, connections=20):
+        self.upstream = upstream
+        self.path = path
+        self.listen = (listen_host, listen_port)
+        self.connections = connections
+        self.port = None
+        self.count = 0
+        self._ids = itertools.count(1)
+        self._start = None
+        self._out = None
+        self._pool = None
+        self._loop = None
+        self._server = None
+        self._ready = threading.Event()
+
+    def _write(self, entry):
+        if self._out.closed:
+            return  # finished after stop()
+        self._out.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.count += 1
+
+    async def _read_request(self, reader):
+        line = await reader.readuntil(b"\r\n")
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = b""
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                body += chunk[:-2]
+        else:
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+        return method, target, headers, body
+
+    async def _handle(self, reader, writer):
+        conn_id = next(self._ids)
+        try:
+            while True:
+                try:
+                    method, target, headers, raw = await self._read_request(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                body = _parse_body(raw)
+                offset = time.perf_counter() - self._start
+                try:
+                    resp = await self._pool.request(method, target, body)
+                    status, payload, elapsed = resp.status, resp.body, resp.elapsed
+                    content_type = resp.headers.get("content-type", "application/json")
+                except (ConnectionError, asyncio.TimeoutError, OSError) as e:
+                    status, payload, elapsed = 502, json.dumps({"error": str(e)}).encode(), 0.0
+                    content_type = "application/json"
+                entry = {"t": round(offset, 4), "c": conn_id, "m": method, "p": target, "b": body,
+                         "s": status, "ms": round(elapsed * 1000, 2), "n": len(payload)}
+                if status == 200 and hands_out_ids(method, target):
+                    ids = response_ids(method, target.split("?", 1)[0], _parse_body(payload))
+                    if ids:
+                        entry["x"] = ids
+                self._write(entry)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                # responses.get: an upstream may answer with a code http.HTTPStatus does not know
+                writer.write((f"HTTP/1.1 {status} {responses.get(status, '')}\r\nContent-Type: {content_type}\r\n"
+                              f"Content-Length: {len(payload)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode() + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def _serve(self):
+        self._pool = ConnectionPool(self.upstream, self.connections)
+        self._server = await asyncio.start_server(self._handle, *self.listen)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self):
+        """Run the recorder on a background thread; returns its URL"""
+        self._out = gzip.open(self.path, "wt", encoding="utf-8")
+        self._out.write(json.dumps({"v": TRACE_VERSION, "upstream": self.upstream,
+                                    "created": time.strftime("%Y-%m-%d %H:%M:%S")}) + "\n")
+        self._start = time.perf_counter()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self._serve())
+            except asyncio.CancelledError:
+                pass
+        threading.Thread(target=run, daemon=True).start()
+        self._ready.wait(10)
+        return f"http://{self.listen[0]}:{self.port}"
+
+    def stop(self):
+        """Stop accepting and close the trace (on the loop thread, which does the writing)"""
+        if not self._loop:
+            return
+        done = threading.Event()
+
+        def shutdown():
+            self._server.close()
+            self._out.close()
+            done.set()
+        self._loop.call_soon_threadsafe(shutdown)
+        done.wait(5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def load_trace(path):
+    """Returns (header, entries sorted by start offset)"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        entries = [json.loads(line) for line in f if line.strip()]
+    if header.get("v") != TRACE_VERSION:
+        raise ValueError(f"{path}: unsupported trace version {header.get('v')}")
+    entries.sort(key=lambda e: e["t"])
+    return header, entries
+
+
+class TraceIds:
+    """What the recorded responses handed out: request id -> sender email, peer id -> linked user id"""
+
+    def __init__(self, entries):
+        self.requests, self.peers = {}, {}
+        self.remappable = False
+        for entry in entries:
+            ids = entry.get("x") or {}
+            self.remappable = self.remappable or "u" in ids
+            self.requests.update(ids.get("r", {}))
+            self.peers.update(ids.get("p", {}))
+
+    @staticmethod
+    def accounts(entries):
+        """(username, password) the trace logs in with but did not create itself"""
+        created = {e["b"]["username"].lower() for e in entries
+                   if e["p"] == "/api/register" and e["s"] == 200 and isinstance(e["b"], dict)}
+        logins = {e["b"]["username"].lower(): (e["b"]["username"], e["b"].get("password")) for e in entries
+                  if e["p"] == "/api/login" and e["s"] == 200 and isinstance(e["b"], dict)}
+        return [account for name, account in logins.items() if name not in created]
+
+
+class ReplayUser:
+    """One virtual user: renamed copies of the trace's accounts and the ids its own responses handed out"""
+
+    def __init__(self, index, tag, trace, wait=5.0):
+        self.suffix = f"r{tag}v{index:03d}"
+        self.trace = trace
+        self.wait = wait
+        self.users = {}     # recorded user id -> this copy's user id
+        self.requests = {}  # renamed sender email -> pending request id
+        self.peers = {}     # this copy's linked user id -> its peer row id
+        self.unmapped = 0
+        self._learned = asyncio.Event()
+
+    def username(self, name):
+        local, at, domain = name.partition("@")
+        return f"{local}{self.suffix}@{domain}" if at else name
+
+    def learn(self, entry, data):
+        """Take the ids out of this copy's response to `entry`"""
+        ids = response_ids(entry["m"], entry["p"].split("?", 1)[0], data) or {}
+        recorded = entry["x"]
+        if "u" in ids:
+            self.users[str(recorded["u"])] = ids["u"]
+        for request_id, email in ids.get("r", {}).items():
+            self.requests[email.lower()] = int(request_id)
+        for peer_id, linked in ids.get("p", {}).items():
+            self.peers[str(linked)] = int(peer_id)
+        self._learned.set()
+        self._learned = asyncio.Event()
+
+    async def _resolve(self, lookup):
+        """lookup(), waiting a little for the response that hands the id out"""
+        deadline = time.perf_counter() + self.wait
+        while True:
+            value = lookup()
+            left = deadline - time.perf_counter()
+            if value is not None or left <= 0:
+                return value
+            try:
+                await asyncio.wait_for(self._learned.wait(), left)
+            except asyncio.TimeoutError:
+                pass
+
+    async def rewrite(self, entry):
+        """(path, body) of `entry` for this virtual user, or None if it refers to an id this
+        copy never got (sending the recorded id could act on another user's rows)"""
+        path, body, missing = entry["p"], entry["b"], []
+
+        async def resolve(recorded, lookup):
+            value = await self._resolve(lookup)
+            if value is None:
+                missing.append(recorded)
+                return recorded
+            return str(value) if isinstance(recorded, str) else value
+
+        def user(recorded):
+            return resolve(recorded, lambda: self.users.get(str(recorded)))
+
+        match = USER_PATH.match(path)
+        if match:
+            path = match.group(1) + str(await user(match.group(2)))
+        if isinstance(body, dict):
+            body = dict(body)
+            for key in USERNAME_KEYS:
+                if isinstance(body.get(key), str):
+                    body[key] = self.username(body[key])
+            for key in USER_ID_KEYS:
+                if body.get(key) is not None:
+                    body[key] = await user(body[key])
+            if body.get("requestId") is not None:
+                email = self.trace.requests.get(str(body["requestId"]))
+                body["requestId"] = await resolve(body["requestId"], lambda: self.requests.get(
+                    self.username(email).lower()) if email else None)
+            if body.get("peerId") is not None:
+                linked = self.trace.peers.get(str(body["peerId"]))
+                body["peerId"] = await resolve(body["peerId"], lambda: self.peers.get(
+                    str(self.users.get(str(linked)))) if linked is not None else None)
+        if missing:
+            self.unmapped += 1
+            return None
+        return path, body
+
+
+async def replay(entries, base_url, speed=1.0, users=1, stagger=0.0, connections=20):
+    """Re-issue `entries`; speed 0 sends each virtual user's requests back to back.
+    Returns (stats, elapsed, lag, mismatched, unmapped)"""
+    pool = ConnectionPool(base_url, connections)
+    stats = Stats()
+    lag, mismatched = [], [0]
+    trace = TraceIds(entries)
+    copies = [None] * users
+    if trace.remappable:
+        tag = f"{int(time.time()) % 0xFFFFF:05x}"
+        copies = [ReplayUser(vu, tag, trace) for vu in range(users)]
+        # Accounts the trace only logs in to must exist before it runs
+        await asyncio.gather(*(pool.request("POST", "/api/register", {"username": copy.username(name),
+                                                                      "password": password})
+                               for copy in copies for name, password in TraceIds.accounts(entries)),
+                             return_exceptions=True)
+
+    async def send(entry, copy):
+        route = route_of(entry["m"], entry["p"])
+        request = (await copy.rewrite(entry)) if copy else (entry["p"], entry["b"])
+        if request is None:
+            return
+        path, body = request
+        try:
+            resp = await pool.request(entry["m"], path, body)
+        except Exception:
+            stats.error(route)
+            return
+        stats.record(route, resp.elapsed, resp.status)
+        if resp.status != entry["s"]:
+            mismatched[0] += 1
+        if copy and entry.get("x") and resp.status == 200:
+            copy.learn(entry, resp.json())
+
+    async def paced(entry, copy, due):
+        delay = due - (time.perf_counter() - start)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        lag.append(max(0.0, -delay))
+        await send(entry, copy)
+
+    async def sequential(vu):
+        await asyncio.sleep(vu * stagger)
+        for entry in entries:
+            await send(entry, copies[vu])
+
+    start = time.perf_counter()
+    if speed > 0:
+        await asyncio.gather(*(paced(e, copies[vu], vu * stagger + e["t"] / speed)
+                               for vu in range(users) for e in entries))
+    else:
+        await asyncio.gather(*(sequential(vu) for vu in range(users)))
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    unmapped = sum(copy.unmapped for copy in copies if copy) if trace.remappable else None
+    return stats, elapsed, sorted(lag), mismatched[0], unmapped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record backend traffic to a trace, or replay a trace")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="proxy to the backend and record every exchange")
+    rec.add_argument("--listen", type=int, default=RECORD_PORT)
+    rec.add_argument("--upstream", default=None, help="backend URL (default: PSI_API_URL or http://localhost:3001)")
+    rec.add_argument("--out", default="traffic.jsonl.gz")
+    rep = sub.add_parser("replay", help="re-issue a recorded trace")
+    rep.add_argument("trace")
+    rep.add_argument("--base-url", default=None, help="backend URL (default: PSI_API_URL or http://localhost:3001)")
+    rep.add_argument("--stub", action="store_true",
+                     help="replay against the in-memory stand-in (accounts are created by the replay)")
+    rep.add_argument("--speed", type=float, default=1.0, help="1 = original pace, 4 = 4x faster, 0 = no pacing")
+    rep.add_argument("--users", type=int, default=1,
+                     help="virtual users, each replaying the whole trace with its own copies of its accounts")
+    rep.add_argument("--stagger", type=float, default=0.0, help="seconds between virtual user starts")
+    rep.add_argument("--connections", type=int, default=20)
+    rep.add_argument("--json", help="also write the per-endpoint numbers to this file")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        # "localhost" binds IPv4 and IPv6: Node may resolve Vite's proxy target to ::1
+        recorder = TrafficRecorder(args.upstream or api_url(), args.out, "localhost", args.listen)
+        url = recorder.start()
+        print(f"✓ Recording {url} -> {recorder.upstream} into {args.out} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            recorder.stop()
+        print(f"✓ {recorder.count} requests recorded")
+        return
+
+    header, entries = load_trace(args.trace)
+    backend = None
+    base_url = args.base_url or api_url()
+    if args.stub:
+        from stub_backend import StubBackend
+        backend = StubBackend()
+        base_url = backend.start()
+    span = entries[-1]["t"] if entries else 0.0
+    print(f"→ Replaying {len(entries)} requests ({span:.1f}s recorded on {header['created']}) x{args.users} users "
+          f"at {'max' if args.speed <= 0 else f'{args.speed:g}x'} speed against {base_url}")
+    if not TraceIds(entries).remappable:
+        print("⚠ This trace has no recorded login ids: every virtual user re-sends the same requests for the "
+              "same accounts (duplicate traffic, not more users). Record it again to replay distinct users.")
+    try:
+        stats, elapsed, lag, mismatched, unmapped = asyncio.run(
+            replay(entries, base_url, args.speed, args.users, args.stagger, args.connections))
+    finally:
+        if backend:
+            backend.stop()
+    stats.report(elapsed)
+    if lag:
+        print(f"Schedule lag: p50 {percentile(lag, 50) * 1000:.1f} ms, p99 {percentile(lag, 99) * 1000:.1f} ms")
+    rejected = {route: sum(n for status, n in statuses.items() if 400 <= status < 500)
+                for route, statuses in stats.statuses.items()}
+    rejected = {route: n for route, n in rejected.items() if n}
+    if rejected:
+        # Not errors: duplicate registrations, already linked peers and the like
+        print(f"⚠ {sum(rejected.values())} requests answered 4xx: "
+              + ", ".join(f"{route} x{n}" for route, n in sorted(rejected.items())))
+    if mismatched:
+        print(f"⚠ {mismatched} responses had a different status than when recorded")
+    if unmapped:
+        print(f"⚠ {unmapped} requests skipped: they refer to ids no replayed response handed out")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"base_url": base_url, "elapsed": elapsed, "mismatched": mismatched,
+                       "rejected": rejected, "unmapped": unmapped,
+                       "endpoints": stats.as_dict(elapsed)}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
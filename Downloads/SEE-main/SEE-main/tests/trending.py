@@ -0,0 +1,390 @@
+"""
+Incremental "Trending Skills" / "Top Companies" aggregation
+The Dashboard counts, on every load, the skills of the user and of all their
+peers (trimmed + lowercased), the companies on the user's skill rows and the
+companies of their peers (plain or JSON-array strings, "Student" ignored).
+This pipeline keeps those per-user network counts in a summary file
+(reports/trending_summary.json) together with the top-K of each.
+
+Each run streams `skills` and `peers` grouped by user and compares a
+signature of every user's rows with the stored one. Only changed users are
+re-aggregated. A changed skill list becomes a delta that is added to the
+network counts of every user linked to it. An owner whose peer list changed
+is recounted from the stored per-user counts. The full tables are still read
+to compare signatures; only the re-aggregation is incremental.
+
+    python trending.py                          # update the summary from Postgres
+    python trending.py --top 12                 # precomputed top-K for user 12
+    python trending.py --stub --users 5000 --changes 50   # benchmark + checks on seeded data
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SUMMARY_PATH = os.path.join(TESTS_DIR, "reports", "trending_summary.json")
+SUMMARY_VERSION = 1
+TOP_SKILLS = 8      # Dashboard.jsx shows the top 8
+TOP_COMPANIES = 10
+
+
+def normalize_skill(skill):
+    return skill.strip().lower()
+
+
+def peer_companies(raw):
+    """Dashboard.jsx's parse of a peer's company field"""
+    if isinstance(raw, list):
+        companies = raw
+    elif isinstance(raw, str):
+        trimmed = raw.strip()
+        companies = []
+        if trimmed.startswith("[") and trimmed.endswith("]"):
+            try:
+                parsed = json.loads(trimmed)
+                if isinstance(parsed, list):
+                    companies = parsed
+            except ValueError:
+                companies = [trimmed]
+        elif trimmed:
+            companies = [trimmed]
+    else:
+        companies = []
+    return [c for c in companies if isinstance(c, str) and c and c != "Student"]
+
+
+def dashboard_counts(state):
+    """The Dashboard's own computation on an /api/state response: (skills, companies)"""
+    skills, companies = Counter(), Counter()
+    for s in state.get("mySkills") or []:
+        name = s.get("skill") if isinstance(s, dict) else s
+        if name:
+            skills[normalize_skill(name)] += 1
+        company = s.get("company") if isinstance(s, dict) else ""
+        if company:
+            companies[company] += 1
+    for peer in state.get("peers") or []:
+        for name in peer.get("skills") or []:
+            if name:
+                skills[normalize_skill(name)] += 1
+        companies.update(peer_companies(peer.get("company")))
+    return skills, companies
+
+
+def _signature(rows):
+    # Rows arrive in a fixed order (ORDER BY user_id, id), so repr() is stable
+    return hashlib.sha1(repr(rows).encode()).hexdigest()[:16]
+
+
+def _add(counter, delta, times=1):
+    """counter += delta * times, dropping keys that reach zero"""
+    for key, n in delta.items():
+        value = counter.get(key, 0) + n * times
+        if value:
+            counter[key] = value
+        else:
+            counter.pop(key, None)
+
+
+def _delta(old, new):
+    keys = set(old) | set(new)
+    return {k: new.get(k, 0) - old.get(k, 0) for k in keys if new.get(k, 0) != old.get(k, 0)}
+
+
+def skills_entry(rows, sig=None):
+    """Per-user contribution of its own skill rows: (skill, company) pairs"""
+    skills, companies = Counter(), Counter()
+    for skill, company in rows:
+        if isinstance(skill, str) and skill:
+            skills[normalize_skill(skill)] += 1
+        if company:
+            companies[company] += 1
+    return {"sig": sig or _signature(rows), "skills": skills, "companies": companies}
+
+
+def peers_entry(rows, sig=None):
+    """Per-owner peer list: (peer id, linked user id, company, [static peer_skills]) tuples"""
+    links, static, companies = Counter(), Counter(), Counter()
+    for _, linked, company, extra in rows:
+        if linked:
+            links[linked] += 1
+        else:
+            static.update(normalize_skill(s) for s in extra if isinstance(s, str) and s)
+        companies.update(peer_companies(company))
+    return {"sig": sig or _signature(rows), "links": links, "static": static, "companies": companies}
+
+
+class TrendingSummary:
+    """Per-user skill/peer contributions plus the materialized network counts and top-K"""
+
+    def __init__(self, k_skills=TOP_SKILLS, k_companies=TOP_COMPANIES):
+        self.k_skills = k_skills
+        self.k_companies = k_companies
+        self.skills = {}    # user id -> skills_entry
+        self.peers = {}     # user id -> peers_entry
+        self.network = {}   # user id -> {"skills": Counter, "companies": Counter}
+        self.top = {}       # user id -> {"skills": [[name, n]], "companies": [[name, n]]}
+
+    def _recount(self, uid):
+        own = self.skills.get(uid) or skills_entry([])
+        peers = self.peers.get(uid) or peers_entry([])
+        skills, companies = Counter(own["skills"]), Counter(own["companies"])
+        for linked, times in peers["links"].items():
+            _add(skills, self.skills[linked]["skills"] if linked in self.skills else {}, times)
+        _add(skills, peers["static"])
+        _add(companies, peers["companies"])
+        self.network[uid] = {"skills": skills, "companies": companies}
+
+    def _rank(self, uid):
+        net = self.network[uid]
+        # Count first, then name: the Dashboard breaks ties by row order, which SQL does not fix
+        rank = lambda c, k: [[name, n] for name, n in sorted(c.items(), key=lambda i: (-i[1], i[0]))[:k]]
+        self.top[uid] = {"skills": rank(net["skills"], self.k_skills),
+                         "companies": rank(net["companies"], self.k_companies)}
+
+    def apply(self, user_ids, skill_groups, peer_groups):
+        """Bring the summary up to date; the groups are (user id, rows) ordered by user id"""
+        user_ids = set(user_ids)
+        changed_skills = {}   # uid -> (delta skills, delta companies)
+        seen = set()
+        for uid, rows in skill_groups:
+            seen.add(uid)
+            sig = _signature(rows)
+            old = self.skills.get(uid)
+            if old is None or old["sig"] != sig:
+                entry, old = skills_entry(rows, sig), old or skills_entry([])
+                changed_skills[uid] = (_delta(old["skills"], entry["skills"]),
+                                       _delta(old["companies"], entry["companies"]))
+                self.skills[uid] = entry
+        for uid in set(self.skills) - seen:  # all skill rows gone (or user deleted)
+            old = self.skills.pop(uid)
+            changed_skills[uid] = (_delta(old["skills"], {}), _delta(old["companies"], {}))
+
+        recount = set(user_ids - set(self.network))
+        seen = set()
+        for uid, rows in peer_groups:
+            seen.add(uid)
+            sig = _signature(rows)
+            if uid not in self.peers or self.peers[uid]["sig"] != sig:
+                self.peers[uid] = peers_entry(rows, sig)
+                recount.add(uid)
+        for uid in set(self.peers) - seen:
+            del self.peers[uid]
+            recount.add(uid)
+
+        for uid in set(self.network) - user_ids:
+            self.network.pop(uid)
+            self.top.pop(uid, None)
+        recount &= user_ids
+        for uid in recount:
+            self._recount(uid)
+
+        # Push each changed skill list into the users linking to it (and the user itself)
+        owners = {}
+        for owner, entry in self.peers.items():
+            for linked, times in entry["links"].items():
+                owners.setdefault(linked, []).append((owner, times))
+        touched = set(recount)
+        for uid, (d_skills, d_companies) in changed_skills.items():
+            if uid in self.network and uid not in recount:
+                _add(self.network[uid]["skills"], d_skills)
+                _add(self.network[uid]["companies"], d_companies)
+                touched.add(uid)
+            for owner, times in owners.get(uid, []):
+                if owner in self.network and owner not in recount:
+                    _add(self.network[owner]["skills"], d_skills, times)
+                    touched.add(owner)
+        for uid in touched & user_ids:
+            self._rank(uid)
+        return {"skills_changed": len(changed_skills), "recounted": len(recount), "reranked": len(touched)}
+
+    def save(self, path=SUMMARY_PATH):
+        as_json = lambda d: {str(uid): v for uid, v in d.items()}
+        peers = {uid: dict(e, links={str(k): n for k, n in e["links"].items()}) for uid, e in self.peers.items()}
+        data = {"v": SUMMARY_VERSION, "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "k": [self.k_skills, self.k_companies], "top": as_json(self.top),
+                "skills": as_json(self.skills), "peers": as_json(peers), "network": as_json(self.network)}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=SUMMARY_PATH):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("v") != SUMMARY_VERSION:
+            raise ValueError(f"{path}: unsupported summary version {data.get('v')}")
+        summary = cls(*data["k"])
+        counters = lambda e, keys: dict(e, **{k: Counter(e[k]) for k in keys})
+        summary.top = {int(uid): v for uid, v in data["top"].items()}
+        summary.skills = {int(uid): counters(e, ("skills", "companies")) for uid, e in data["skills"].items()}
+        summary.peers = {int(uid): dict(counters(e, ("static", "companies")),
+                                        links=Counter({int(k): n for k, n in e["links"].items()}))
+                         for uid, e in data["peers"].items()}
+        summary.network = {int(uid): counters(e, ("skills", "companies")) for uid, e in data["network"].items()}
+        return summary
+
+
+def read_top(user_id, path=SUMMARY_PATH):
+    """What a Dashboard load needs, without touching the database"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["top"].get(str(user_id), {"skills": [], "companies": []})
+
+
+def _grouped(rows):
+    """(user id, [rest of row]) groups from rows sorted by their first column"""
+    for uid, group in itertools.groupby(rows, key=lambda r: r[0]):
+        yield uid, [tuple(r[1:]) for r in group]
+
+
+def stream_postgres(conn, batch=5000):
+    """(user ids, skill groups, peer groups) read with server-side cursors"""
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM users")
+        user_ids = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT peer_id, skill FROM peer_skills")
+        static = {}
+        for peer_id, skill in cur.fetchall():
+            static.setdefault(peer_id, []).append(skill)
+
+    def named(name, query):
+        with conn.cursor(name=name) as cur:
+            cur.itersize = batch
+            cur.execute(query)
+            yield from cur
+
+    skill_rows = named("trending_skills", "SELECT user_id, skill, company FROM skills ORDER BY user_id, id")
+    peer_rows = ((owner, peer_id, linked, company, static.get(peer_id, []))
+                 for owner, peer_id, linked, company in
+                 named("trending_peers", "SELECT user_id, id, linked_user_id, company FROM peers ORDER BY user_id, id"))
+    return user_ids, _grouped(skill_rows), _grouped(peer_rows)
+
+
+def stream_store(store):
+    """Same groups from a stub_backend.StubStore"""
+    static = {}
+    for r in store.tables["peer_skills"]:
+        static.setdefault(r["peer_id"], []).append(r["skill"])
+    skill_rows = sorted((r["user_id"], r.get("skill"), r.get("company")) for r in store.tables["skills"]
+                        if r.get("user_id") is not None)
+    peer_rows = sorted((r["user_id"], r["id"], r.get("linked_user_id"), r.get("company"), static.get(r["id"], []))
+                       for r in store.tables["peers"])
+    return [u["id"] for u in store.tables["users"]], _grouped(skill_rows), _grouped(peer_rows)
+
+
+def mutate(store, ids, changes, seed=17):
+    """Typical edits: skills added/removed, a peer link added/removed; returns the users edited"""
+    from seed_data import SKILLS
+    rng = random.Random(seed)
+    edited = rng.sample(ids, min(changes, len(ids)))
+    for n, uid in enumerate(edited):
+        if n % 3 == 0 and store.rows("skills", user_id=uid):
+            store.delete("skills", id=rng.choice(store.rows("skills", user_id=uid))["id"])
+        elif n % 3 == 1:
+            store.insert("skills", user_id=uid, skill=f" {rng.choice(SKILLS).upper()}", company="Bosch")
+        else:
+            other = rng.choice(ids)
+            mine = store.rows("peers", user_id=uid)
+            if mine:
+                store.delete("peers", id=mine[0]["id"])
+            store.insert("peers", user_id=uid, linked_user_id=other, name="", company='["Zoho","Student"]')
+    return edited
+
+
+def same_counts(a, b):
+    return all(a.network[u]["skills"] == b.network[u]["skills"] and
+               a.network[u]["companies"] == b.network[u]["companies"] for u in a.network) \
+        and set(a.network) == set(b.network) and a.top == b.top
+
+
+def run_stub(users, changes, sample):
+    from api_session import ApiClient
+    from seed_data import generate, load_stub
+    from stub_backend import StubBackend
+    backend = StubBackend()
+    ids = load_stub(backend.store, generate(users, seed=17))
+    try:
+        start = time.perf_counter()
+        summary = TrendingSummary()
+        summary.apply(*stream_store(backend.store))
+        full = time.perf_counter() - start
+        print(f"✓ Full build: {len(summary.network)} users in {full * 1000:.0f} ms")
+
+        edited = mutate(backend.store, ids, changes)
+        start = time.perf_counter()
+        stats = summary.apply(*stream_store(backend.store))
+        incremental = time.perf_counter() - start
+        print(f"✓ Incremental update after {len(edited)} edits: {incremental * 1000:.0f} ms "
+              f"({stats['skills_changed']} skill lists changed, {stats['recounted']} recounted, "
+              f"{stats['reranked']} top-K refreshed)")
+
+        start = time.perf_counter()
+        rebuilt = TrendingSummary()
+        rebuilt.apply(*stream_store(backend.store))
+        print(f"  full rebuild for comparison: {(time.perf_counter() - start) * 1000:.0f} ms")
+        ok = same_counts(summary, rebuilt)
+        print("✅ Incremental summary equals a full rebuild" if ok else "❌ Incremental summary differs from a rebuild")
+
+        client = ApiClient(backend.start())
+        checked = edited[:sample] + random.Random(1).sample(ids, min(sample, len(ids)))
+        wrong = [uid for uid in checked
+                 if dashboard_counts(client.get(f"/api/state/{uid}")) !=
+                 (summary.network[uid]["skills"], summary.network[uid]["companies"])]
+        client.close()
+        if wrong:
+            print(f"❌ {len(wrong)}/{len(checked)} users differ from the Dashboard's own counts (e.g. user {wrong[0]})")
+        else:
+            print(f"✅ Matches the Dashboard's counts from /api/state for {len(checked)} users")
+        return 0 if ok and not wrong else 1
+    finally:
+        backend.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain precomputed Dashboard trending skills/companies")
+    parser.add_argument("--summary", default=SUMMARY_PATH)
+    parser.add_argument("--dsn", help="Postgres DSN (default: backend/.env)")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the stored summary and start over")
+    parser.add_argument("--top", type=int, metavar="USER_ID", help="print the stored top-K for this user and exit")
+    parser.add_argument("--stub", action="store_true", help="benchmark and check on seeded stand-in data instead")
+    parser.add_argument("--users", type=int, default=5000, help="users to seed with --stub")
+    parser.add_argument("--changes", type=int, default=50, help="users edited between the two --stub runs")
+    parser.add_argument("--sample", type=int, default=50, help="users checked against /api/state with --stub")
+    args = parser.parse_args(argv)
+
+    if args.top is not None:
+        top = read_top(args.top, args.summary)
+        print(f"Trending skills for user {args.top}: " + ", ".join(f"{s} ({n})" for s, n in top["skills"]))
+        print("Top companies: " + ", ".join(f"{c} ({n})" for c, n in top["companies"]))
+        return 0
+    if args.stub:
+        return run_stub(args.users, args.changes, args.sample)
+
+    from db_tools import connect
+    summary = TrendingSummary()
+    if os.path.exists(args.summary) and not args.rebuild:
+        summary = TrendingSummary.load(args.summary)
+    conn = connect(args.dsn)
+    try:
+        start = time.perf_counter()
+        stats = summary.apply(*stream_postgres(conn))
+    finally:
+        conn.close()
+    summary.save(args.summary)
+    print(f"✓ {len(summary.network)} users: {stats['skills_changed']} skill lists changed, "
+          f"{stats['recounted']} recounted, {stats['reranked']} top-K refreshed "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms -> {args.summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""
+Adaptive waits shared by the Selenium test classes
+Each wait returns as soon as its condition holds, raises a TimeoutException
+that says what it was waiting for, and records how long it actually took.
+
+Two backends:
+- "events" (default): the page gets a MutationObserver and fetch/XHR hooks
+  once, and each wait is a single execute_async_script that resolves when
+  the DOM or the /api/ traffic makes the condition true. That is one
+  round-trip per wait, finishing within milliseconds of the UI settling.
+- "poll": WebDriverWait polling every `poll` seconds. It is used for alerts,
+  for custom conditions, and for the rest of an event wait if the page
+  navigates or an alert opens mid-wait.
+Set PSI_WAIT_BACKEND=poll (or run_all_tests.py --wait-backend poll) to poll
+everywhere.
+"""
+
+import os
+import time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+WAIT_BACKEND_ENV = "PSI_WAIT_BACKEND"
+
+# Wraps window.fetch and XMLHttpRequest once per page load so we can see
+# in-flight /api/ calls, and watches the DOM. Event waits subscribe to
+# net.listeners, which are called on every mutation and request start/end.
+INSTALL_NETWORK_TRACKER = """
+if (!window.__psiNet) {
+    const net = window.__psiNet = { pending: 0, last: performance.now(), listeners: new Set() };
+    const notify = () => { for (const fn of [...net.listeners]) fn(); };
+    const changed = delta => { net.pending += delta; net.last = performance.now(); notify(); };
+    const origFetch = window.fetch;
+    window.fetch = function (input, init) {
+        const url = typeof input === 'string' ? input : (input && input.url) || '';
+        if (!url.includes('/api/')) return origFetch.apply(this, arguments);
+        changed(1);
+        return origFetch.apply(this, arguments).finally(() => changed(-1));
+    };
+    const origOpen = XMLHttpRequest.prototype.open, origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__psiApi = String(url).includes('/api/');
+        return origOpen.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function () {
+        if (this.__psiApi) {
+            changed(1);
+            this.addEventListener('loadend', () => changed(-1), { once: true });
+        }
+        return origSend.apply(this, arguments);
+    };
+    new MutationObserver(notify).observe(document, { childList: true, subtree: true, characterData: true, attributes: true });
+    window.addEventListener('load', notify);
+}
+"""
+
+# Idle = nothing pending and no /api/ activity (tracked or finished before the
+# tracker was installed) for `quietMs`.
+NETWORK_IDLE = """
+const quietMs = arguments[0];
+const net = window.__psiNet || { pending: 0, last: 0 };
+const api = performance.getEntriesByType('resource').filter(e => e.name.includes('/api/'));
+const lastEnd = api.reduce((m, e) => Math.max(m, e.responseEnd), 0);
+return net.pending === 0 && performance.now() - Math.max(net.last, lastEnd) >= quietMs;
+"""
+
+# React has mounted and no page is showing its "Loading..." placeholder.
+REACT_RENDERED = """
+const root = document.getElementById('root');
+if (document.readyState !== 'complete' || !root || !root.firstElementChild) return false;
+const main = document.querySelector('main.main');
+return !main || !/^\\s*Loading/.test(main.innerText);
+"""
+
+
+# Resolves (callback) with {ok, value} when the condition in `spec` holds,
+# re-checking on every DOM mutation and /api/ request start/end; quiet-period
+# conditions also set a timer for the moment the quiet period ends.
+WAIT_FOR = INSTALL_NETWORK_TRACKER + """
+const [spec, timeoutMs, done] = arguments;
+const net = window.__psiNet;
+const find = loc => {
+    if (loc.by === 'css') return [...document.querySelectorAll(loc.value)];
+    const r = document.evaluate(loc.value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const out = [];
+    for (let i = 0; i < r.snapshotLength; i++) out.push(r.snapshotItem(i));
+    return out;
+};
+const shown = el => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+let finished = false, quietTimer = null;
+const check = () => {
+    if (spec.kind === 'present') {
+        const el = find(spec.locator)[0];
+        return el ? { value: el } : null;
+    }
+    if (spec.kind === 'clickable') {
+        const el = find(spec.locator)[0];
+        return el && shown(el) && !el.disabled ? { value: el } : null;
+    }
+    if (spec.kind === 'count_changed') {
+        const n = find(spec.locator).length;
+        return n !== spec.before ? { value: n } : null;
+    }
+    if (spec.kind === 'text') {
+        const text = document.body ? document.body.innerText : '';
+        return spec.texts.every(t => text.includes(t)) ? { value: true } : null;
+    }
+    if (spec.kind === 'rendered') {
+        const root = document.getElementById('root');
+        if (document.readyState !== 'complete' || !root || !root.firstElementChild) return null;
+        const main = document.querySelector('main.main');
+        return !main || !/^\\s*Loading/.test(main.innerText) ? { value: true } : null;
+    }
+    // idle: nothing pending and no /api/ activity for quietMs
+    const api = performance.getEntriesByType('resource').filter(e => e.name.includes('/api/'));
+    const lastEnd = api.reduce((m, e) => Math.max(m, e.responseEnd), 0);
+    const quietFor = performance.now() - Math.max(net.last, lastEnd);
+    if (net.pending === 0 && quietFor >= spec.quietMs) return { value: true };
+    if (net.pending === 0) {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(onChange, spec.quietMs - quietFor + 1);
+    }
+    return null;
+};
+const finish = result => {
+    if (finished) return;
+    finished = true;
+    net.listeners.delete(onChange);
+    clearTimeout(quietTimer);
+    clearTimeout(deadline);
+    done(result);
+};
+function onChange() {
+    const r = check();
+    if (r) finish({ ok: true, value: r.value });
+}
+const deadline = setTimeout(() => finish({ ok: false }), timeoutMs);
+net.listeners.add(onChange);
+onChange();
+"""
+
+# Locator strategies the in-page waits understand, as (css|xpath, selector)
+IN_PAGE_LOCATORS = {
+    By.CSS_SELECTOR: lambda v: ("css", v),
+    By.XPATH: lambda v: ("xpath", v),
+    By.ID: lambda v: ("css", f'[id="{v}"]'),
+    By.NAME: lambda v: ("css", f'[name="{v}"]'),
+    By.CLASS_NAME: lambda v: ("css", f".{v}"),
+    By.TAG_NAME: lambda v: ("css", v),
+}
+
+
+def in_page_locator(locator):
+    by, value = locator
+    convert = IN_PAGE_LOCATORS.get(by)
+    if convert is None:
+        return None
+    kind, selector = convert(value)
+    return {"by": kind, "value": selector}
+
+
+def login_settled(driver):
+    """Condition: the auth form reached the app (sidebar) or showed its message"""
+    return driver.find_elements(By.CLASS_NAME, "sidebar") or driver.find_elements(By.CLASS_NAME, "auth-msg")
+
+
+# Per browser session: hooks registered for new documents, current script timeout
+_EVENT_STATE = {}
+
+
+class Waiter:
+    def __init__(self, driver, timeout=10, poll=0.05, backend=None):
+        self.driver = driver
+        self.timeout = timeout
+        self.poll = poll
+        self.backend = backend or os.environ.get(WAIT_BACKEND_ENV, "events")
+        self.timings = []  # [(description, seconds, ok)]
+
+    def until(self, condition, description, timeout=None):
+        """Poll `condition(driver)` until truthy; return its value"""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=self.poll).until(condition)
+        except TimeoutException:
+            self.timings.append((description, time.perf_counter() - start, False))
+            raise TimeoutException(f"Timed out after {timeout}s waiting for {description}")
+        self.timings.append((description, time.perf_counter() - start, True))
+        return result
+
+    def _prepare(self, timeout):
+        """Hooks on every new document of this browser (once), and a script timeout that outlasts `timeout`"""
+        state = _EVENT_STATE.setdefault(self.driver.session_id, {"script_timeout": None})
+        if "installed" not in state:
+            state["installed"] = True
+            try:
+                self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                                            {"source": INSTALL_NETWORK_TRACKER})
+            except (WebDriverException, AttributeError):
+                pass  # not Chromium: WAIT_FOR installs the hooks on the current page
+        if state["script_timeout"] is None or state["script_timeout"] < timeout + 1:
+            state["script_timeout"] = max(timeout + 5, 30)
+            self.driver.set_script_timeout(state["script_timeout"])
+
+    def until_event(self, spec, condition, description, timeout=None):
+        """Wait in the page for `spec`; `condition` is the polling equivalent used as a fallback"""
+        timeout = self.timeout if timeout is None else timeout
+        if self.backend != "events":
+            return self.until(condition, description, timeout)
+        start = time.perf_counter()
+        try:
+            self._prepare(timeout)
+            outcome = self.driver.execute_async_script(WAIT_FOR, spec, int(timeout * 1000))
+        except WebDriverException:
+            outcome = None  # the page navigated or an alert opened mid-wait
+        if outcome is None:
+            remaining = max(timeout - (time.perf_counter() - start), 0)
+            try:
+                result = WebDriverWait(self.driver, remaining, poll_frequency=self.poll).until(condition)
+            except TimeoutException:
+                outcome = {"ok": False}
+            else:
+                outcome = {"ok": True, "value": result}
+        self.timings.append((description, time.perf_counter() - start, outcome["ok"]))
+        if not outcome["ok"]:
+            raise TimeoutException(f"Timed out after {timeout}s waiting for {description}")
+        return outcome.get("value")
+
+    def react_rendered(self, timeout=None):
+        """Wait until the React app has mounted and finished its loading placeholders"""
+        return self.until_event(
+            {"kind": "rendered"}, lambda d: d.execute_script(REACT_RENDERED),
+            "React render to complete", timeout
+        )
+
+    def track_network(self):
+        """Install the fetch tracker on the current page (safe to call repeatedly)"""
+        try:
+            self.driver.execute_script(INSTALL_NETWORK_TRACKER)
+        except WebDriverException:
+            pass
+
+    def network_idle(self, quiet=0.25, timeout=None):
+        """Wait until no /api/ request has been in flight for `quiet` seconds"""
+        if self.backend != "events":
+            self.track_network()
+        return self.until_event(
+            {"kind": "idle", "quietMs": int(quiet * 1000)},
+            lambda d: d.execute_script(NETWORK_IDLE, int(quiet * 1000)),
+            f"backend requests to settle ({quiet}s quiet)", timeout
+        )
+
+    def alert_present(self, timeout=None):
+        """Wait for a native alert() and return it"""
+        return self.until(EC.alert_is_present(), "alert to appear", timeout)
+
+    def element_count_changed(self, locator, before, timeout=None):
+        """Wait until the number of elements matching `locator` differs from `before`"""
+        # The new count may be 0, so keep it aside rather than returning it
+        counts = []
+
+        def changed(d):
+            counts.append(len(d.find_elements(*locator)))
+            return counts[-1] != before
+
+        description = f"count of {locator[1]!r} to change from {before}"
+        target = in_page_locator(locator)
+        if target is None:
+            self.until(changed, description, timeout)
+            return counts[-1]
+        count = self.until_event({"kind": "count_changed", "locator": target, "before": before},
+                                 changed, description, timeout)
+        # True when the polling fallback answered
+        return counts[-1] if count is True else count
+
+    def present(self, locator, timeout=None):
+        condition = EC.presence_of_element_located(locator)
+        description = f"{locator[1]!r} to be present"
+        target = in_page_locator(locator)
+        if target is None:
+            return self.until(condition, description, timeout)
+        return self.until_event({"kind": "present", "locator": target}, condition, description, timeout)
+
+    def clickable(self, locator, timeout=None):
+        condition = EC.element_to_be_clickable(locator)
+        description = f"{locator[1]!r} to be clickable"
+        target = in_page_locator(locator)
+        if target is None:
+            return self.until(condition, description, timeout)
+        return self.until_event({"kind": "clickable", "locator": target}, condition, description, timeout)
+
+    def text_present(self, *texts, timeout=None):
+        """Wait until every string in `texts` appears in the page body text"""
+        return self.until_event(
+            {"kind": "text", "texts": list(texts)},
+            lambda d: all(t in d.find_element(By.TAG_NAME, "body").text for t in texts),
+            f"text {', '.join(map(repr, texts))} to appear", timeout
+        )
+
+    def total(self):
+        return sum(seconds for _, seconds, _ in self.timings)
+
+    def print_summary(self):
+        print(f"⏱ {len(self.timings)} waits, {self.total():.2f}s total")
+        for description, seconds, ok in self.timings:
+            mark = "✓" if ok else "✗"
+            print(f"   {mark} {seconds:6.3f}s  {description}")